@@ -14,13 +14,13 @@ from tkinter import ttk, filedialog, scrolledtext, messagebox
 import sys
 import os
 from pathlib import Path
-import subprocess
 import threading
-import time
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Sequence, Tuple
 
 # Importar estilos y configuración
 from gui_styles import GUIStyles, GUIIcons, GUIMessages
+from gui_matrix import RESISTANCE_NAMES, MatrixView, matrix_max
+from gui_editor import PlanEditorPanel
 
 # Agregar paths necesarios
 ROOT_DIR = Path(__file__).parent
@@ -28,8 +28,136 @@ sys.path.insert(0, str(ROOT_DIR))
 sys.path.insert(0, str(ROOT_DIR / 'input_output'))
 
 # Importar módulos de I/O
-from input_output.input import parse_input_file, txt_to_dzn
-from input_output.output import parse_minizinc_output, generate_output_file
+from input_output.input import parse_input_file
+
+# Importar el selector de motores y la estimación de tiempos
+from profiling import profile_dir, profile_run
+from solver.dispatch import ENGINE_LABELS, solve
+from solver.editor import PlanEditor
+from solver.evaluation import evaluate_plan
+from solver.minizinc import SEARCH_STRATEGIES
+from solver.scheduling import load_history, record_runtime
+from tracing import instance_attrs, span
+
+
+# Filas que se muestran al inicio y al final de una lista larga; el resto
+# queda plegado en una línea que se expande con un clic
+SUMMARY_HEAD = 10
+SUMMARY_TAIL = 5
+
+# Etiqueta de los segmentos plegados en un reporte
+FOLD = 'fold'
+
+# Segmento de un reporte: (texto, tag) o (texto, (FOLD, texto plegado))
+Segment = Tuple[str, object]
+
+
+def _fold_lines(lines: Sequence[str], noun: str) -> List[Segment]:
+    """Segmentos de una lista; si es larga, el centro queda plegado."""
+    if len(lines) <= SUMMARY_HEAD + SUMMARY_TAIL:
+        return [(''.join(lines), None)]
+    hidden = len(lines) - SUMMARY_HEAD - SUMMARY_TAIL
+    return [(''.join(lines[:SUMMARY_HEAD]), None),
+            (GUIMessages.FOLD_MORE(hidden, noun), (FOLD, ''.join(lines[SUMMARY_HEAD:-SUMMARY_TAIL]))),
+            (''.join(lines[-SUMMARY_TAIL:]), None)]
+
+
+def input_report(params: Dict) -> List[Segment]:
+    """
+    Reporte de los datos de entrada.
+
+    Se arma fuera del hilo de la interfaz; las listas por opinión se
+    pliegan si son largas.
+
+    Args:
+        params: Parámetros de la instancia
+
+    Returns:
+        Lista de segmentos (texto, tag) para PolarizationGUI.show_report
+    """
+    report = [
+        ("═" * 80 + "\n", 'header'),
+        ("DATOS DE ENTRADA CARGADOS\n", 'header'),
+        ("═" * 80 + "\n\n", 'header'),
+        ("Número de personas (n): ", 'info'),
+        (f"{params['n']}\n", 'accent'),
+        ("Número de opiniones (m): ", 'info'),
+        (f"{params['m']}\n", 'accent'),
+        ("\nDistribución de personas por opinión:\n", 'info'),
+    ]
+    report += _fold_lines([f"  Opinión {i}: {p} personas\n" for i, p in enumerate(params['p'], 1)],
+                          'opiniones')
+    report.append(("\nValores de las opiniones:\n", 'info'))
+    report += _fold_lines([f"  Opinión {i}: {v:.3f}\n" for i, v in enumerate(params['v'], 1)], 'opiniones')
+    report.append(("\nResistencias al cambio:\n", 'info'))
+    report += _fold_lines([f"  Opinión {i}: Baja={r[0]}, Media={r[1]}, Alta={r[2]}\n"
+                           for i, r in enumerate(params['s'], 1)], 'opiniones')
+    report += [
+        ("\nCosto total máximo: ", 'info'),
+        (f"{params['ct']}\n", 'accent'),
+        ("Movimientos máximos: ", 'info'),
+        (f"{params['maxMovs']}\n\n", 'accent'),
+    ]
+    return report
+
+
+def results_report(solution: Dict, evaluation: Dict) -> List[Segment]:
+    """
+    Reporte de una solución.
+
+    Las matrices completas se muestran en la pestaña de movimientos (ver
+    gui_matrix.MatrixView); aquí se listan solo los movimientos distintos
+    de cero.
+
+    Args:
+        solution: Solución de solver.dispatch.solve
+        evaluation: Resultado de evaluate_plan para su plan
+
+    Returns:
+        Lista de segmentos (texto, tag) para PolarizationGUI.show_report
+    """
+    # Convertir -0.0 a 0.0 para evitar mostrar valores negativos en cero
+    pol = solution['polarization']
+    pol = abs(pol) if abs(pol) < 0.0001 else pol
+    report = [
+        ("═" * 80 + "\n", 'header'),
+        ("RESULTADOS DE LA OPTIMIZACIÓN\n", 'success'),
+        ("═" * 80 + "\n\n", 'header'),
+        ("✓ Polarización final: ", 'success'),
+        (f"{pol:.3f}", 'accent'),
+    ]
+    if solution['status'] != 'OPTIMAL':
+        report.append((f" (sin demostrar optimalidad; cota inferior {solution['lower_bound']:.3f})", 'info'))
+    report.append(("\n\n", None))
+
+    report.append((f"Motor: {ENGINE_LABELS[solution['engine']]}\n", 'info'))
+    report.append((f"  {solution['reason']}\n", 'info'))
+    if solution['message']:
+        report.append((f"  {solution['message']}\n", 'info'))
+
+    time_limit = f" (límite {solution['time_limit']}s)" if solution['time_limit'] else ""
+    report.append((f"Tiempo de ejecución: {solution['time']:.2f} segundos{time_limit}\n", 'info'))
+    if solution.get('user_time') is not None:
+        report.append((f"Tiempo de CPU: {solution['user_time']:.2f}s usuario + "
+                       f"{solution['sys_time']:.2f}s sistema\n", 'info'))
+        report.append((f"Memoria pico: {solution['peak_rss'] / (1024 * 1024):.1f} MB\n", 'info'))
+    report.append(("\n", None))
+
+    report.append(("Distribución final de personas:\n", 'info'))
+    report += _fold_lines([f"  Opinión {i}: {count} personas\n"
+                           for i, count in enumerate(evaluation['final_distribution'], 1)], 'opiniones')
+    report.append((f"\nValor de la mediana: {evaluation['median_value']:.3f}\n\n", 'info'))
+
+    moves = []
+    for k in range(1, 4):
+        for i, row in enumerate(solution['movements'][k], 1):
+            if any(row):
+                moves += [f"  {RESISTANCE_NAMES[k - 1]}: Op{i} → Op{j}: {count} personas\n"
+                          for j, count in enumerate(row, 1) if count]
+    report.append((f"Movimientos ({len(moves)} distintos de cero):\n", 'info'))
+    report += _fold_lines(moves, 'movimientos') if moves else [("  Ninguno\n", None)]
+    report.append(("\n" + GUIMessages.MATRIX_HINT, 'info'))
+    return report
 
 
 class PolarizationGUI:
@@ -49,8 +177,13 @@ class PolarizationGUI:
         # Variables de estado
         self.input_file = None
         self.params = None
-        self.minizinc_output = None
+        self.solution = None
         self.is_running = False
+        self.profile_path = None
+        self.is_loading = False
+        self.folds = {}
+        self.profile_var = tk.BooleanVar(value=False)
+        self.search_var = tk.StringVar(value='default')
         
         # Crear interfaz
         self.create_widgets()
@@ -208,6 +341,52 @@ class PolarizationGUI:
         )
         execute_frame.pack(fill='x', pady=(0, 15))
         
+        # Límite de memoria opcional para el solver
+        limit_frame = ttk.Frame(execute_frame, style='Dark.TFrame')
+        limit_frame.pack(fill='x', pady=(0, 10))
+        
+        ttk.Label(
+            limit_frame,
+            text=GUIMessages.LABEL_MEMORY_LIMIT,
+            style='Heading.TLabel'
+        ).pack(side='left', padx=(0, 10))
+        
+        self.memory_limit_entry = ttk.Entry(
+            limit_frame,
+            style='Dark.TEntry',
+            font=GUIStyles.FONTS['normal'],
+            width=8
+        )
+        self.memory_limit_entry.pack(side='left')
+        
+        # Perfilado de la capa Python (cProfile + tracemalloc)
+        ttk.Checkbutton(
+            limit_frame,
+            text=GUIMessages.LABEL_PROFILE,
+            variable=self.profile_var,
+            style='Dark.TCheckbutton'
+        ).pack(side='right')
+        
+        # Estrategia de búsqueda de MiniZinc (archivos de model/busqueda)
+        search_frame = ttk.Frame(execute_frame, style='Dark.TFrame')
+        search_frame.pack(fill='x', pady=(0, 10))
+        
+        ttk.Label(
+            search_frame,
+            text=GUIMessages.LABEL_SEARCH,
+            style='Heading.TLabel'
+        ).pack(side='left', padx=(0, 10))
+        
+        ttk.Combobox(
+            search_frame,
+            textvariable=self.search_var,
+            values=list(SEARCH_STRATEGIES),
+            state='readonly',
+            style='Dark.TCombobox',
+            font=GUIStyles.FONTS['normal'],
+            width=18
+        ).pack(side='left')
+        
         # Botón de ejecución
         self.execute_btn = ttk.Button(
             execute_frame,
@@ -250,9 +429,13 @@ class PolarizationGUI:
         )
         output_frame.pack(fill='both', expand=True)
         
+        # Pestañas: reporte de texto y matrices de movimientos
+        self.output_tabs = ttk.Notebook(output_frame, style='Dark.TNotebook')
+        self.output_tabs.pack(fill='both', expand=True)
+        
         # Text widget para mostrar salida con fondo oscuro
         self.output_text = scrolledtext.ScrolledText(
-            output_frame,
+            self.output_tabs,
             wrap=tk.WORD,
             font=GUIStyles.FONTS['mono'],
             bg=GUIStyles.COLORS['output_bg'],
@@ -268,7 +451,15 @@ class PolarizationGUI:
             highlightbackground=GUIStyles.COLORS['border'],
             highlightcolor=GUIStyles.COLORS['accent']
         )
-        self.output_text.pack(fill='both', expand=True, padx=2, pady=2)
+        self.output_tabs.add(self.output_text.frame, text=GUIMessages.TAB_REPORT)
+        
+        # Matrices de movimientos: solo se dibujan las celdas visibles
+        self.matrix_view = MatrixView(self.output_tabs)
+        self.output_tabs.add(self.matrix_view, text=GUIMessages.TAB_MOVEMENTS)
+        
+        # Editor del plan: cada edición se re-evalúa en O(log m)
+        self.editor_panel = PlanEditorPanel(self.output_tabs, on_change=self._on_plan_edited)
+        self.output_tabs.add(self.editor_panel, text=GUIMessages.TAB_EDITOR)
         
         # Configurar tags para colores
         self.output_text.tag_config('success', foreground=GUIStyles.COLORS['success'], font=GUIStyles.FONTS['mono_bold'])
@@ -277,6 +468,9 @@ class PolarizationGUI:
         self.output_text.tag_config('info', foreground=GUIStyles.COLORS['info'])
         self.output_text.tag_config('accent', foreground=GUIStyles.COLORS['accent'], font=GUIStyles.FONTS['mono_bold'])
         self.output_text.tag_config('header', foreground=GUIStyles.COLORS['text'], font=GUIStyles.FONTS['mono_bold'])
+        self.output_text.tag_config('link', foreground=GUIStyles.COLORS['accent'], underline=True)
+        self.output_text.tag_bind('link', '<Enter>', lambda event: self.output_text.config(cursor='hand2'))
+        self.output_text.tag_bind('link', '<Leave>', lambda event: self.output_text.config(cursor=''))
     
     def create_footer(self, parent):
         """Crea el pie de página con la barra de estado"""
@@ -322,51 +516,51 @@ class PolarizationGUI:
             messagebox.showerror("Error", GUIMessages.ERROR_NO_FILE)
             return
         
+        if self.is_loading:
+            return
+        
+        # Parsear y armar el reporte fuera del hilo de la interfaz
+        self.is_loading = True
+        self.update_status(GUIMessages.STATUS_LOADING)
+        thread = threading.Thread(target=self._load_data_thread,
+                                  args=(self.input_file, self._profile_output()),
+                                  daemon=True)
+        thread.start()
+    
+    def _load_data_thread(self, input_file, profile_path=None):
+        """Thread para parsear la entrada sin bloquear la UI"""
         try:
-            self.update_status(GUIMessages.STATUS_LOADING)
-            self.params = parse_input_file(self.input_file)
-            
-            # Actualizar displays de parámetros
-            self.n_value.config(text=str(self.params['n']))
-            self.m_value.config(text=str(self.params['m']))
-            self.ct_value.config(text=f"{self.params['ct']:.1f}")
-            self.maxmovs_value.config(text=f"{self.params['maxMovs']:.1f}")
-            
-            # Mostrar información en la salida
-            self.output_text.delete(1.0, tk.END)
-            self.write_output("═" * 80 + "\n", 'header')
-            self.write_output("DATOS DE ENTRADA CARGADOS\n", 'header')
-            self.write_output("═" * 80 + "\n\n", 'header')
-            
-            self.write_output(f"Número de personas (n): ", 'info')
-            self.write_output(f"{self.params['n']}\n", 'accent')
-            
-            self.write_output(f"Número de opiniones (m): ", 'info')
-            self.write_output(f"{self.params['m']}\n", 'accent')
-            
-            self.write_output(f"\nDistribución de personas por opinión:\n", 'info')
-            for i, p in enumerate(self.params['p'], 1):
-                self.write_output(f"  Opinión {i}: {p} personas\n")
-            
-            self.write_output(f"\nValores de las opiniones:\n", 'info')
-            for i, v in enumerate(self.params['v'], 1):
-                self.write_output(f"  Opinión {i}: {v:.3f}\n")
-            
-            self.write_output(f"\nResistencias al cambio:\n", 'info')
-            for i, resistances in enumerate(self.params['s'], 1):
-                self.write_output(f"  Opinión {i}: Baja={resistances[0]}, Media={resistances[1]}, Alta={resistances[2]}\n")
-            
-            self.write_output(f"\nCosto total máximo: ", 'info')
-            self.write_output(f"{self.params['ct']}\n", 'accent')
-            
-            self.write_output(f"Movimientos máximos: ", 'info')
-            self.write_output(f"{self.params['maxMovs']}\n\n", 'accent')
-            
-            self.update_status(GUIMessages.STATUS_LOADED(self.params['n'], self.params['m']))
-            
+            with span('parse_input', file=Path(input_file).name), \
+                    profile_run(profile_path, f"{Path(input_file).stem}_entrada"):
+                params = parse_input_file(input_file)
+                report = input_report(params)
+            self.root.after(0, lambda: self._show_loaded(params, report))
         except Exception as e:
-            messagebox.showerror("Error", GUIMessages.ERROR_PARSE(str(e)))
-            self.update_status(GUIMessages.STATUS_ERROR)
+            error_msg = str(e)
+            self.root.after(0, lambda: self._load_failed(error_msg))
+    
+    def _show_loaded(self, params, report):
+        """Muestra los datos cargados (en el hilo de la interfaz)"""
+        self.is_loading = False
+        self.params = params
+        
+        # Actualizar displays de parámetros
+        self.n_value.config(text=str(params['n']))
+        self.m_value.config(text=str(params['m']))
+        self.ct_value.config(text=f"{params['ct']:.1f}")
+        self.maxmovs_value.config(text=f"{params['maxMovs']:.1f}")
+        
+        self.show_report(report)
+        self.matrix_view.clear()
+        self.editor_panel.set_editor(None)
+        self.output_tabs.select(self.output_text.frame)
+        self.update_status(GUIMessages.STATUS_LOADED(params['n'], params['m']))
+    
+    def _load_failed(self, error_msg):
+        """Informa un error de lectura de la entrada"""
+        self.is_loading = False
+        messagebox.showerror("Error", GUIMessages.ERROR_PARSE(error_msg))
+        self.update_status(GUIMessages.STATUS_ERROR)
     
     def execute_minizinc(self):
         """Ejecuta el modelo de MiniZinc"""
@@ -378,141 +572,114 @@ class PolarizationGUI:
             messagebox.showwarning("Advertencia", "Ya hay una ejecución en curso")
             return
         
+        memory_limit = self.memory_limit_entry.get().strip()
+        if memory_limit and (not memory_limit.isdigit() or int(memory_limit) <= 0):
+            messagebox.showerror("Error", GUIMessages.ERROR_MEMORY_VALUE)
+            return
+        
+        # El estado se marca aquí, en el hilo de la interfaz: Tkinter no
+        # admite llamadas desde otros hilos
+        self.is_running = True
+        self.execute_btn.config(state='disabled')
+        
         # Ejecutar en un thread separado
-        thread = threading.Thread(target=self._run_minizinc_thread, daemon=True)
+        thread = threading.Thread(target=self._run_minizinc_thread,
+                                  args=(int(memory_limit) if memory_limit else None,
+                                        self._profile_output(), self.search_var.get()),
+                                  daemon=True)
         thread.start()
     
-    def _run_minizinc_thread(self):
-        """Thread para ejecutar MiniZinc sin bloquear la UI"""
-        self.is_running = True
-        self.execute_btn.config(state='disabled')
+    def _run_minizinc_thread(self, memory_limit_mb=None, profile_path=None, search='default'):
+        """Thread para resolver la instancia sin bloquear la UI"""
         self.root.after(0, lambda: self.update_status(GUIMessages.STATUS_RUNNING))
         
         try:
-            # Verificar que MiniZinc esté instalado
-            try:
-                check_result = subprocess.run(
-                    ['minizinc', '--version'],
-                    capture_output=True,
-                    text=True,
-                    timeout=5
-                )
-                if check_result.returncode != 0:
-                    raise FileNotFoundError("MiniZinc no responde correctamente")
-            except (FileNotFoundError, subprocess.TimeoutExpired) as e:
-                error_msg = (
-                    "❌ MiniZinc no está instalado o no está en el PATH del sistema.\n\n"
-                    "Por favor, sigue estos pasos:\n\n"
-                    "1. Descarga MiniZinc desde: https://www.minizinc.org/\n"
-                    "2. Instala MiniZinc en tu sistema\n"
-                    "3. Asegúrate de marcar la opción 'Add to PATH' durante la instalación\n"
-                    "4. Reinicia VS Code o tu terminal\n"
-                    "5. Verifica la instalación ejecutando: minizinc --version\n\n"
-                    "Si ya instalaste MiniZinc, es posible que necesites:\n"
-                    "- Reiniciar tu computadora para que el PATH se actualice\n"
-                    "- Agregar manualmente el directorio de MiniZinc al PATH del sistema"
-                )
-                self.root.after(0, lambda msg=error_msg: messagebox.showerror("MiniZinc No Encontrado", msg))
-                return
-            
-            # Generar archivo .dzn
-            dzn_file = ROOT_DIR / "temp" / "DatosProyecto.dzn"
-            dzn_file.parent.mkdir(exist_ok=True)
-            txt_to_dzn(self.input_file, str(dzn_file))
-            
-            # Ejecutar MiniZinc
-            mzn_file = ROOT_DIR / "model" / "Proyecto.mzn"
-            
-            # Verificar que el modelo existe
-            if not mzn_file.exists():
-                error_msg = f"El archivo del modelo no existe: {mzn_file}\n\nPor favor, verifica la estructura del proyecto."
-                self.root.after(0, lambda msg=error_msg: messagebox.showerror("Error", msg))
-                return
+            # El selector elige el motor más rápido y su límite de tiempo
+            history = load_history()
+            name = Path(self.input_file).stem
+            with span('gui_solve', file=Path(self.input_file).name, **instance_attrs(self.params)), \
+                    profile_run(profile_path, f"{name}_resolver"):
+                solution = solve(self.params, 'auto', history=history, memory_limit_mb=memory_limit_mb,
+                                 search=search)
             
-            start_time = time.time()
-            
-            cmd = [
-                'minizinc',
-                '--solver', 'Gecode',
-                '--time-limit', '300000',  # 5 minutos
-                str(mzn_file),
-                str(dzn_file)
-            ]
-            
-            result = subprocess.run(
-                cmd,
-                capture_output=True,
-                text=True,
-                timeout=320
-            )
-            
-            elapsed_time = time.time() - start_time
-            
-            if result.returncode == 0:
-                self.minizinc_output = result.stdout
-                self.root.after(0, lambda: self._display_results(elapsed_time))
+            if solution['status'] in ('OPTIMAL', 'SATISFIED'):
+                self.solution = solution
+                record_runtime(self.params, solution['time'], solution['status'] == 'OPTIMAL',
+                               solution['time_limit'], name=Path(self.input_file).name,
+                               engine=solution['engine'])
+                
+                # El reporte y la escala de colores también se arman en este hilo
+                self.root.after(0, lambda: self.update_status(GUIMessages.STATUS_RENDERING))
+                with span('format_results', **instance_attrs(self.params)), \
+                        profile_run(profile_path, f"{name}_formato"):
+                    evaluation = evaluate_plan(self.params, solution['movements'])
+                    report = results_report(solution, evaluation)
+                    maxima = {k: matrix_max(solution['movements'][k]) for k in range(1, 4)}
+                    editor = PlanEditor(self.params, solution['movements'])
+                self.root.after(0, lambda: self._render_results(solution, report, maxima, editor,
+                                                                profile_path, name))
+                # Con 'auto' un corte por memoria conserva el plan de la heurística
+                if solution.get('engine_status') == 'MEMORY_LIMIT':
+                    warning = GUIMessages.WARNING_MEMORY_LIMIT(memory_limit_mb)
+                    self.root.after(0, lambda: messagebox.showwarning("Advertencia", warning))
+            elif solution['status'] == 'TIMEOUT':
+                self.root.after(0, lambda: messagebox.showerror("Error", GUIMessages.ERROR_TIMEOUT))
             else:
-                error_msg = result.stderr if result.stderr else "Error desconocido"
+                error_msg = solution['message'] if solution['message'] else "Error desconocido"
                 self.root.after(0, lambda: self._display_error(error_msg))
                 
-        except subprocess.TimeoutExpired:
-            self.root.after(0, lambda: messagebox.showerror("Error", GUIMessages.ERROR_TIMEOUT))
         except Exception as e:
-            self.root.after(0, lambda: messagebox.showerror("Error", f"Error inesperado: {str(e)}"))
+            error_msg = str(e)
+            self.root.after(0, lambda: messagebox.showerror("Error", f"Error inesperado: {error_msg}"))
         finally:
-            self.is_running = False
-            self.execute_btn.config(state='normal')
+            self.root.after(0, self._run_finished)
     
-    def _display_results(self, elapsed_time):
-        """Muestra los resultados de la optimización"""
+    def _run_finished(self):
+        """Habilita una nueva ejecución (en el hilo de la interfaz)"""
+        self.is_running = False
+        self.execute_btn.config(state='normal')
+    
+    def _profile_output(self):
+        """Directorio de perfiles de la sesión si el perfilado está activo, o None"""
+        if not self.profile_var.get():
+            return None
+        if self.profile_path is None:
+            self.profile_path = profile_dir()
+        return self.profile_path
+    
+    def _render_results(self, solution, report, maxima, editor, profile_path, name):
+        """Muestra los resultados, perfilando la presentación si corresponde"""
+        with profile_run(profile_path, f"{name}_vista"):
+            self._display_results(solution, report, maxima, editor)
+        if profile_path:
+            self.update_status(GUIMessages.STATUS_PROFILED(profile_path))
+    
+    def _display_results(self, solution, report, maxima, editor):
+        """Muestra los resultados de la optimización (reporte ya armado)"""
         try:
-            parsed = parse_minizinc_output(self.minizinc_output)
-            pol = parsed.get('polarization', 0)
-            
-            self.output_text.delete(1.0, tk.END)
-            
-            self.write_output("═" * 80 + "\n", 'header')
-            self.write_output("RESULTADOS DE LA OPTIMIZACIÓN\n", 'success')
-            self.write_output("═" * 80 + "\n\n", 'header')
+            self.show_report(report)
+            # Las matrices muestran el plan del editor, que parte del resuelto
+            self.matrix_view.set_movements(editor.movements, self.params['m'], maxima)
+            self.editor_panel.set_editor(editor, solution['polarization'])
             
-            # Convertir -0.0 a 0.0 para evitar mostrar valores negativos en cero
+            pol = solution['polarization']
             pol = abs(pol) if abs(pol) < 0.0001 else pol
-            self.write_output(f"✓ Polarización final: ", 'success')
-            self.write_output(f"{pol:.3f}\n\n", 'accent')
-            
-            self.write_output(f"Tiempo de ejecución: {elapsed_time:.2f} segundos\n\n", 'info')
-            
-            if 'final_distribution' in parsed:
-                self.write_output("Distribución final de personas:\n", 'info')
-                for i, count in enumerate(parsed['final_distribution'], 1):
-                    self.write_output(f"  Opinión {i}: {count} personas\n")
-                self.write_output("\n")
-            
-            if 'median_value' in parsed:
-                self.write_output(f"Valor de la mediana: {parsed['median_value']:.3f}\n\n", 'info')
-            
-            # Mostrar matrices de movimientos
-            for k in range(1, 4):
-                resistance_name = ['Baja', 'Media', 'Alta'][k-1]
-                self.write_output(f"Movimientos (Resistencia {resistance_name}):\n", 'info')
-                
-                matrix = parsed.get(f'movements_k{k}', [])
-                if matrix:
-                    # Encabezado
-                    header = "      " + "".join([f"Op{j+1:2d} " for j in range(len(matrix))])
-                    self.write_output(header + "\n")
-                    
-                    for i, row in enumerate(matrix, 1):
-                        row_str = f"  Op{i:2d} " + "".join([f"{val:3d} " for val in row])
-                        self.write_output(row_str + "\n")
-                    self.write_output("\n")
-            
-            self.update_status(GUIMessages.STATUS_COMPLETED(elapsed_time, pol))
+            self.update_status(GUIMessages.STATUS_COMPLETED(solution['time'], pol))
             self.save_btn.config(state='normal')
             
         except Exception as e:
             messagebox.showerror("Error", f"Error al procesar resultados: {str(e)}")
     
+    def _on_plan_edited(self, k, i, j, value):
+        """Actualiza la vista de matrices tras una edición del plan"""
+        maxima = self.matrix_view.maxima
+        if value >= maxima.get(k, 0):
+            maxima[k] = value
+        else:
+            # La celda pudo tener el máximo: recalcularlo sobre la matriz
+            maxima[k] = matrix_max(self.matrix_view.movements[k])
+        self.matrix_view.redraw()
+    
     def _display_error(self, error_msg):
         """Muestra un error de ejecución"""
         self.output_text.delete(1.0, tk.END)
@@ -524,19 +691,32 @@ class PolarizationGUI:
     
     def save_output(self):
         """Guarda la salida en un archivo .txt"""
-        if not self.minizinc_output or not self.params:
+        if not self.solution or not self.params:
             messagebox.showerror("Error", "No hay resultados para guardar")
             return
         
+        # Las matrices muestran el plan editado: no guardar otro sin avisar
+        editor = self.editor_panel.editor
+        if editor is not None and editor.history:
+            choice = messagebox.askyesnocancel("Guardar", GUIMessages.CONFIRM_SAVE_EDITED)
+            if choice is None:
+                return
+            if choice:
+                self.editor_panel.save()
+                return
+        
         filename = filedialog.asksaveasfilename(
-            title="Guardar resultado",
+            title="Guardar plan resuelto",
             defaultextension=".txt",
             filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
         )
         
         if filename:
             try:
-                generate_output_file(self.minizinc_output, filename, self.params['m'])
+                with span('write_output', **instance_attrs(self.params)), \
+                        profile_run(self._profile_output(), f"{Path(filename).stem}_guardar"):
+                    # El texto se genera una sola vez por solución (Solution.format)
+                    Path(filename).write_text(self.solution.format(), encoding='utf-8')
                 messagebox.showinfo("Éxito", f"Resultado guardado en:\n{filename}")
                 self.update_status(GUIMessages.STATUS_SAVED(Path(filename).name))
             except Exception as e:
@@ -546,10 +726,13 @@ class PolarizationGUI:
         """Limpia la interfaz"""
         self.input_file = None
         self.params = None
-        self.minizinc_output = None
+        self.solution = None
         
         self.file_entry.delete(0, tk.END)
         self.output_text.delete(1.0, tk.END)
+        self.folds.clear()
+        self.matrix_view.clear()
+        self.editor_panel.set_editor(None)
         
         self.n_value.config(text="-")
         self.m_value.config(text="-")
@@ -559,6 +742,40 @@ class PolarizationGUI:
         self.save_btn.config(state='disabled')
         self.update_status(GUIMessages.STATUS_CLEANED)
     
+    def show_report(self, report):
+        """
+        Reemplaza la salida por un reporte con una sola inserción.
+        
+        Los segmentos plegados se muestran como un enlace que, al hacer clic,
+        inserta su texto en el mismo lugar.
+        """
+        self.output_text.delete(1.0, tk.END)
+        self.folds.clear()
+        
+        args = []
+        for text, tag in report:
+            if isinstance(tag, tuple) and tag[0] == FOLD:
+                fold_tag = f"{FOLD}{len(self.folds)}"
+                self.folds[fold_tag] = tag[1]
+                self.output_text.tag_bind(fold_tag, '<Button-1>',
+                                          lambda event, name=fold_tag: self._expand_fold(name))
+                tag = ('link', fold_tag)
+            args += [text, tag or ()]
+        if args:
+            self.output_text.insert(tk.END, *args)
+        self.output_text.see(1.0)
+    
+    def _expand_fold(self, fold_tag):
+        """Reemplaza un enlace de segmento plegado por su texto"""
+        text = self.folds.pop(fold_tag, None)
+        ranges = self.output_text.tag_ranges(fold_tag)
+        if text is None or not ranges:
+            return
+        start, end = ranges[0], ranges[-1]
+        self.output_text.delete(start, end)
+        self.output_text.insert(start, text)
+        self.output_text.config(cursor='')
+    
     def write_output(self, text, tag=None):
         """Escribe texto en el widget de salida con un tag opcional"""
         if tag:
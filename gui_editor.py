@@ -0,0 +1,168 @@
+"""
+Panel de edición de planes para la GUI
+======================================
+
+Permite mover personas a mano sobre el plan resuelto y ver al instante la
+polarización, la mediana, el costo, los movimientos y las restricciones
+violadas (ver solver.editor.PlanEditor: cada edición cuesta O(log m)).
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import tkinter as tk
+from pathlib import Path
+from tkinter import ttk, filedialog, messagebox
+from typing import Callable, Optional
+
+from gui_matrix import RESISTANCE_NAMES
+from gui_styles import GUIStyles, GUIMessages
+
+
+# Restricciones violadas que se listan como máximo
+EDITOR_MAX_VIOLATIONS = 5
+
+
+class PlanEditorPanel(ttk.Frame):
+    """Controles de edición y métricas del plan editado."""
+
+    def __init__(self, parent, on_change: Optional[Callable] = None):
+        """
+        Args:
+            parent: Widget contenedor
+            on_change: Función on_change(k, i, j, valor) que se llama tras
+                       cada edición (por ejemplo, para redibujar las matrices)
+        """
+        super().__init__(parent, style='Dark.TFrame', padding=10)
+        self.editor = None
+        self.base_polarization = None
+        self.on_change = on_change
+        self.level_var = tk.StringVar(value=RESISTANCE_NAMES[0])
+
+        # Edición: nivel, origen, destino y personas
+        controls = ttk.Frame(self, style='Dark.TFrame')
+        controls.pack(fill='x', pady=(0, 10))
+        ttk.Label(controls, text=GUIMessages.LABEL_LEVEL, style='Heading.TLabel').pack(side='left')
+        ttk.Combobox(controls, textvariable=self.level_var, values=list(RESISTANCE_NAMES),
+                     state='readonly', style='Dark.TCombobox', width=7).pack(side='left', padx=(4, 10))
+        self.entries = {}
+        for key, label in (('from', GUIMessages.LABEL_FROM), ('to', GUIMessages.LABEL_TO),
+                           ('count', GUIMessages.LABEL_COUNT)):
+            ttk.Label(controls, text=label, style='Heading.TLabel').pack(side='left')
+            entry = ttk.Entry(controls, style='Dark.TEntry', font=GUIStyles.FONTS['normal'], width=6)
+            entry.pack(side='left', padx=(4, 10))
+            entry.bind('<Return>', lambda event: self.apply_move())
+            self.entries[key] = entry
+
+        buttons = ttk.Frame(self, style='Dark.TFrame')
+        buttons.pack(fill='x', pady=(0, 10))
+        self.move_btn = ttk.Button(buttons, text=GUIMessages.BTN_MOVE, style='Accent.TButton',
+                                   command=self.apply_move, state='disabled')
+        self.move_btn.pack(side='left', fill='x', expand=True, padx=(0, 5))
+        self.undo_btn = ttk.Button(buttons, text=GUIMessages.BTN_UNDO, style='Secondary.TButton',
+                                   command=self.undo, state='disabled')
+        self.undo_btn.pack(side='left', fill='x', expand=True, padx=5)
+        self.save_btn = ttk.Button(buttons, text=GUIMessages.BTN_SAVE_EDITED, style='Secondary.TButton',
+                                   command=self.save, state='disabled')
+        self.save_btn.pack(side='left', fill='x', expand=True, padx=(5, 0))
+
+        # Métricas del plan editado
+        self.metrics = ttk.Label(self, text=GUIMessages.EDITOR_EMPTY, style='Dark.TLabel',
+                                 font=GUIStyles.FONTS['mono'], justify='left')
+        self.metrics.pack(fill='x', anchor='w')
+        self.violations = ttk.Label(self, text="", style='Dark.TLabel', font=GUIStyles.FONTS['small'],
+                                    foreground=GUIStyles.COLORS['error'], justify='left', wraplength=600)
+        self.violations.pack(fill='x', anchor='w', pady=(8, 0))
+
+    def set_editor(self, editor, base_polarization: Optional[float] = None):
+        """
+        Muestra un plan para editar.
+
+        Args:
+            editor: solver.editor.PlanEditor o None para vaciar el panel
+            base_polarization: Polarización del plan resuelto (referencia)
+        """
+        self.editor = editor
+        self.base_polarization = base_polarization
+        state = 'normal' if editor else 'disabled'
+        for button in (self.move_btn, self.undo_btn, self.save_btn):
+            button.config(state=state)
+        if editor:
+            self._show(editor.summary())
+        else:
+            self.metrics.config(text=GUIMessages.EDITOR_EMPTY)
+            self.violations.config(text="")
+
+    def _read_int(self, key: str) -> int:
+        text = self.entries[key].get().strip()
+        try:
+            return int(text)
+        except ValueError:
+            raise ValueError(GUIMessages.ERROR_EDITOR_VALUE(text or "(vacío)"))
+
+    def apply_move(self):
+        """Aplica el movimiento indicado en los campos."""
+        if not self.editor:
+            return
+        try:
+            k = RESISTANCE_NAMES.index(self.level_var.get()) + 1
+            i = self._read_int('from') - 1
+            j = self._read_int('to') - 1
+            summary = self.editor.move(k, i, j, self._read_int('count'))
+        except ValueError as e:
+            messagebox.showerror("Error", str(e))
+            return
+        self._show(summary)
+        if self.on_change:
+            self.on_change(k, i, j, self.editor.movements[k][i][j])
+
+    def undo(self):
+        """Deshace la última edición."""
+        if not self.editor or not self.editor.history:
+            return
+        k, i, j, _ = self.editor.history[-1]
+        self._show(self.editor.undo())
+        if self.on_change:
+            self.on_change(k, i, j, self.editor.movements[k][i][j])
+
+    def save(self):
+        """Guarda el plan editado en un archivo .txt (formato de salida)."""
+        if not self.editor:
+            return
+        solution = self.editor.to_solution()
+        if solution['status'] != 'SATISFIED' and not messagebox.askyesno(
+                "Advertencia", GUIMessages.CONFIRM_SAVE_INFEASIBLE):
+            return
+        filename = filedialog.asksaveasfilename(
+            title="Guardar plan editado",
+            defaultextension=".txt",
+            filetypes=[("Archivos de texto", "*.txt"), ("Todos los archivos", "*.*")]
+        )
+        if filename:
+            try:
+                Path(filename).write_text(solution.format(), encoding='utf-8')
+                messagebox.showinfo("Éxito", f"Plan guardado en:\n{filename}")
+            except OSError as e:
+                messagebox.showerror("Error", GUIMessages.ERROR_SAVE(str(e)))
+
+    def _show(self, summary):
+        """Actualiza las métricas con el resumen del editor."""
+        params = self.editor.params
+        change = ""
+        if self.base_polarization is not None:
+            change = f" ({summary['polarization'] - self.base_polarization:+.3f} respecto al plan resuelto)"
+        self.metrics.config(text=(
+            f"Polarización: {summary['polarization']:.3f}{change}\n"
+            f"Mediana:      opinión {summary['median_opinion']} (valor {summary['median_value']:.3f})\n"
+            f"Costo:        {summary['cost']:.1f} / {params['ct']}\n"
+            f"Movimientos:  {summary['moves']} / {params['maxMovs']}\n"
+            f"Ediciones:    {len(self.editor.history)}"
+        ))
+        violations = summary['violations']
+        if violations:
+            shown = violations[:EDITOR_MAX_VIOLATIONS]
+            if len(violations) > len(shown):
+                shown.append(f"... y {len(violations) - len(shown)} más")
+            self.violations.config(text="✗ " + "\n✗ ".join(shown), foreground=GUIStyles.COLORS['error'])
+        else:
+            self.violations.config(text=GUIMessages.EDITOR_FEASIBLE, foreground=GUIStyles.COLORS['success'])
@@ -0,0 +1,205 @@
+"""
+Vista de matrices de movimientos para la GUI
+============================================
+
+Muestra una matriz de movimientos m x m como cuadrícula desplazable o mapa
+de calor. Solo se dibujan las celdas visibles, así que el costo de mostrar
+y desplazar la vista depende del tamaño de la ventana y no de m.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Dict, Optional, Sequence
+
+from gui_styles import GUIStyles, GUIMessages
+
+
+RESISTANCE_NAMES = ('Baja', 'Media', 'Alta')
+
+
+def _blend(start: str, end: str, t: float) -> str:
+    """Color intermedio entre dos colores '#rrggbb' (t en [0, 1])."""
+    a = [int(start[i:i + 2], 16) for i in (1, 3, 5)]
+    b = [int(end[i:i + 2], 16) for i in (1, 3, 5)]
+    return '#' + ''.join(f"{round(x + (y - x) * t):02x}" for x, y in zip(a, b))
+
+
+def matrix_max(matrix: Sequence[Sequence[int]]) -> int:
+    """Mayor valor de una matriz (Matrix o lista de listas)."""
+    data = getattr(matrix, 'data', None)
+    if data is not None:
+        return max(data, default=0)
+    return max((max(row, default=0) for row in matrix), default=0)
+
+
+class MatrixView(ttk.Frame):
+    """Cuadrícula virtualizada de una matriz de movimientos por nivel."""
+
+    CELL_WIDTH = 46
+    CELL_HEIGHT = 22
+    HEADER_WIDTH = 60
+    HEADER_HEIGHT = 24
+
+    def __init__(self, parent):
+        super().__init__(parent, style='Dark.TFrame')
+        self.movements = None
+        self.maxima: Dict[int, int] = {}
+        self.m = 0
+        self.level_var = tk.StringVar(value=RESISTANCE_NAMES[0])
+        self.heatmap_var = tk.BooleanVar(value=True)
+        self._pending = None
+
+        # Controles: nivel de resistencia y mapa de calor
+        controls = ttk.Frame(self, style='Dark.TFrame')
+        controls.pack(fill='x', pady=(0, 8))
+        ttk.Label(controls, text=GUIMessages.LABEL_LEVEL, style='Heading.TLabel').pack(side='left', padx=(0, 8))
+        level = ttk.Combobox(controls, textvariable=self.level_var, values=list(RESISTANCE_NAMES),
+                             state='readonly', style='Dark.TCombobox', width=8)
+        level.pack(side='left')
+        level.bind('<<ComboboxSelected>>', lambda event: self.redraw())
+        ttk.Checkbutton(controls, text=GUIMessages.LABEL_HEATMAP, variable=self.heatmap_var,
+                        style='Dark.TCheckbutton', command=self.redraw).pack(side='left', padx=(12, 0))
+        self.info_label = ttk.Label(controls, text="", style='Info.TLabel')
+        self.info_label.pack(side='right')
+
+        # Encabezados fijos y cuerpo desplazable
+        grid = ttk.Frame(self, style='Dark.TFrame')
+        grid.pack(fill='both', expand=True)
+        grid.rowconfigure(1, weight=1)
+        grid.columnconfigure(1, weight=1)
+
+        canvas_options = {'bg': GUIStyles.COLORS['output_bg'], 'highlightthickness': 0, 'borderwidth': 0}
+        self.corner = tk.Canvas(grid, width=self.HEADER_WIDTH, height=self.HEADER_HEIGHT, **canvas_options)
+        self.col_header = tk.Canvas(grid, height=self.HEADER_HEIGHT, **canvas_options)
+        self.row_header = tk.Canvas(grid, width=self.HEADER_WIDTH, **canvas_options)
+        self.body = tk.Canvas(grid, xscrollincrement=self.CELL_WIDTH, yscrollincrement=self.CELL_HEIGHT,
+                              **canvas_options)
+        self.x_scroll = ttk.Scrollbar(grid, orient='horizontal', command=self._scroll_x)
+        self.y_scroll = ttk.Scrollbar(grid, orient='vertical', command=self._scroll_y)
+        self.body.configure(xscrollcommand=self._on_x_moved, yscrollcommand=self._on_y_moved)
+
+        self.corner.grid(row=0, column=0, sticky='nsew')
+        self.col_header.grid(row=0, column=1, sticky='ew')
+        self.row_header.grid(row=1, column=0, sticky='ns')
+        self.body.grid(row=1, column=1, sticky='nsew')
+        self.y_scroll.grid(row=1, column=2, sticky='ns')
+        self.x_scroll.grid(row=2, column=1, sticky='ew')
+
+        self.body.bind('<Configure>', lambda event: self.schedule_redraw())
+        for widget in (self.body, self.row_header, self.col_header):
+            widget.bind('<MouseWheel>', self._on_wheel)
+            widget.bind('<Shift-MouseWheel>', self._on_wheel)
+            widget.bind('<Button-4>', self._on_wheel)
+            widget.bind('<Button-5>', self._on_wheel)
+
+    def set_movements(self, movements: Optional[Dict[int, Sequence[Sequence[int]]]], m: int,
+                      maxima: Optional[Dict[int, int]] = None):
+        """
+        Muestra un plan de movimientos.
+
+        Args:
+            movements: Matrices {nivel: matriz m x m} o None para vaciar
+            m: Número de opiniones
+            maxima: Mayor valor de cada nivel, si ya se calculó (fuera del
+                    hilo de la interfaz); si no, se calcula aquí
+        """
+        self.movements = movements
+        self.m = m if movements else 0
+        if movements:
+            self.maxima = maxima or {k: matrix_max(movements[k]) for k in range(1, 4)}
+        else:
+            self.maxima = {}
+        width, height = self.m * self.CELL_WIDTH, self.m * self.CELL_HEIGHT
+        self.body.configure(scrollregion=(0, 0, width, height))
+        self.col_header.configure(scrollregion=(0, 0, width, self.HEADER_HEIGHT))
+        self.row_header.configure(scrollregion=(0, 0, self.HEADER_WIDTH, height))
+        self.body.xview_moveto(0)
+        self.body.yview_moveto(0)
+        self.redraw()
+
+    def clear(self):
+        """Vacía la vista."""
+        self.set_movements(None, 0)
+
+    def _scroll_x(self, *args):
+        self.body.xview(*args)
+
+    def _scroll_y(self, *args):
+        self.body.yview(*args)
+
+    def _on_x_moved(self, first, last):
+        self.x_scroll.set(first, last)
+        self.col_header.xview_moveto(first)
+        self.schedule_redraw()
+
+    def _on_y_moved(self, first, last):
+        self.y_scroll.set(first, last)
+        self.row_header.yview_moveto(first)
+        self.schedule_redraw()
+
+    def _on_wheel(self, event):
+        if event.num == 4 or getattr(event, 'delta', 0) > 0:
+            step = -3
+        else:
+            step = 3
+        if event.state & 0x0001:  # Shift: desplazamiento horizontal
+            self.body.xview_scroll(step, 'units')
+        else:
+            self.body.yview_scroll(step, 'units')
+        return 'break'
+
+    def schedule_redraw(self):
+        """Agrupa los redibujados pedidos durante un mismo desplazamiento."""
+        if self._pending is None:
+            self._pending = self.after_idle(self.redraw)
+
+    def redraw(self):
+        """Dibuja solo las celdas y encabezados visibles."""
+        self._pending = None
+        for canvas in (self.body, self.row_header, self.col_header, self.corner):
+            canvas.delete('cell')
+
+        colors = GUIStyles.COLORS
+        if not self.movements:
+            self.info_label.config(text="")
+            return
+
+        k = RESISTANCE_NAMES.index(self.level_var.get()) + 1
+        matrix = self.movements[k]
+        highest = self.maxima.get(k, 0)
+        heatmap = self.heatmap_var.get()
+        self.info_label.config(text=GUIMessages.MATRIX_INFO(self.m, highest))
+
+        left, top = self.body.canvasx(0), self.body.canvasy(0)
+        first_col = max(int(left // self.CELL_WIDTH), 0)
+        last_col = min(int((left + self.body.winfo_width()) // self.CELL_WIDTH) + 1, self.m)
+        first_row = max(int(top // self.CELL_HEIGHT), 0)
+        last_row = min(int((top + self.body.winfo_height()) // self.CELL_HEIGHT) + 1, self.m)
+
+        font = GUIStyles.FONTS['mono']
+        self.corner.create_text(self.HEADER_WIDTH / 2, self.HEADER_HEIGHT / 2, text="de \\ a",
+                                fill=colors['text_secondary'], font=font, tags='cell')
+        for j in range(first_col, last_col):
+            self.col_header.create_text((j + 0.5) * self.CELL_WIDTH, self.HEADER_HEIGHT / 2,
+                                        text=f"Op{j + 1}", fill=colors['accent'], font=font, tags='cell')
+        for i in range(first_row, last_row):
+            y = (i + 0.5) * self.CELL_HEIGHT
+            self.row_header.create_text(self.HEADER_WIDTH / 2, y, text=f"Op{i + 1}",
+                                        fill=colors['accent'], font=font, tags='cell')
+            row = matrix[i]
+            for j in range(first_col, last_col):
+                value = row[j]
+                x0, y0 = j * self.CELL_WIDTH, i * self.CELL_HEIGHT
+                if heatmap and value:
+                    fill = _blend(colors['bg_light'], colors['accent'], (value / highest) ** 0.5)
+                    self.body.create_rectangle(x0, y0, x0 + self.CELL_WIDTH, y0 + self.CELL_HEIGHT,
+                                               fill=fill, outline=colors['border'], tags='cell')
+                elif i == j:
+                    self.body.create_rectangle(x0, y0, x0 + self.CELL_WIDTH, y0 + self.CELL_HEIGHT,
+                                               fill=colors['bg_medium'], outline='', tags='cell')
+                self.body.create_text(x0 + self.CELL_WIDTH / 2, y0 + self.CELL_HEIGHT / 2, text=str(value),
+                                      fill=colors['text'] if value else colors['text_secondary'],
+                                      font=font, tags='cell')
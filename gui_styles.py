@@ -144,6 +144,16 @@ class GUIStyles:
                        darkcolor=GUIStyles.COLORS['border'],
                        insertcolor=GUIStyles.COLORS['text'])
         
+        style.configure('Dark.TCombobox',
+                       fieldbackground=GUIStyles.COLORS['input_bg'],
+                       background=GUIStyles.COLORS['bg_light'],
+                       foreground=GUIStyles.COLORS['text'],
+                       bordercolor=GUIStyles.COLORS['border'],
+                       arrowcolor=GUIStyles.COLORS['text'])
+        style.map('Dark.TCombobox',
+                 fieldbackground=[('readonly', GUIStyles.COLORS['input_bg'])],
+                 foreground=[('readonly', GUIStyles.COLORS['text'])])
+        
         # ===== ESTILOS PARA BOTONES PRINCIPALES =====
         style.configure('Accent.TButton',
                        background=GUIStyles.COLORS['button'],
@@ -184,6 +194,27 @@ class GUIStyles:
                  background=[('active', '#4ade80'),
                            ('disabled', GUIStyles.COLORS['bg_light'])],
                  foreground=[('disabled', GUIStyles.COLORS['text_secondary'])])
+        
+        # ===== ESTILOS PARA PESTAÑAS =====
+        style.configure('Dark.TNotebook',
+                       background=GUIStyles.COLORS['card_bg'],
+                       bordercolor=GUIStyles.COLORS['border'])
+        style.configure('Dark.TNotebook.Tab',
+                       background=GUIStyles.COLORS['bg_light'],
+                       foreground=GUIStyles.COLORS['text_secondary'],
+                       font=GUIStyles.FONTS['normal'],
+                       padding=(12, 4))
+        style.map('Dark.TNotebook.Tab',
+                 background=[('selected', GUIStyles.COLORS['bg_dark'])],
+                 foreground=[('selected', GUIStyles.COLORS['accent'])])
+        
+        # ===== ESTILOS PARA CASILLAS =====
+        style.configure('Dark.TCheckbutton',
+                       background=GUIStyles.COLORS['bg_dark'],
+                       foreground=GUIStyles.COLORS['text_secondary'],
+                       font=GUIStyles.FONTS['small'])
+        style.map('Dark.TCheckbutton',
+                 background=[('active', GUIStyles.COLORS['bg_dark'])])
 
 
 class GUIIcons:
@@ -237,22 +268,55 @@ class GUIMessages:
     # Botones
     BTN_BROWSE = "Seleccionar archivo..."
     BTN_LOAD = "Cargar datos"
-    BTN_EXECUTE = "Ejecutar MiniZinc"
-    BTN_SAVE = "Guardar resultado"
+    BTN_EXECUTE = "Resolver"
+    BTN_SAVE = "Guardar plan resuelto"
     BTN_CLEAR = "Limpiar"
     BTN_EXPORT = "Exportar .dzn"
     BTN_VIEW_MODEL = "Ver modelo"
+    BTN_MOVE = "Mover"
+    BTN_UNDO = "Deshacer"
+    BTN_SAVE_EDITED = "Guardar plan editado"
+    
+    # Etiquetas
+    LABEL_MEMORY_LIMIT = "Límite de memoria (MB, opcional):"
+    LABEL_PROFILE = "Perfilar (depuración)"
+    LABEL_SEARCH = "Estrategia de búsqueda:"
+    LABEL_LEVEL = "Resistencia:"
+    LABEL_HEATMAP = "Mapa de calor"
+    LABEL_FROM = "De:"
+    LABEL_TO = "A:"
+    LABEL_COUNT = "Personas:"
+    
+    # Pestañas de resultados
+    TAB_REPORT = "Reporte"
+    TAB_MOVEMENTS = "Movimientos"
+    TAB_EDITOR = "Editor"
+    
+    # Editor de planes
+    EDITOR_EMPTY = "Resuelva una instancia para editar su plan."
+    EDITOR_FEASIBLE = "✓ El plan editado cumple todas las restricciones"
+    CONFIRM_SAVE_EDITED = ("El plan de la pestaña Movimientos tiene ediciones.\n\n"
+                           "Sí: guardar el plan editado\nNo: guardar el plan resuelto (sin las ediciones)")
+    CONFIRM_SAVE_INFEASIBLE = "El plan editado no cumple todas las restricciones. ¿Guardarlo de todos modos?"
+    ERROR_EDITOR_VALUE = lambda text: f"Valor inválido: {text} (se espera un número entero)"
+    
+    # Vistas de instancias grandes
+    FOLD_MORE = lambda count, noun: f"  ▸ {count} {noun} más (clic para mostrar)\n"
+    MATRIX_INFO = lambda m, top: f"{m} x {m} | máximo {top}"
+    MATRIX_HINT = "Matrices completas en la pestaña Movimientos\n"
     
     # Estados
     STATUS_READY = "Sistema listo. Seleccione un archivo de entrada."
     STATUS_FILE_SELECTED = lambda filename: f"✓ Archivo seleccionado: {filename}"
     STATUS_LOADING = "Cargando datos de entrada..."
+    STATUS_RENDERING = "⏳ Preparando resultados..."
     STATUS_LOADED = lambda n, m: f"✓ Datos cargados: {n} personas, {m} opiniones"
     STATUS_RUNNING = "⏳ Ejecutando modelo de optimización..."
     STATUS_COMPLETED = lambda time, pol: f"✓ Optimización completada en {time:.2f}s | Polarización: {pol:.3f}"
     STATUS_ERROR = "✗ Error durante la ejecución"
     STATUS_SAVED = lambda file: f"✓ Resultado guardado en: {file}"
     STATUS_CLEANED = "Interfaz limpiada. Lista para nueva ejecución."
+    STATUS_PROFILED = lambda path: f"Perfil guardado en: {path}"
     
     # Información de parámetros
     INFO_N = "Número total de personas en la población"
@@ -267,6 +331,9 @@ class GUIMessages:
     ERROR_MINIZINC = "Error: MiniZinc no está instalado o no está en el PATH"
     ERROR_NO_SOLUTION = "Error: No se encontró ninguna solución"
     ERROR_TIMEOUT = "Error: Tiempo límite de ejecución excedido"
+    WARNING_MEMORY_LIMIT = lambda mb: (f"El solver superó el límite de memoria ({mb} MB) y fue detenido. "
+                                       f"Se muestra el plan de la heurística, que puede no ser óptimo.")
+    ERROR_MEMORY_VALUE = "El límite de memoria debe ser un número entero positivo de MB"
     ERROR_PARSE = lambda msg: f"Error al parsear entrada: {msg}"
     ERROR_SAVE = lambda msg: f"Error al guardar: {msg}"
     
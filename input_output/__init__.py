@@ -2,15 +2,34 @@
 Módulo de entrada/salida para el problema de Minimizar Polarización.
 """
 
-from .input import parse_input_file, generate_dzn_file, txt_to_dzn
-from .output import parse_minizinc_output, generate_output_file, read_output_file, format_polarization
+from .structures import Instance, Matrix, Movements, Solution
+from .input import parse_input_file, generate_dzn_file, movement_bounds, txt_to_dzn
+from .output import (
+    parse_minizinc_output,
+    movements_from_flows,
+    generate_output_file,
+    format_solution,
+    write_solution_file,
+    read_output_file,
+    read_output_files,
+    format_polarization
+)
 
 __all__ = [
+    'Instance',
+    'Matrix',
+    'Movements',
+    'Solution',
     'parse_input_file',
     'generate_dzn_file',
+    'movement_bounds',
     'txt_to_dzn',
     'parse_minizinc_output',
+    'movements_from_flows',
     'generate_output_file',
+    'format_solution',
+    'write_solution_file',
     'read_output_file',
+    'read_output_files',
     'format_polarization'
 ]
@@ -8,9 +8,25 @@ Autores: Andrey Quiceño, Iván, Francesco, Jonathan
 Fecha: Diciembre 2025
 """
 
+import math
 import os
 from typing import Dict, List, Tuple
 
+try:
+    from .structures import Instance
+except ImportError:  # Ejecutado como script: python input_output/input.py
+    from structures import Instance
+
+
+# Escalas de la variante entera del modelo (model/ProyectoEntero.mzn):
+# los valores de las opiniones se expresan en milésimas y los costos en
+# medios, de modo que los factores de resistencia 1, 1.5 y 2 son enteros
+VALUE_SCALE = 1000
+COST_SCALE = 2
+
+# Factores de resistencia (1, 1.5, 2) multiplicados por COST_SCALE
+SCALED_FACTORS = (2, 3, 4)
+
 
 def parse_input_file(filepath: str) -> Dict:
     """
@@ -29,7 +45,9 @@ def parse_input_file(filepath: str) -> Dict:
         filepath: Ruta al archivo de entrada
         
     Returns:
-        Diccionario con los parámetros del problema
+        Instancia (input_output.structures.Instance) con los parámetros del
+        problema; se usa como el diccionario {'n', 'm', 'p', 'v', 's', 'ct',
+        'maxMovs'}
         
     Raises:
         ValueError: Si el formato del archivo es inválido
@@ -108,27 +126,115 @@ def parse_input_file(filepath: str) -> Dict:
         if maxMovs < 0:
             raise ValueError("Los movimientos máximos deben ser no negativos")
         
-        return {
-            'n': n,
-            'm': m,
-            'p': p,
-            'v': v,
-            's': s,
-            'ct': ct,
-            'maxMovs': maxMovs
-        }
+        return Instance(n, m, p, v, s, ct, maxMovs)
         
     except (IndexError, ValueError) as e:
         raise ValueError(f"Error al parsear el archivo: {str(e)}")
 
 
-def generate_dzn_file(params: Dict, output_path: str):
+def movement_bounds(params: Dict) -> List[Tuple[int, int, int, int]]:
+    """
+    Calcula los movimientos alcanzables y la cota superior de cada uno.
+    
+    x[k,i,j] no puede superar s[i,k], ni las personas que caben en el
+    presupuesto con un solo tipo de movimiento: floor(ct / (|i-j| * f_k))
+    y floor(maxMovs / |i-j|). Los movimientos con cota 0 (i = j, sin
+    personas o fuera del presupuesto) no se listan. Los costos se comparan
+    escalados por COST_SCALE, en enteros, igual que en la variante entera.
+    
+    Args:
+        params: Diccionario con los parámetros del problema
+        
+    Returns:
+        Lista de tuplas (k, i, j, cota) con k en 1..3 e índices de opinión
+        base 0, ordenada por k, i y j
+    """
+    m = params['m']
+    s = params['s']
+    cost_budget = math.floor(params['ct'] * COST_SCALE + 1e-9)
+    move_budget = math.floor(params['maxMovs'] + 1e-9)
+    bounds = []
+    
+    for k in range(1, 4):
+        factor = SCALED_FACTORS[k - 1]
+        for i in range(m):
+            people = s[i][k - 1]
+            if people == 0:
+                continue
+            # Solo las distancias que caben en ambos presupuestos
+            reach = min(m - 1, cost_budget // factor, move_budget)
+            for j in range(max(0, i - reach), min(m, i + reach + 1)):
+                distance = abs(i - j)
+                if distance:
+                    bound = min(people, cost_budget // (distance * factor), move_budget // distance)
+                    bounds.append((k, i, j, bound))
+    
+    return bounds
+
+
+def _write_reduced_data(f, params: Dict):
+    """
+    Escribe los datos dispersos de model/ProyectoReducido.mzn.
+    
+    Solo se declaran los movimientos alcanzables (movement_bounds), con su
+    cota, costo y distancia, los conjuntos de movimientos que salen y
+    llegan a cada opinión, y las restricciones de capacidad s[i,k] que no
+    quedan cubiertas por las cotas de cada movimiento.
+    """
+    m = params['m']
+    bounds = movement_bounds(params)
+    outgoing = [[] for _ in range(m)]
+    incoming = [[] for _ in range(m)]
+    groups = {}
+    
+    for r, (k, i, j, _) in enumerate(bounds, 1):
+        outgoing[i].append(r)
+        incoming[j].append(r)
+        groups.setdefault((i, k), []).append(r)
+    
+    # Capacidad por opinión y resistencia, solo si las cotas no la garantizan
+    capacity = [(members, params['s'][i][k - 1]) for (i, k), members in groups.items()
+                if sum(bounds[r - 1][3] for r in members) > params['s'][i][k - 1]]
+    
+    def int_array(values):
+        return f"[{', '.join(map(str, values))}]"
+    
+    def set_array(sets):
+        return f"[{', '.join('{' + ', '.join(map(str, members)) + '}' for members in sets)}]"
+    
+    f.write(f"\n% Movimientos alcanzables (model/ProyectoReducido.mzn)\n")
+    f.write(f"cost_budget = {math.floor(params['ct'] * COST_SCALE + 1e-9)};\n")
+    f.write(f"move_budget = {math.floor(params['maxMovs'] + 1e-9)};\n")
+    f.write(f"R = {len(bounds)};\n")
+    f.write(f"move_k = {int_array(k for k, _, _, _ in bounds)};\n")
+    f.write(f"move_from = {int_array(i + 1 for _, i, _, _ in bounds)};\n")
+    f.write(f"move_ub = {int_array(bound for _, _, _, bound in bounds)};\n")
+    f.write(f"move_cost = {int_array(abs(i - j) * SCALED_FACTORS[k - 1] for k, i, j, _ in bounds)};\n")
+    f.write(f"move_dist = {int_array(abs(i - j) for _, i, j, _ in bounds)};\n")
+    f.write(f"out_moves = {set_array(outgoing)};\n")
+    f.write(f"in_moves = {set_array(incoming)};\n")
+    f.write(f"G = {len(capacity)};\n")
+    f.write(f"group_moves = {set_array(members for members, _ in capacity)};\n")
+    f.write(f"group_capacity = {int_array(people for _, people in capacity)};\n")
+
+
+def generate_dzn_file(params: Dict, output_path: str, scaled: bool = False,
+                      reduced: bool = False):
     """
     Genera un archivo .dzn para MiniZinc a partir de los parámetros.
     
+    Con scaled=True genera los datos enteros de model/ProyectoEntero.mzn:
+    v multiplicado por VALUE_SCALE, ct por COST_SCALE (truncado, ya que el
+    costo escalado siempre es entero) y maxMovs truncado.
+    
+    Con reduced=True agrega los datos dispersos de model/ProyectoReducido.mzn:
+    la lista de movimientos alcanzables con sus cotas (movement_bounds).
+    
     Args:
         params: Diccionario con los parámetros del problema
         output_path: Ruta donde guardar el archivo .dzn
+        scaled: Si es True, escala todos los datos a enteros
+        reduced: Si es True, agrega los movimientos alcanzables
     """
     n = params['n']
     m = params['m']
@@ -148,9 +254,15 @@ def generate_dzn_file(params: Dict, output_path: str):
         # Array p
         f.write(f"p = [{', '.join(map(str, p))}];\n\n")
         
-        # Array v con formato de decimales
-        v_str = ', '.join([f"{val:.3f}" for val in v])
-        f.write(f"v = [{v_str}];\n\n")
+        if scaled:
+            # Array v en enteros (milésimas)
+            v_str = ', '.join([str(round(val * VALUE_SCALE)) for val in v])
+            f.write(f"value_scale = {VALUE_SCALE};\n")
+            f.write(f"v = [{v_str}];\n\n")
+        else:
+            # Array v con formato de decimales
+            v_str = ', '.join([f"{val:.3f}" for val in v])
+            f.write(f"v = [{v_str}];\n\n")
         
         # Matriz s (m x 3)
         # Formato MiniZinc: usar | para separar filas
@@ -163,17 +275,27 @@ def generate_dzn_file(params: Dict, output_path: str):
                 f.write("\n")
         f.write(f"|];\n\n")
         
-        f.write(f"ct = {ct};\n")
-        f.write(f"maxMovs = {maxMovs};\n")
+        if scaled:
+            f.write(f"ct = {math.floor(ct * COST_SCALE + 1e-9)};\n")
+            f.write(f"maxMovs = {math.floor(maxMovs + 1e-9)};\n")
+        else:
+            f.write(f"ct = {ct};\n")
+            f.write(f"maxMovs = {maxMovs};\n")
+        
+        if reduced:
+            _write_reduced_data(f, params)
 
 
-def txt_to_dzn(input_txt_path: str, output_dzn_path: str = None) -> str:
+def txt_to_dzn(input_txt_path: str, output_dzn_path: str = None, scaled: bool = False,
+               reduced: bool = False) -> str:
     """
     Convierte un archivo .txt de entrada a un archivo .dzn.
     
     Args:
         input_txt_path: Ruta al archivo .txt de entrada
         output_dzn_path: Ruta donde guardar el .dzn (opcional)
+        scaled: Si es True, genera los datos enteros (ver generate_dzn_file)
+        reduced: Si es True, agrega los movimientos alcanzables
         
     Returns:
         Ruta al archivo .dzn generado
@@ -183,7 +305,7 @@ def txt_to_dzn(input_txt_path: str, output_dzn_path: str = None) -> str:
         output_dzn_path = f"{base_name}.dzn"
     
     params = parse_input_file(input_txt_path)
-    generate_dzn_file(params, output_dzn_path)
+    generate_dzn_file(params, output_dzn_path, scaled, reduced)
     
     return output_dzn_path
 
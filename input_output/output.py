@@ -8,60 +8,276 @@ Autores: Andrey Quiceño, Iván, Francesco, Jonathan
 Fecha: Diciembre 2025
 """
 
-import re
-from typing import Dict, List, Tuple
+import json
+from array import array
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
 
 
-def parse_minizinc_output(output_str: str) -> Dict:
+# Separador de soluciones y marcas de estado de MiniZinc
+SOLUTION_SEPARATOR = '----------'
+STATUS_MARKERS = {
+    '==========': 'OPTIMAL',
+    '=====UNSATISFIABLE=====': 'UNSATISFIABLE',
+    '=====UNSATorUNBOUNDED=====': 'UNSATISFIABLE',
+    '=====UNBOUNDED=====': 'UNBOUNDED',
+    '=====UNKNOWN=====': 'UNKNOWN',
+    '=====ERROR=====': 'ERROR',
+}
+
+# Estados de los mensajes de --json-stream
+JSON_STREAM_STATUS = {
+    'OPTIMAL_SOLUTION': 'OPTIMAL',
+    'ALL_SOLUTIONS': 'OPTIMAL',
+    'UNSATISFIABLE': 'UNSATISFIABLE',
+    'UNBOUNDED': 'UNBOUNDED',
+    'UNSAT_OR_UNBOUNDED': 'UNSATISFIABLE',
+    'UNKNOWN': 'UNKNOWN',
+    'ERROR': 'ERROR',
+}
+
+
+def _int_list(text: str) -> List[int]:
+    """Convierte "[1, 2, 3]" o "1,2,3" en [1, 2, 3]."""
+    return [int(x) for x in text.strip('[] ').split(',') if x.strip()]
+
+
+def movements_from_flows(m: int, right: Sequence[Sequence[int]],
+                         left: Sequence[Sequence[int]]) -> Dict[int, List[List[int]]]:
     """
-    Parsea la salida de MiniZinc y extrae los valores relevantes.
+    Reconstruye las matrices de movimientos de un plan expresado por flujos.
+    
+    Cada resistencia empareja en orden de opinión sus orígenes (salida neta
+    positiva) con sus destinos. En una línea ese emparejamiento cuesta
+    exactamente Σ_b |right - left| unidades de distancia, así que el plan
+    no supera el costo ni los movimientos del flujo, y de cada opinión
+    salen exactamente sus personas netas.
     
     Args:
-        output_str: String con la salida de MiniZinc
+        m: Número de opiniones
+        right: right[k-1][b] = personas de resistencia k que cruzan de la
+               opinión b a la b+1 (base 0)
+        left: left[k-1][b] = personas de resistencia k que cruzan de b+1 a b
         
     Returns:
-        Diccionario con polarización, distribución final y matrices de movimientos
+        Diccionario {nivel (1..3): matriz m x m}
+    """
+    movements = {k: [[0] * m for _ in range(m)] for k in range(1, 4)}
+    
+    for k in range(1, 4):
+        net = [0] * m
+        for b in range(m - 1):
+            crossing = right[k - 1][b] - left[k - 1][b]
+            net[b] += crossing
+            net[b + 1] -= crossing
+        
+        sources = [[i, amount] for i, amount in enumerate(net) if amount > 0]
+        sinks = [[j, -amount] for j, amount in enumerate(net) if amount < 0]
+        s_index = t_index = 0
+        while s_index < len(sources) and t_index < len(sinks):
+            source, sink = sources[s_index], sinks[t_index]
+            amount = min(source[1], sink[1])
+            movements[k][source[0]][sink[0]] += amount
+            source[1] -= amount
+            sink[1] -= amount
+            if source[1] == 0:
+                s_index += 1
+            if sink[1] == 0:
+                t_index += 1
+    
+    return movements
+
+
+def _flow_movements(result: Dict):
+    """Convierte flow_right/flow_left (3 x (m-1), aplanados) en movements_k1..k3."""
+    right = result.pop('flow_right')
+    left = result.pop('flow_left')
+    width = len(right) // 3
+    rows = lambda values: [values[k * width:(k + 1) * width] for k in range(3)]
+    movements = movements_from_flows(width + 1, rows(right), rows(left))
+    for k, matrix in movements.items():
+        result[f'movements_k{k}'] = matrix
+
+
+def _parse_text_solution(lines: Iterable[str], result: Dict):
+    """
+    Extrae los campos de una solución en el formato de texto del modelo.
+
+    Campos "clave=valor" por línea; las matrices movements_kK=[ siguen con
+    una fila por línea hasta "]".
+    """
+    matrix_key = None
+    matrix = []
+
+    for line in lines:
+        line = line.strip()
+        if not line or line.startswith('%'):
+            continue
+
+        if not matrix_key:
+            key, sep, value = line.partition('=')
+            if not sep:
+                continue
+            if key.startswith('movements_k') and value.startswith('['):
+                matrix_key, matrix = key, []
+                line = value[1:].strip()  # filas desde la línea siguiente
+                if not line:
+                    continue
+            else:
+                if key in ('polarization', 'median_value'):
+                    result[key] = float(value)
+                elif key in ('polarization_scaled', 'median_value_scaled', 'value_scale'):
+                    result[key] = int(value)
+                elif key in ('final_distribution', 'moves', 'flow_right', 'flow_left'):
+                    result[key] = _int_list(value)
+                continue
+
+        # Fila de la matriz en curso; "]" la cierra
+        closed = line.endswith(']')
+        row = line.rstrip(']')
+        if row:
+            matrix.append(_int_list(row))
+        if closed:
+            result[matrix_key] = matrix
+            matrix_key = None
+
+
+def _parse_json_solution(data: Dict, result: Dict):
+    """
+    Extrae los campos de una solución de --output-mode json.
+
+    Las variables del modelo llegan con su nombre; x es el arreglo
+    [nivel][i][j] de movimientos (moves en la variante reducida).
+    """
+    if '_output' in data and 'polarization' not in data:
+        _parse_text_solution(data['_output'].splitlines(), result)
+        return
+
+    if 'x' in data:
+        for k, matrix in enumerate(data['x'], 1):
+            result[f'movements_k{k}'] = matrix
+    for key in ('polarization', 'median_value'):
+        if key in data:
+            result[key] = data[key]
+    if 'value_scale' in data:
+        result['value_scale'] = data['value_scale']
+    for key in ('final_distribution', 'moves'):
+        if key in data:
+            result[key] = list(data[key])
+    for key in ('flow_right', 'flow_left'):
+        if key in data:
+            result[key] = [value for row in data[key] for value in row]
+
+
+def _parse_solution(block: List[str], result: Dict):
+    """Extrae los campos de una solución, en texto o JSON."""
+    first = next((line.lstrip() for line in block if line.strip() and not line.lstrip().startswith('%')), '')
+    if first.startswith('{'):
+        _parse_json_solution(json.loads('\n'.join(block)), result)
+    else:
+        _parse_text_solution(block, result)
+
+
+def parse_minizinc_output(output: Union[str, Iterable[str]], require_solution: bool = True,
+                          value_scale: Optional[int] = None) -> Dict:
+    """
+    Parsea la salida de MiniZinc y extrae la última (mejor) solución.
+    
+    La salida se recorre una sola vez, línea a línea: se separan las
+    soluciones por "----------", se reconocen las marcas de estado
+    (==========, =====UNSATISFIABLE=====, =====UNKNOWN=====, ...) y las
+    estadísticas %%%mzn-stat, y solo se convierten los campos de la última
+    solución completa, de modo que el tiempo es lineal y la memoria la de
+    una solución. Entiende la salida de texto del modelo, --output-mode
+    json y los mensajes de --json-stream. Una salida sin separadores (solo
+    el texto de la solución) se toma como una solución.
+    
+    Args:
+        output: Salida de MiniZinc (string o iterable de líneas, p. ej. un archivo)
+        require_solution: Si es True, falla cuando no hay polarización
+        value_scale: Escala de la variante entera, si la salida no la incluye
+                     (--output-mode json)
+        
+    Returns:
+        Diccionario con 'status' ('OPTIMAL', 'SATISFIED', 'UNSATISFIABLE',
+        'UNBOUNDED', 'UNKNOWN' o 'ERROR'), 'solutions' (soluciones
+        completas), 'statistics' y, si hay solución, 'polarization',
+        'final_distribution', 'median_value' y 'movements_k1'..'movements_k3'
+        (o 'moves', la lista dispersa de la variante reducida; los flujos
+        de la variante por flujos se convierten en las matrices)
         
     Raises:
         ValueError: Si no se puede parsear la salida
     """
-    result = {}
+    if isinstance(output, str):
+        output = output.splitlines()
+    
+    status = None
+    solutions = 0
+    statistics = {}
+    block: List[str] = []
+    last_block: Optional[List[str]] = None
+    stream_solution: Optional[Dict] = None
     
     try:
-        # Extraer polarización (incluye negativos y notación científica)
-        pol_match = re.search(r'polarization=(-?[\d.]+(?:[eE][+-]?\d+)?)', output_str)
-        if pol_match:
-            result['polarization'] = float(pol_match.group(1))
-        else:
-            raise ValueError("No se encontró el valor de polarización")
+        for line in output:
+            marker = line.strip()
+            
+            if marker == SOLUTION_SEPARATOR:
+                last_block, block = block, []
+                solutions += 1
+            elif marker in STATUS_MARKERS:
+                status = STATUS_MARKERS[marker]
+            elif marker.startswith('%%%mzn-stat:'):
+                key, _, value = marker[len('%%%mzn-stat:'):].strip().partition('=')
+                try:
+                    statistics[key] = float(value)
+                except ValueError:
+                    statistics[key] = value.strip('"')
+            elif marker.startswith('{"type"'):
+                # --json-stream: un mensaje JSON por línea
+                message = json.loads(marker)
+                if message['type'] == 'solution':
+                    stream_solution = message.get('output', {})
+                    solutions += 1
+                elif message['type'] == 'status':
+                    status = JSON_STREAM_STATUS.get(message.get('status'), 'UNKNOWN')
+                elif message['type'] == 'error':
+                    status = 'ERROR'
+                elif message['type'] == 'statistics':
+                    statistics.update(message.get('statistics', {}))
+            else:
+                block.append(line)
         
-        # Extraer distribución final
-        dist_match = re.search(r'final_distribution=\[([\d, ]+)\]', output_str)
-        if dist_match:
-            result['final_distribution'] = [int(x.strip()) for x in dist_match.group(1).split(',')]
+        if status is None:
+            status = 'SATISFIED' if solutions else 'UNKNOWN'
         
-        # Extraer mediana
-        median_match = re.search(r'median_value=([\d.]+)', output_str)
-        if median_match:
-            result['median_value'] = float(median_match.group(1))
+        result = {'status': status, 'solutions': solutions, 'statistics': statistics}
         
-        # Extraer matrices de movimientos
-        for k in range(1, 4):
-            pattern = rf'movements_k{k}=\[([\d,\s\n]+)\]'
-            matrix_match = re.search(pattern, output_str)
-            
-            if matrix_match:
-                matrix_str = matrix_match.group(1).strip()
-                rows = matrix_str.split('\n')
-                matrix = []
-                
-                for row in rows:
-                    row = row.strip()
-                    if row:
-                        values = [int(x.strip()) for x in row.split(',') if x.strip()]
-                        matrix.append(values)
-                
-                result[f'movements_k{k}'] = matrix
+        if stream_solution is not None:
+            if 'json' in stream_solution:
+                _parse_json_solution(stream_solution['json'], result)
+            else:
+                _parse_text_solution(stream_solution.get('default', '').splitlines(), result)
+        elif last_block is not None:
+            _parse_solution(last_block, result)
+        elif solutions == 0 and status in ('SATISFIED', 'UNKNOWN'):
+            _parse_solution(block, result)
+        
+        # Variante entera del modelo: valores escalados por value_scale
+        scale = result.pop('value_scale', None) or value_scale
+        if 'polarization_scaled' in result and scale:
+            result['polarization'] = result.pop('polarization_scaled') / scale
+        if 'median_value_scaled' in result and scale:
+            result['median_value'] = result.pop('median_value_scaled') / scale
+        if scale and isinstance(result.get('polarization'), int):
+            result['polarization'] /= scale
+        
+        # Variante por flujos: se reconstruyen las matrices de movimientos
+        if 'flow_right' in result and 'flow_left' in result:
+            _flow_movements(result)
+        
+        if require_solution and 'polarization' not in result:
+            raise ValueError("No se encontró el valor de polarización")
         
         return result
         
@@ -69,9 +285,9 @@ def parse_minizinc_output(output_str: str) -> Dict:
         raise ValueError(f"Error al parsear la salida de MiniZinc: {str(e)}")
 
 
-def generate_output_file(minizinc_output: str, output_path: str, m: int):
+def format_solution(polarization: float, movements: Dict[int, List[List[int]]], m: int) -> str:
     """
-    Genera un archivo de salida .txt según el formato especificado.
+    Convierte una solución al formato de salida especificado.
     
     Formato de salida:
     - Línea 1: Polarización final
@@ -82,6 +298,61 @@ def generate_output_file(minizinc_output: str, output_path: str, m: int):
     - Línea: Nivel de resistencia (3)
     - Siguientes m líneas: Matriz de movimientos para resistencia alta
     
+    Args:
+        polarization: Polarización final
+        movements: Matrices de movimientos {nivel: matriz}; los niveles
+                   ausentes o incompletos se escriben como ceros
+        m: Número de opiniones
+        
+    Returns:
+        Texto de la solución, terminado en salto de línea
+    """
+    # Línea 1: Polarización (redondeada a 3 decimales)
+    # Convertir -0.0 a 0.0 para evitar valores negativos en cero
+    pol = abs(polarization) if abs(polarization) < 0.0001 else polarization
+    lines = [f"{pol:.3f}"]
+    
+    # Para cada nivel de resistencia
+    for k in range(1, 4):
+        # Línea: nivel de resistencia
+        lines.append(str(k))
+        
+        # Matriz de movimientos
+        matrix = movements.get(k) or []
+        
+        # Si la matriz no existe, crear una matriz de ceros
+        if len(matrix) != m:
+            matrix = [[0] * m for _ in range(m)]
+        
+        # Cada fila de la matriz, completando con ceros
+        for row in matrix:
+            row = list(row[:m]) + [0] * (m - len(row))
+            lines.append(','.join(map(str, row)))
+    
+    return '\n'.join(lines) + '\n'
+
+
+def write_solution_file(polarization: float, movements: Dict[int, List[List[int]]],
+                        output_path: str, m: int):
+    """
+    Escribe una solución en un archivo .txt (ver format_solution).
+    
+    Args:
+        polarization: Polarización final
+        movements: Matrices de movimientos {nivel: matriz}
+        output_path: Ruta donde guardar el archivo de salida
+        m: Número de opiniones
+    """
+    with open(output_path, 'w', encoding='utf-8') as f:
+        f.write(format_solution(polarization, movements, m))
+
+
+def generate_output_file(minizinc_output: str, output_path: str, m: int):
+    """
+    Genera un archivo de salida .txt a partir de la salida de MiniZinc.
+    
+    Ver format_solution para el formato.
+    
     Args:
         minizinc_output: String con la salida de MiniZinc
         output_path: Ruta donde guardar el archivo de salida
@@ -89,35 +360,8 @@ def generate_output_file(minizinc_output: str, output_path: str, m: int):
     """
     try:
         parsed = parse_minizinc_output(minizinc_output)
-        
-        with open(output_path, 'w', encoding='utf-8') as f:
-            # Línea 1: Polarización (redondeada a 3 decimales)
-            # Convertir -0.0 a 0.0 para evitar valores negativos en cero
-            pol = parsed['polarization']
-            pol = abs(pol) if abs(pol) < 0.0001 else pol
-            f.write(f"{pol:.3f}\n")
-            
-            # Para cada nivel de resistencia
-            for k in range(1, 4):
-                # Línea: nivel de resistencia
-                f.write(f"{k}\n")
-                
-                # Matriz de movimientos
-                matrix = parsed.get(f'movements_k{k}', [])
-                
-                # Si la matriz no existe, crear una matriz de ceros
-                if not matrix or len(matrix) != m:
-                    matrix = [[0] * m for _ in range(m)]
-                
-                # Escribir cada fila de la matriz
-                for row in matrix:
-                    # Asegurarse de que la fila tenga m elementos
-                    while len(row) < m:
-                        row.append(0)
-                    
-                    row_str = ','.join(map(str, row[:m]))
-                    f.write(f"{row_str}\n")
-        
+        movements = {k: parsed.get(f'movements_k{k}', []) for k in range(1, 4)}
+        write_solution_file(parsed['polarization'], movements, output_path, m)
         return True
         
     except Exception as e:
@@ -142,62 +386,96 @@ def format_polarization(value: float) -> str:
     return formatted
 
 
-def read_output_file(filepath: str) -> Dict:
+def _parse_matrix_row(line: str, m: Optional[int], line_no: int) -> array:
+    """
+    Convierte una línea "a,b,c" en una fila compacta de enteros.
+    
+    Args:
+        line: Línea del archivo (sin espacios al inicio/fin)
+        m: Ancho esperado de la fila (None si aún no se conoce)
+        line_no: Número de línea (para mensajes de error)
+        
+    Returns:
+        Fila como array('l')
+        
+    Raises:
+        ValueError: Si la línea no es una fila válida de ancho m
+    """
+    try:
+        row = array('l', map(int, line.split(',')))
+    except ValueError:
+        raise ValueError(f"Línea {line_no}: fila de matriz inválida '{line}'")
+    
+    if m is not None and len(row) != m:
+        raise ValueError(f"Línea {line_no}: se esperaban {m} valores, se encontraron {len(row)}")
+    
+    return row
+
+
+def read_output_file(filepath: str, m: Optional[int] = None) -> Dict:
     """
     Lee un archivo de salida y extrae la información.
     
+    El archivo se recorre línea a línea, sin cargarlo completo en memoria.
+    Cada matriz tiene exactamente m filas de m valores: si no se conoce m
+    (por ejemplo, sin la instancia de entrada a mano), se toma del ancho de
+    la primera fila leída, de modo que una fila "1" de una instancia con
+    m=1 no se confunde con el nivel de resistencia siguiente.
+    
     Args:
         filepath: Ruta al archivo de salida
+        m: Número de opiniones de la instancia (opcional)
         
     Returns:
-        Diccionario con polarización y matrices de movimientos
+        Diccionario con polarización, m y matrices de movimientos
+        ({nivel: lista de m filas array('l')})
+        
+    Raises:
+        ValueError: Si el formato del archivo es inválido
     """
     result = {
         'polarization': 0.0,
+        'm': m,
         'movements': {}
     }
     
     try:
         with open(filepath, 'r', encoding='utf-8') as f:
-            lines = [line.strip() for line in f if line.strip()]
-        
-        if not lines:
-            raise ValueError("El archivo está vacío")
-        
-        # Primera línea: polarización
-        pol_str = lines[0].replace(',', '.')
-        result['polarization'] = float(pol_str)
-        
-        # Leer las tres matrices
-        idx = 1
-        for k in range(1, 4):
-            if idx >= len(lines):
-                break
+            # Solo líneas no vacías, numeradas según el archivo original
+            lines = ((no, line.strip()) for no, line in enumerate(f, 1) if line.strip())
             
-            # Leer nivel de resistencia
-            level = int(lines[idx])
-            idx += 1
+            # Primera línea: polarización
+            first = next(lines, None)
+            if first is None:
+                raise ValueError("El archivo está vacío")
+            result['polarization'] = float(first[1].replace(',', '.'))
             
-            # Leer matriz (inferir m del número de líneas)
-            matrix = []
-            start_idx = idx
-            
-            # Leer hasta encontrar el siguiente nivel o fin de archivo
-            while idx < len(lines):
-                line = lines[idx]
-                # Si es un número solo (1, 2, o 3), es el siguiente nivel
-                if line in ['1', '2', '3'] and idx > start_idx:
-                    break
+            # Tres matrices, cada una precedida por su nivel de resistencia
+            for k in range(1, 4):
+                header = next(lines, None)
+                if header is None:
+                    raise ValueError(f"Falta la matriz del nivel de resistencia {k}")
                 
-                # Parsear fila de la matriz
-                try:
-                    row = [int(x) for x in line.split(',')]
+                line_no, line = header
+                if line != str(k):
+                    raise ValueError(f"Línea {line_no}: se esperaba el nivel de resistencia {k}, se encontró '{line}'")
+                
+                matrix = []
+                while result['m'] is None or len(matrix) < result['m']:
+                    entry = next(lines, None)
+                    if entry is None:
+                        raise ValueError(f"Matriz del nivel {k} incompleta: {len(matrix)} filas")
+                    
+                    row = _parse_matrix_row(entry[1], result['m'], entry[0])
+                    if result['m'] is None:
+                        result['m'] = len(row)
                     matrix.append(row)
-                    idx += 1
-                except ValueError:
-                    break
+                
+                result['movements'][k] = matrix
             
-            result['movements'][level] = matrix
+            extra = next(lines, None)
+            if extra is not None:
+                raise ValueError(f"Línea {extra[0]}: contenido inesperado después de las matrices")
         
         return result
         
@@ -205,19 +483,46 @@ def read_output_file(filepath: str) -> Dict:
         raise ValueError(f"Error al leer archivo de salida: {str(e)}")
 
 
+def read_output_files(filepaths: Iterable[str],
+                      m: Union[int, Dict[str, int], None] = None) -> Iterator[Tuple[str, Optional[Dict], Optional[str]]]:
+    """
+    Lee muchos archivos de salida uno tras otro (lectura en lote).
+    
+    Es un generador: solo mantiene en memoria el archivo actual, por lo que
+    auditar lotes grandes no acumula memoria. Un archivo inválido no detiene
+    el lote; su error se reporta en la tupla correspondiente.
+    
+    Args:
+        filepaths: Rutas de los archivos de salida
+        m: Número de opiniones común a todos los archivos, o diccionario
+           {ruta: m} por archivo (opcional)
+        
+    Yields:
+        Tuplas (ruta, datos, error): datos es None si hubo error
+    """
+    for filepath in filepaths:
+        file_m = m.get(filepath) if isinstance(m, dict) else m
+        
+        try:
+            yield filepath, read_output_file(filepath, file_m), None
+        except ValueError as e:
+            yield filepath, None, str(e)
+
+
 if __name__ == "__main__":
     # Prueba del módulo
     import sys
     
     if len(sys.argv) > 1:
         output_file = sys.argv[1]
+        m = int(sys.argv[2]) if len(sys.argv) > 2 else None
         
         try:
-            data = read_output_file(output_file)
+            data = read_output_file(output_file, m)
             print(f"Polarización: {data['polarization']}")
             print(f"Movimientos por nivel: {list(data['movements'].keys())}")
         except Exception as e:
             print(f"Error: {e}")
             sys.exit(1)
     else:
-        print("Uso: python output.py <archivo_salida.txt>")
+        print("Uso: python output.py <archivo_salida.txt> [m]")
@@ -0,0 +1,278 @@
+"""
+Tipos compactos para instancias y soluciones.
+
+Las instancias y soluciones se guardaban como diccionarios de listas de
+Python: cada entero y cada flotante es un objeto aparte y cada fila una
+lista. Estos tipos usan __slots__ y guardan los vectores y las matrices en
+arreglos contiguos (array), con 4 bytes por conteo y 8 por valor.
+
+Se comportan como los diccionarios de antes (params['s'][i][k],
+solution['movements'][k][i][j], dict(params), solution.get(...)), así que
+el código que los recibe no cambia. Las filas de una matriz son vistas
+(memoryview) sobre el arreglo: leerlas no copia y escribirlas modifica la
+matriz.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+from array import array
+from collections.abc import Mapping, MutableMapping, Sequence
+from typing import Dict, Iterable, List, Optional
+
+
+# Tipo de los arreglos de conteos (personas, movimientos) y de valores
+COUNT_TYPE = 'i'
+VALUE_TYPE = 'd'
+
+INSTANCE_KEYS = ('n', 'm', 'p', 'v', 's', 'ct', 'maxMovs')
+SOLUTION_FIELDS = ('status', 'polarization', 'movements', 'final_distribution', 'time', 'message')
+
+class Matrix(Sequence):
+    """Matriz de enteros en un arreglo contiguo; cada fila es una vista."""
+
+    __slots__ = ('data', 'cols')
+
+    def __init__(self, data: array, cols: int):
+        self.data = data
+        self.cols = cols
+
+    @classmethod
+    def zeros(cls, rows: int, cols: int) -> 'Matrix':
+        """Matriz de ceros de rows x cols."""
+        return cls(array(COUNT_TYPE, bytes(rows * cols * array(COUNT_TYPE).itemsize)), cols)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Iterable[int]], cols: Optional[int] = None) -> 'Matrix':
+        """
+        Copia una matriz dada por filas.
+
+        Args:
+            rows: Filas (listas, arreglos o vistas)
+            cols: Ancho de las filas (por defecto el de la primera)
+
+        Raises:
+            ValueError: Si las filas no tienen todas el mismo ancho
+        """
+        data = array(COUNT_TYPE)
+        count = 0
+        for row in rows:
+            start = len(data)
+            data.extend(row)
+            if cols is None:
+                cols = len(data) - start
+            elif len(data) - start != cols:
+                raise ValueError(f"La fila {count + 1} tiene {len(data) - start} valores, se esperaban {cols}")
+            count += 1
+        return cls(data, cols or 0)
+
+    def __len__(self) -> int:
+        return len(self.data) // self.cols if self.cols else 0
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("fila fuera de rango")
+        start = index * self.cols
+        return memoryview(self.data)[start:start + self.cols]
+
+    def __eq__(self, other) -> bool:
+        if not isinstance(other, (Matrix, list, tuple)):
+            return NotImplemented
+        return len(self) == len(other) and all(row.tolist() == list(other_row)
+                                               for row, other_row in zip(self, other))
+
+    def __repr__(self) -> str:
+        return f"Matrix({self.tolist()})"
+
+    def tolist(self) -> List[List[int]]:
+        """Copia de la matriz como lista de listas."""
+        return [row.tolist() for row in self]
+
+
+class Movements(Mapping):
+    """Las tres matrices de movimientos {nivel (1..3): matriz m x m}."""
+
+    __slots__ = ('m', 'levels')
+
+    def __init__(self, m: int, levels: Optional[Iterable[Matrix]] = None):
+        self.m = m
+        self.levels = tuple(levels) if levels is not None else tuple(Matrix.zeros(m, m) for _ in range(3))
+
+    @classmethod
+    def from_matrices(cls, movements: Mapping, m: Optional[int] = None) -> 'Movements':
+        """
+        Copia un diccionario {nivel: matriz}; los niveles ausentes quedan en cero.
+
+        Args:
+            movements: Matrices por nivel de resistencia
+            m: Número de opiniones (por defecto el de la primera matriz)
+        """
+        if isinstance(movements, Movements):
+            return movements
+        if m is None:
+            m = next((len(matrix) for matrix in movements.values() if matrix), 0)
+        levels = []
+        for k in range(1, 4):
+            matrix = movements.get(k)
+            levels.append(Matrix.from_rows(matrix, m) if matrix else Matrix.zeros(m, m))
+        return cls(m, levels)
+
+    def __getitem__(self, k: int) -> Matrix:
+        if k not in (1, 2, 3):
+            raise KeyError(k)
+        return self.levels[k - 1]
+
+    def __iter__(self):
+        return iter((1, 2, 3))
+
+    def __len__(self) -> int:
+        return 3
+
+    def __repr__(self) -> str:
+        return f"Movements(m={self.m})"
+
+    def tolist(self) -> Dict[int, List[List[int]]]:
+        """Copia como diccionario de listas de listas."""
+        return {k: matrix.tolist() for k, matrix in self.items()}
+
+    def copy(self) -> 'Movements':
+        """Copia independiente de las tres matrices."""
+        return Movements(self.m, (Matrix(array(COUNT_TYPE, matrix.data), matrix.cols) for matrix in self.levels))
+
+
+class Instance(Mapping):
+    """
+    Parámetros de una instancia (ver parse_input_file).
+
+    p y s se guardan como conteos y v como valores en arreglos; s es una
+    Matrix de m x 3.
+    """
+
+    __slots__ = INSTANCE_KEYS
+
+    def __init__(self, n: int, m: int, p: Iterable[int], v: Iterable[float],
+                 s: Iterable[Iterable[int]], ct: float, maxMovs: float):
+        self.n = n
+        self.m = m
+        self.p = array(COUNT_TYPE, p)
+        self.v = array(VALUE_TYPE, v)
+        self.s = s if isinstance(s, Matrix) else Matrix.from_rows(s, 3)
+        self.ct = ct
+        self.maxMovs = maxMovs
+
+    @classmethod
+    def from_dict(cls, params: Mapping) -> 'Instance':
+        """Convierte un diccionario de parámetros (o devuelve la misma instancia)."""
+        if isinstance(params, Instance):
+            return params
+        return cls(*(params[key] for key in INSTANCE_KEYS))
+
+    def __getitem__(self, key: str):
+        if key not in INSTANCE_KEYS:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def __iter__(self):
+        return iter(INSTANCE_KEYS)
+
+    def __len__(self) -> int:
+        return len(INSTANCE_KEYS)
+
+    def __repr__(self) -> str:
+        return f"Instance(n={self.n}, m={self.m}, ct={self.ct}, maxMovs={self.maxMovs})"
+
+    def to_dict(self) -> Dict:
+        """Copia como diccionario de listas (serializable a JSON)."""
+        return {'n': self.n, 'm': self.m, 'p': self.p.tolist(), 'v': self.v.tolist(),
+                's': self.s.tolist(), 'ct': self.ct, 'maxMovs': self.maxMovs}
+
+
+class Solution(MutableMapping):
+    """
+    Solución de un motor, con las mismas claves que su diccionario.
+
+    Las matrices de movimientos se guardan como Movements y la distribución
+    final como arreglo. Los campos que no son de la solución misma (motor,
+    motivo, tiempos de CPU, ...) quedan en extra. El texto de salida se
+    genera la primera vez que se pide (format) y se reutiliza hasta que se
+    asigna otra polarización u otro plan.
+    """
+
+    __slots__ = SOLUTION_FIELDS + ('extra', '_text')
+
+    def __init__(self, values: Optional[Mapping] = None, **kwargs):
+        self.extra = {}
+        self._text = None
+        if values is not None:
+            self.update(values)
+        self.update(kwargs)
+
+    @classmethod
+    def from_dict(cls, solution: Mapping) -> 'Solution':
+        """Convierte un diccionario de solución (o devuelve la misma solución)."""
+        return solution if isinstance(solution, Solution) else cls(solution)
+
+    def __getitem__(self, key: str):
+        if key in SOLUTION_FIELDS:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        return self.extra[key]
+
+    def __setitem__(self, key: str, value):
+        if key in SOLUTION_FIELDS:
+            if key == 'movements' and value is not None:
+                value = Movements.from_matrices(value)
+            elif key == 'final_distribution' and value is not None:
+                value = array(COUNT_TYPE, value)
+            if key in ('polarization', 'movements'):
+                self._text = None
+            setattr(self, key, value)
+        else:
+            self.extra[key] = value
+
+    def __delitem__(self, key: str):
+        if key in SOLUTION_FIELDS:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        else:
+            del self.extra[key]
+
+    def __iter__(self):
+        for field in SOLUTION_FIELDS:
+            if hasattr(self, field):
+                yield field
+        yield from self.extra
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def __repr__(self) -> str:
+        return f"Solution(status={self.get('status')}, polarization={self.get('polarization')})"
+
+    def copy(self) -> 'Solution':
+        """Copia superficial (comparte las matrices)."""
+        return Solution(self)
+
+    def format(self) -> str:
+        """
+        Texto de la solución en el formato de salida (format_solution).
+
+        Raises:
+            ValueError: Si la solución no tiene plan
+        """
+        if self._text is None:
+            from .output import format_solution
+
+            if self.get('movements') is None or self.get('polarization') is None:
+                raise ValueError("La solución no tiene un plan de movimientos")
+            movements = self['movements']
+            self._text = format_solution(self['polarization'], movements, movements.m)
+        return self._text
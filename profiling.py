@@ -0,0 +1,117 @@
+"""
+Modo de perfilado de la capa Python (cProfile + tracemalloc).
+
+Cada ejecución perfilada (una instancia del ejecutor de pruebas o de
+solve.py, o una resolución en la GUI) se mide con cProfile y tracemalloc:
+lectura de la entrada, generación del .dzn, lectura de la salida de
+MiniZinc, escritura del archivo de salida y presentación del resultado.
+Por cada ejecución se escribe:
+
+    <nombre>.pstats        estadísticas de cProfile (python -m pstats, snakeviz)
+    <nombre>_resumen.txt   funciones con más tiempo y llamadas, y los
+                           sitios que más memoria asignan
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import io
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator, Optional
+
+
+ROOT_DIR = Path(__file__).parent
+PROFILE_DIR = ROOT_DIR / 'temp' / 'perfiles'
+
+# Filas de cada tabla del resumen
+TOP_FUNCTIONS = 25
+TOP_ALLOCATIONS = 20
+
+
+def profile_dir(base: Optional[Path] = None) -> Path:
+    """
+    Crea el directorio de perfiles de esta ejecución.
+
+    Args:
+        base: Directorio base (por defecto PROFILE_DIR)
+
+    Returns:
+        Subdirectorio con la fecha y hora de la ejecución
+    """
+    path = Path(base or PROFILE_DIR) / time.strftime('%Y%m%d-%H%M%S')
+    path.mkdir(parents=True, exist_ok=True)
+    return path
+
+
+def _summary(profiler, snapshot, peak: int, elapsed: float, name: str) -> str:
+    """Texto con las funciones más costosas y los sitios que más asignan."""
+    import pstats
+    import tracemalloc
+
+    out = io.StringIO()
+    out.write(f"Perfil: {name}\n")
+    out.write(f"Tiempo total: {elapsed:.3f}s | Memoria Python pico: {peak / 1024:.1f} KB\n")
+
+    for title, key in (("TIEMPO ACUMULADO", 'cumulative'), ("TIEMPO PROPIO", 'tottime'),
+                       ("LLAMADAS", 'ncalls')):
+        out.write(f"\n=== {title} ===\n")
+        stats = pstats.Stats(profiler, stream=out)
+        stats.sort_stats(key).print_stats(TOP_FUNCTIONS)
+
+    out.write("\n=== ASIGNACIONES DE MEMORIA (vivas al terminar) ===\n")
+    snapshot = snapshot.filter_traces((
+        tracemalloc.Filter(False, tracemalloc.__file__),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+        tracemalloc.Filter(False, '<frozen importlib._bootstrap_external>'),
+    ))
+    for stat in snapshot.statistics('lineno')[:TOP_ALLOCATIONS]:
+        frame = stat.traceback[0]
+        out.write(f"{stat.size / 1024:10.1f} KB {stat.count:8d} bloques  {frame.filename}:{frame.lineno}\n")
+
+    return out.getvalue()
+
+
+@contextmanager
+def profile_run(output_dir: Optional[Path], name: str) -> Iterator[None]:
+    """
+    Perfila un bloque y escribe sus archivos al terminar.
+
+    Con output_dir None no hace nada, para poder envolver el código sin
+    condicionales. cProfile solo mide el hilo que abre el bloque.
+
+    Args:
+        output_dir: Directorio de perfiles (profile_dir) o None
+        name: Nombre base de los archivos (por ejemplo "Prueba12")
+    """
+    if output_dir is None:
+        yield
+        return
+
+    # Se importan aquí para no sumar su carga al arranque sin --profile
+    import cProfile
+    import tracemalloc
+
+    own_tracemalloc = not tracemalloc.is_tracing()
+    if own_tracemalloc:
+        tracemalloc.start()
+    tracemalloc.reset_peak()
+
+    profiler = cProfile.Profile()
+    start_time = time.perf_counter()
+    profiler.enable()
+    try:
+        yield
+    finally:
+        profiler.disable()
+        elapsed = time.perf_counter() - start_time
+        snapshot = tracemalloc.take_snapshot()
+        peak = tracemalloc.get_traced_memory()[1]
+        if own_tracemalloc:
+            tracemalloc.stop()
+
+        output_dir = Path(output_dir)
+        profiler.dump_stats(str(output_dir / f"{name}.pstats"))
+        (output_dir / f"{name}_resumen.txt").write_text(
+            _summary(profiler, snapshot, peak, elapsed, name), encoding='utf-8')
@@ -0,0 +1,449 @@
+"""
+Script para medir tiempos con repeticiones y comparar dos configuraciones.
+
+Una sola ejecución por instancia (run_tests.py) da tiempos con mucho
+ruido. Este script resuelve cada instancia varias veces, después de unas
+ejecuciones de calentamiento que se descartan, y reporta por instancia la
+mediana, el rango intercuartílico (IQR) y un intervalo de confianza de la
+mediana.
+
+Con dos configuraciones (--a y --b), que pueden diferir en motor, variante
+del modelo, estrategia de búsqueda o solver de MiniZinc, las repeticiones
+se intercalan (A B, B A, ...) para que la deriva del equipo afecte a ambas
+por igual. Por instancia se muestra la aceleración (mediana de A / mediana
+de B, > 1 si B es más rápida) con su intervalo bootstrap, y el valor p de
+la prueba de Mann-Whitney corregido por Holm por comparar varias
+instancias a la vez.
+
+Solo las ejecuciones resueltas (OPTIMAL o SATISFIED) entran en los
+tiempos: un NOT_FOUND, un error o un límite de memoria no dicen cuánto
+tarda la configuración. Una instancia sin ejecuciones resueltas en alguna
+configuración se reporta como inválida y queda fuera de la comparación.
+
+Uso:
+    python scripts/benchmark.py --a engine=milp --b engine=flujo --repeat 10
+    python scripts/benchmark.py --a engine=minizinc,model=entero --b engine=minizinc,model=mediana --tests 1-10
+    python scripts/benchmark.py tests/Prueba30.txt --a engine=flujo --repeat 20 --raw temp/muestras.jsonl
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import argparse
+import json
+import math
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from input_output.input import parse_input_file
+from solver.dispatch import ENGINE_CHOICES, solve
+from solver.minizinc import DEFAULT_SOLVER, MODEL_VARIANTS, SEARCH_STRATEGIES
+from run_tests import (Colors, load_expected_results, print_header, print_subheader, print_success,
+                       print_error, print_warning, print_info)
+from trace_report import percentile
+
+
+# Opciones de una configuración y sus valores por defecto
+CONFIG_DEFAULTS = {'engine': 'auto', 'model': 'default', 'search': 'default', 'solver': DEFAULT_SOLVER}
+CONFIG_CHOICES = {'engine': ENGINE_CHOICES, 'model': tuple(MODEL_VARIANTS),
+                  'search': tuple(SEARCH_STRATEGIES)}
+
+# Motores que usan las opciones model, search y solver (modelos de MiniZinc)
+MINIZINC_ENGINES = ('minizinc', 'lns')
+
+# Estados cuyas ejecuciones cuentan para los tiempos
+SOLVED_STATUSES = ('OPTIMAL', 'SATISFIED')
+
+# Remuestreos del intervalo bootstrap de la aceleración
+BOOTSTRAP_SAMPLES = 2000
+
+# Diferencia de polarización a partir de la cual dos configuraciones no coinciden
+POLARIZATION_TOLERANCE = 0.001
+
+
+def parse_config(text: str) -> Dict[str, str]:
+    """
+    Convierte "engine=milp,model=entero" en una configuración completa.
+
+    Args:
+        text: Pares clave=valor separados por coma (engine, model, search,
+              solver); las claves ausentes toman CONFIG_DEFAULTS
+
+    Returns:
+        Diccionario con todas las claves de CONFIG_DEFAULTS
+
+    Raises:
+        argparse.ArgumentTypeError: Si una clave o un valor no existe, o si
+            se elige model, search o solver con un motor que no los usa
+    """
+    config = dict(CONFIG_DEFAULTS)
+    for item in filter(None, (part.strip() for part in text.split(','))):
+        key, sep, value = item.partition('=')
+        if not sep or key not in CONFIG_DEFAULTS:
+            raise argparse.ArgumentTypeError(
+                f"Opción inválida '{item}' (use clave=valor con {', '.join(CONFIG_DEFAULTS)})")
+        if key in CONFIG_CHOICES and value not in CONFIG_CHOICES[key]:
+            raise argparse.ArgumentTypeError(
+                f"Valor inválido para {key}: {value} (opciones: {', '.join(CONFIG_CHOICES[key])})")
+        config[key] = value
+
+    ignored = [key for key in ('model', 'search', 'solver')
+               if config[key] != CONFIG_DEFAULTS[key] and config['engine'] not in MINIZINC_ENGINES]
+    if ignored:
+        raise argparse.ArgumentTypeError(
+            f"{', '.join(ignored)} solo aplica a los motores {', '.join(MINIZINC_ENGINES)} "
+            f"(motor elegido: {config['engine']})")
+    return config
+
+
+def config_label(config: Dict[str, str]) -> str:
+    """Texto corto con las opciones que difieren de CONFIG_DEFAULTS."""
+    changed = [f"{key}={value}" for key, value in config.items() if value != CONFIG_DEFAULTS[key]]
+    return ','.join(changed) or 'por defecto'
+
+
+def parse_test_numbers(text: str) -> List[int]:
+    """Convierte "1-5,9" en [1, 2, 3, 4, 5, 9]."""
+    numbers = []
+    for part in filter(None, (part.strip() for part in text.split(','))):
+        first, _, last = part.partition('-')
+        numbers.extend(range(int(first), int(last or first) + 1))
+    return numbers
+
+
+def run_once(params: Dict, config: Dict[str, str], timeout: int) -> Dict:
+    """
+    Resuelve una instancia una vez y mide el tiempo de pared.
+
+    Returns:
+        Diccionario con 'time', 'status', 'polarization' y 'engine'
+    """
+    start = time.perf_counter()
+    solution = solve(params, config['engine'], timeout, model=config['model'],
+                     search=config['search'], solver=config['solver'])
+    elapsed = time.perf_counter() - start
+    return {
+        'time': elapsed,
+        'status': solution['status'],
+        'polarization': solution.get('polarization'),
+        'engine': solution['engine']
+    }
+
+
+def median_ci(values: Sequence[float], confidence: float) -> Tuple[float, float]:
+    """
+    Intervalo de confianza de la mediana por estadísticos de orden.
+
+    No supone ninguna distribución: el número de muestras bajo la mediana
+    real es Binomial(n, 1/2). Con pocas muestras (menos de 6 al 95%) el
+    intervalo es [mínimo, máximo] y su cobertura real es menor.
+
+    Args:
+        values: Muestras ordenadas
+        confidence: Nivel de confianza (por ejemplo 0.95)
+
+    Returns:
+        Tupla (inferior, superior)
+    """
+    n = len(values)
+    alpha = 1 - confidence
+    cumulative = lambda j: sum(math.comb(n, i) for i in range(j + 1)) / 2 ** n
+    j = 1
+    while j < (n + 1) // 2 and cumulative(j) <= alpha / 2:
+        j += 1
+    return values[j - 1], values[n - j]
+
+
+def mann_whitney(a: Sequence[float], b: Sequence[float]) -> float:
+    """
+    Valor p bilateral de la prueba de Mann-Whitney (aproximación normal).
+
+    Usa rangos promedio para los empates, la corrección de empates de la
+    varianza y la corrección por continuidad.
+
+    Returns:
+        Valor p en [0, 1]
+    """
+    n1, n2 = len(a), len(b)
+    combined = sorted([(value, 0) for value in a] + [(value, 1) for value in b])
+    total = n1 + n2
+    rank_sum = 0.0
+    ties = 0.0
+    start = 0
+    while start < total:
+        end = start
+        while end + 1 < total and combined[end + 1][0] == combined[start][0]:
+            end += 1
+        rank = (start + end) / 2 + 1
+        rank_sum += rank * sum(1 for index in range(start, end + 1) if combined[index][1] == 0)
+        count = end - start + 1
+        ties += count ** 3 - count
+        start = end + 1
+
+    u = rank_sum - n1 * (n1 + 1) / 2
+    variance = n1 * n2 / 12 * ((total + 1) - ties / (total * (total - 1)))
+    if variance <= 0:
+        return 1.0
+    z = max(abs(u - n1 * n2 / 2) - 0.5, 0.0) / math.sqrt(variance)
+    return math.erfc(z / math.sqrt(2))
+
+
+def speedup_ci(a: Sequence[float], b: Sequence[float], confidence: float,
+               rng: random.Random) -> Tuple[float, float]:
+    """
+    Intervalo bootstrap (percentiles) de mediana(a) / mediana(b).
+
+    Returns:
+        Tupla (inferior, superior)
+    """
+    ratios = sorted(statistics.median(rng.choices(a, k=len(a))) / statistics.median(rng.choices(b, k=len(b)))
+                    for _ in range(BOOTSTRAP_SAMPLES))
+    tail = (1 - confidence) / 2 * 100
+    return percentile(ratios, tail), percentile(ratios, 100 - tail)
+
+
+def holm(p_values: Sequence[float]) -> List[float]:
+    """Valores p ajustados por Holm-Bonferroni (mismo orden que la entrada)."""
+    order = sorted(range(len(p_values)), key=lambda index: p_values[index])
+    adjusted = [0.0] * len(p_values)
+    running = 0.0
+    for position, index in enumerate(order):
+        running = max(running, min(1.0, (len(p_values) - position) * p_values[index]))
+        adjusted[index] = running
+    return adjusted
+
+
+def summarize(samples: Sequence[Dict], confidence: float) -> Dict:
+    """
+    Estadísticas de las repeticiones de una configuración en una instancia.
+
+    Los tiempos salen solo de las ejecuciones resueltas (SOLVED_STATUSES).
+
+    Returns:
+        Diccionario con 'times' (ordenados), 'median', 'iqr', 'ci', 'min',
+        'max', 'polarization' (mediana), 'incomplete' (ejecuciones que no
+        terminaron con estado OPTIMAL) y 'unsolved' (ejecuciones excluidas
+        de los tiempos); sin ejecuciones resueltas, las estadísticas de
+        tiempo son None
+    """
+    solved = [sample for sample in samples if sample['status'] in SOLVED_STATUSES]
+    times = sorted(sample['time'] for sample in solved)
+    polarizations = [sample['polarization'] for sample in solved if sample['polarization'] is not None]
+    incomplete = sum(1 for sample in samples if sample['status'] != 'OPTIMAL')
+    if not times:
+        return {'times': [], 'median': None, 'iqr': None, 'ci': None, 'min': None, 'max': None,
+                'polarization': None, 'incomplete': incomplete, 'unsolved': len(samples)}
+    return {
+        'times': times,
+        'median': percentile(times, 50),
+        'iqr': percentile(times, 75) - percentile(times, 25),
+        'ci': median_ci(times, confidence),
+        'min': times[0],
+        'max': times[-1],
+        'polarization': statistics.median(polarizations) if polarizations else None,
+        'incomplete': incomplete,
+        'unsolved': len(samples) - len(solved)
+    }
+
+
+def benchmark_instance(params: Dict, configs: Sequence[Dict], repeat: int, warmup: int,
+                       timeout: int) -> List[List[Dict]]:
+    """
+    Ejecuta el calentamiento y las repeticiones de cada configuración.
+
+    El orden de las configuraciones se invierte en cada repetición.
+
+    Returns:
+        Lista con las muestras de cada configuración, en el orden de configs
+    """
+    samples = [[] for _ in configs]
+    for _ in range(warmup):
+        for config in configs:
+            run_once(params, config, timeout)
+    for rep in range(repeat):
+        order = range(len(configs)) if rep % 2 == 0 else reversed(range(len(configs)))
+        for index in order:
+            sample = run_once(params, configs[index], timeout)
+            sample['rep'] = rep
+            samples[index].append(sample)
+    return samples
+
+
+def print_single_table(rows: List[Dict], confidence: float):
+    """Tabla de tiempos de una sola configuración."""
+    level = f"IC{confidence * 100:.0f}%"
+    print(f"{Colors.BOLD}{'Instancia':<14} {'Mediana':>9} {'IQR':>9} {level:>21} "
+          f"{'Mín':>9} {'Máx':>9}  Notas{Colors.ENDC}")
+    for row in rows:
+        stats = row['stats'][0]
+        if stats['median'] is None:
+            print(f"{Colors.FAIL}{row['name']:<14} {'inválida: ninguna ejecución resuelta':>61}{Colors.ENDC}")
+            continue
+        notes = f"{stats['incomplete']} sin óptimo" if stats['incomplete'] else ""
+        if stats['unsolved']:
+            notes += f"{'; ' if notes else ''}{stats['unsolved']} sin resolver (excluidas)"
+        ci = f"[{stats['ci'][0]:.4f}, {stats['ci'][1]:.4f}]"
+        print(f"{row['name']:<14} {stats['median']:>9.4f} {stats['iqr']:>9.4f} {ci:>21} "
+              f"{stats['min']:>9.4f} {stats['max']:>9.4f}  {notes}")
+
+
+def print_comparison_table(rows: List[Dict], confidence: float, alpha: float):
+    """Tabla de aceleraciones por instancia (A contra B)."""
+    level = f"IC{confidence * 100:.0f}%"
+    print(f"{Colors.BOLD}{'Instancia':<14} {'A med':>9} {'A IQR':>9} {'B med':>9} {'B IQR':>9} "
+          f"{'A/B':>7} {level:>17} {'p (Holm)':>9}  Notas{Colors.ENDC}")
+    for row in rows:
+        a, b = row['stats']
+        if row['invalid']:
+            sides = [name for name, stats in zip('AB', (a, b)) if stats['median'] is None]
+            print(f"{Colors.FAIL}{row['name']:<14} inválida: {' y '.join(sides)} sin ejecuciones "
+                  f"resueltas{Colors.ENDC}")
+            continue
+        notes = []
+        if a['incomplete'] or b['incomplete']:
+            notes.append(f"sin óptimo A={a['incomplete']} B={b['incomplete']}")
+        if a['unsolved'] or b['unsolved']:
+            notes.append(f"sin resolver (excluidas) A={a['unsolved']} B={b['unsolved']}")
+        if (a['polarization'] is not None and b['polarization'] is not None
+                and abs(a['polarization'] - b['polarization']) > POLARIZATION_TOLERANCE):
+            notes.append("polarización distinta")
+
+        if row['p_adjusted'] < alpha:
+            color = Colors.OKGREEN if row['speedup'] > 1 else Colors.FAIL
+        else:
+            color = ''
+        ci = f"[{row['ci'][0]:.2f}, {row['ci'][1]:.2f}]"
+        print(f"{color}{row['name']:<14} {a['median']:>9.4f} {a['iqr']:>9.4f} {b['median']:>9.4f} "
+              f"{b['iqr']:>9.4f} {row['speedup']:>7.2f} {ci:>17} {row['p_adjusted']:>9.4f}  "
+              f"{'; '.join(notes)}{Colors.ENDC if color else ''}")
+
+
+def main():
+    """Función principal del banco de pruebas."""
+    parser = argparse.ArgumentParser(description="Tiempos con repeticiones y comparación A/B de configuraciones.")
+    parser.add_argument('inputs', nargs='*', type=Path,
+                        help="Archivos de entrada .txt (por defecto, las pruebas de tests/)")
+    parser.add_argument('--tests', type=parse_test_numbers, default=None,
+                        help="Pruebas de tests/ a medir, por ejemplo 1-5,9")
+    parser.add_argument('--a', type=parse_config, default=dict(CONFIG_DEFAULTS), metavar='CONFIG',
+                        help="Configuración A: engine=...,model=...,search=...,solver=...")
+    parser.add_argument('--b', type=parse_config, default=None, metavar='CONFIG',
+                        help="Configuración B a comparar con A (opcional)")
+    parser.add_argument('--repeat', type=int, default=10,
+                        help="Repeticiones medidas por instancia y configuración")
+    parser.add_argument('--warmup', type=int, default=1,
+                        help="Ejecuciones de calentamiento descartadas")
+    parser.add_argument('--timeout', type=int, default=60, metavar='SEG',
+                        help="Límite fijo por ejecución (igual para ambas configuraciones)")
+    parser.add_argument('--confidence', type=float, default=0.95,
+                        help="Nivel de confianza de los intervalos")
+    parser.add_argument('--alpha', type=float, default=0.05,
+                        help="Nivel de significancia de la comparación")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Semilla del bootstrap")
+    parser.add_argument('--raw', type=Path, default=None,
+                        help="Guardar cada ejecución medida en este archivo (.jsonl)")
+    args = parser.parse_args()
+
+    print_header("BANCO DE TIEMPOS")
+
+    if args.repeat < 2:
+        print_error("Se necesitan al menos 2 repeticiones")
+        return 1
+
+    if args.inputs:
+        paths = args.inputs
+    else:
+        tests_dir = ROOT_DIR / 'tests'
+        numbers = args.tests or sorted(load_expected_results(tests_dir / 'resultados.txt'))
+        paths = [tests_dir / f"Prueba{number}.txt" for number in numbers]
+
+    instances = []
+    for path in paths:
+        try:
+            instances.append((path, parse_input_file(str(path))))
+        except (FileNotFoundError, ValueError) as e:
+            print_warning(f"{path.name}: {e}")
+    if not instances:
+        print_error("No hay instancias que medir")
+        return 1
+
+    configs = [args.a] + ([args.b] if args.b else [])
+    for name, config in zip('AB', configs):
+        print_info(f"Configuración {name}: {config_label(config)}")
+    print_info(f"{len(instances)} instancias | {args.warmup} de calentamiento + {args.repeat} repeticiones "
+               f"| límite {args.timeout}s")
+
+    raw = None
+    if args.raw:
+        args.raw.parent.mkdir(parents=True, exist_ok=True)
+        raw = open(args.raw, 'w', encoding='utf-8')
+
+    print_subheader("MIDIENDO")
+    rows = []
+    start = time.perf_counter()
+    try:
+        for index, (path, params) in enumerate(instances, 1):
+            print_info(f"[{index}/{len(instances)}] {path.name} (m={params['m']})")
+            samples = benchmark_instance(params, configs, args.repeat, args.warmup, args.timeout)
+            if raw:
+                for name, config, config_samples in zip('AB', configs, samples):
+                    for sample in config_samples:
+                        raw.write(json.dumps(dict(sample, file=str(path), config=name,
+                                                  label=config_label(config))) + '\n')
+            rows.append({'name': path.stem, 'stats': [summarize(s, args.confidence) for s in samples]})
+    finally:
+        if raw:
+            raw.close()
+
+    rng = random.Random(args.seed)
+    valid = [row for row in rows if all(stats['median'] is not None for stats in row['stats'])]
+    if args.b:
+        for row in rows:
+            row['invalid'] = row not in valid
+        for row in valid:
+            a, b = row['stats']
+            row['speedup'] = a['median'] / b['median'] if b['median'] > 0 else math.inf
+            row['ci'] = speedup_ci(a['times'], b['times'], args.confidence, rng)
+            row['p'] = mann_whitney(a['times'], b['times'])
+        for row, adjusted in zip(valid, holm([row['p'] for row in valid])):
+            row['p_adjusted'] = adjusted
+
+    print_subheader("TIEMPOS POR INSTANCIA (segundos)")
+    if args.b:
+        print_comparison_table(rows, args.confidence, args.alpha)
+    else:
+        print_single_table(rows, args.confidence)
+
+    if args.b:
+        print_subheader("RESUMEN")
+        finite = [row['speedup'] for row in valid if 0 < row['speedup'] < math.inf]
+        if finite:
+            geometric = math.exp(sum(math.log(value) for value in finite) / len(finite))
+            print(f"  Aceleración media geométrica (A/B): {geometric:.3f}")
+        faster = sum(1 for row in valid if row['p_adjusted'] < args.alpha and row['speedup'] > 1)
+        slower = sum(1 for row in valid if row['p_adjusted'] < args.alpha and row['speedup'] < 1)
+        print(f"  B más rápida: {faster} | B más lenta: {slower} | "
+              f"sin diferencia significativa: {len(valid) - faster - slower} (alfa = {args.alpha})")
+        if len(valid) < len(rows):
+            print_warning(f"{len(rows) - len(valid)} instancias inválidas (sin ejecuciones resueltas) "
+                          f"fuera de la comparación")
+    elif len(valid) < len(rows):
+        print_warning(f"{len(rows) - len(valid)} instancias sin ejecuciones resueltas")
+
+    print_success(f"Medición terminada en {time.perf_counter() - start:.1f}s")
+    if args.raw:
+        print_success(f"Muestras guardadas en: {args.raw}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
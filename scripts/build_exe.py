@@ -55,12 +55,14 @@ def build_executable():
         '--icon=assets/logo.ico' if (ROOT_DIR / 'assets' / 'logo.ico').exists() else '',
         '--add-data=model;model',  # Incluir directorio model
         '--add-data=assets;assets',  # Incluir assets
+        '--add-data=solver/tiempos_base.json;solver',  # Coeficientes de tiempos base
         '--hidden-import=tkinter',
         '--hidden-import=tkinter.ttk',
         '--hidden-import=tkinter.filedialog',
         '--hidden-import=tkinter.messagebox',
         '--hidden-import=tkinter.scrolledtext',
         '--collect-all=input_output',
+        '--collect-all=solver',
         f'--specpath={ROOT_DIR}',
         str(ROOT_DIR / 'main.py')
     ]
@@ -0,0 +1,260 @@
+"""
+Script para calibrar las estimaciones de tiempo sin historial.
+
+solver.scheduling estima el tiempo de cada motor como
+intercepto + pendiente * término, donde el término depende del tamaño de
+la instancia (ver PRIOR_TERMS). Este script mide los motores y ajusta
+intercepto y pendiente por mínimos cuadrados sobre el error relativo, y
+guarda el resultado (con las muestras usadas) en solver/tiempos_base.json,
+que scheduling lee al importarse.
+
+Las muestras salen de una de dos fuentes:
+
+- Una corrida de medición (por defecto): las pruebas de tests/ y
+  instancias aleatorias (con semilla) de tamaños crecientes, resueltas
+  varias veces con cada motor disponible; se toma la mediana.
+- Un historial ya registrado (--history), con las ejecuciones completas.
+
+Solo se usan ejecuciones completas (óptimo demostrado; en la heurística,
+cualquier plan): las que agotan el límite no dicen cuánto habría tardado
+el motor.
+
+Uso:
+    python scripts/calibrate_priors.py
+    python scripts/calibrate_priors.py --engines milp,flujo --repeat 5
+    python scripts/calibrate_priors.py --history temp/historial_tiempos.jsonl
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import argparse
+import json
+import platform
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Dict, List, Sequence, Tuple
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from input_output.input import parse_input_file
+from solver.dispatch import ENGINES, available_engines
+from solver.scheduling import PRIORS_FILE, PRIOR_TERMS, instance_features, load_history
+from run_tests import print_header, print_subheader, print_success, print_error, print_warning, print_info
+
+
+# Tamaños (m) de las instancias aleatorias por motor: los motores lentos
+# se miden en instancias más chicas para que la calibración no tarde horas
+DEFAULT_SIZES = {
+    'heuristica': (5, 10, 20, 40, 80, 160),
+    'milp': (5, 10, 15, 20, 30, 40),
+    'flujo': (5, 10, 20, 40, 60, 80),
+    'minizinc': (3, 5, 8, 10, 12),
+}
+
+
+def random_instance(m: int, rng: random.Random) -> Dict:
+    """
+    Genera una instancia aleatoria con m opiniones.
+
+    Args:
+        m: Número de opiniones
+        rng: Generador de números aleatorios
+
+    Returns:
+        Diccionario de parámetros como parse_input_file
+    """
+    s = [[rng.randint(0, 15) for _ in range(3)] for _ in range(m)]
+    p = [sum(row) for row in s]
+    n = sum(p)
+    unit_cost = sum(low + 1.5 * medium + 2 * high for low, medium, high in s)
+    return {
+        'n': n,
+        'm': m,
+        'p': p,
+        'v': sorted(round(rng.random(), 3) for _ in range(m)),
+        's': s,
+        'ct': round(rng.uniform(0.05, 0.5) * unit_cost, 1),
+        'maxMovs': float(rng.randint(1, max(n // 2, 1)))
+    }
+
+
+def measure(engine: str, instances: Sequence[Tuple[str, Dict]], repeat: int,
+            timeout: int) -> List[Dict]:
+    """
+    Resuelve cada instancia varias veces con un motor.
+
+    Returns:
+        Muestras con 'instance', 'features' y 'time' (mediana), solo de
+        las instancias que el motor resolvió por completo
+    """
+    solve = ENGINES[engine]
+    samples = []
+    for name, params in instances:
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            solution = solve(params, timeout=timeout)
+            elapsed = time.perf_counter() - start
+            # La heurística siempre termina: SATISFIED solo indica brecha con la cota
+            complete = solution['status'] == 'OPTIMAL' or (engine == 'heuristica'
+                                                           and solution['status'] == 'SATISFIED')
+            if not complete:
+                times = []
+                break
+            times.append(elapsed)
+        if times:
+            samples.append({'instance': name, 'features': instance_features(params),
+                            'time': statistics.median(times)})
+    return samples
+
+
+def fit(points: Sequence[Tuple[float, float]]) -> Tuple[float, float]:
+    """
+    Ajusta tiempo = intercepto + pendiente * término con error relativo mínimo.
+
+    Minimiza Σ ((a + b x - t) / t)²: los tiempos van de milisegundos a
+    minutos y el error absoluto solo miraría las instancias grandes. Ambos
+    coeficientes se restringen a valores no negativos.
+
+    Args:
+        points: Pares (término, tiempo)
+
+    Returns:
+        Tupla (intercepto, pendiente)
+    """
+    w0 = sum(1 / t ** 2 for _, t in points)
+    w1 = sum(x / t ** 2 for x, t in points)
+    w2 = sum(x * x / t ** 2 for x, t in points)
+    r0 = sum(1 / t for _, t in points)
+    r1 = sum(x / t for x, t in points)
+
+    determinant = w0 * w2 - w1 * w1
+    if determinant > 0:
+        intercept = (r0 * w2 - r1 * w1) / determinant
+        slope = (w0 * r1 - w1 * r0) / determinant
+        if intercept >= 0 and slope >= 0:
+            return intercept, slope
+
+    # Solución en el borde: solo pendiente o solo intercepto
+    candidates = []
+    if w2 > 0:
+        candidates.append((0.0, max(r1 / w2, 0.0)))
+    candidates.append((r0 / w0, 0.0))
+    error = lambda ab: sum(((ab[0] + ab[1] * x - t) / t) ** 2 for x, t in points)
+    return min(candidates, key=error)
+
+
+def fit_engine(engine: str, samples: Sequence[Dict]) -> Dict:
+    """
+    Ajusta el modelo de un motor y resume su calidad.
+
+    Returns:
+        Diccionario con 'intercept', 'slope', 'samples', 'median_ratio'
+        (mediana de estimado / medido) y 'm_range'
+    """
+    term = PRIOR_TERMS[engine]
+    points = [(term(sample['features']), max(sample['time'], 1e-4)) for sample in samples]
+    intercept, slope = fit(points)
+    ratios = sorted((intercept + slope * x) / t for x, t in points)
+    sizes = [sample['features']['m'] for sample in samples]
+    return {
+        'intercept': intercept,
+        'slope': slope,
+        'samples': len(samples),
+        'median_ratio': round(statistics.median(ratios), 3),
+        'm_range': [min(sizes), max(sizes)]
+    }
+
+
+def main():
+    """Función principal de la calibración."""
+    parser = argparse.ArgumentParser(description="Calibra las estimaciones de tiempo sin historial.")
+    parser.add_argument('--engines', type=lambda text: [e for e in text.split(',') if e], default=None,
+                        help="Motores a calibrar (por defecto, los disponibles)")
+    parser.add_argument('--history', type=Path, default=None,
+                        help="Ajustar con este historial en lugar de medir")
+    parser.add_argument('--per-size', type=int, default=3,
+                        help="Instancias aleatorias por tamaño")
+    parser.add_argument('--repeat', type=int, default=3,
+                        help="Repeticiones por instancia (se usa la mediana)")
+    parser.add_argument('--timeout', type=int, default=120, metavar='SEG',
+                        help="Límite por ejecución")
+    parser.add_argument('--seed', type=int, default=0,
+                        help="Semilla de las instancias aleatorias")
+    parser.add_argument('--output', type=Path, default=PRIORS_FILE,
+                        help="Archivo de salida (por defecto el que lee solver.scheduling)")
+    args = parser.parse_args()
+
+    print_header("CALIBRACIÓN DE TIEMPOS BASE")
+
+    engines = args.engines or [engine for engine in available_engines() if engine in PRIOR_TERMS]
+    unknown = [engine for engine in engines if engine not in PRIOR_TERMS]
+    if unknown:
+        print_error(f"Motores sin modelo de tiempo: {', '.join(unknown)} "
+                    f"(opciones: {', '.join(PRIOR_TERMS)})")
+        return 1
+
+    samples_by_engine: Dict[str, List[Dict]] = {}
+    if args.history:
+        history = load_history(args.history)
+        for engine in engines:
+            samples_by_engine[engine] = [
+                {'instance': record.get('instance', ''), 'features': record['features'], 'time': record['time']}
+                for record in history
+                if record.get('engine', 'minizinc') == engine and record.get('complete', True)
+            ]
+        source = f"historial {args.history.name}"
+    else:
+        tests = [(path.name, parse_input_file(str(path)))
+                 for path in sorted((ROOT_DIR / 'tests').glob('Prueba*.txt'))]
+        for engine in engines:
+            rng = random.Random(args.seed)
+            generated = [(f"aleatoria_m{m}_{index}", random_instance(m, rng))
+                         for m in DEFAULT_SIZES[engine] for index in range(args.per_size)]
+            print_subheader(f"MIDIENDO {engine.upper()}")
+            print_info(f"{len(tests)} pruebas + {len(generated)} instancias aleatorias "
+                       f"(m = {', '.join(map(str, DEFAULT_SIZES[engine]))}) x {args.repeat}")
+            # Calentamiento: importaciones y cachés fuera de la medición
+            ENGINES[engine](tests[0][1], timeout=args.timeout)
+            samples_by_engine[engine] = measure(engine, tests + generated, args.repeat, args.timeout)
+        source = "medición (tests/ + instancias aleatorias)"
+
+    print_subheader("AJUSTE")
+    try:
+        calibration = json.loads(args.output.read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        calibration = {}
+    calibration.setdefault('engines', {})
+    calibration.setdefault('samples', {})
+
+    for engine in engines:
+        samples = samples_by_engine[engine]
+        if len(samples) < 3:
+            print_warning(f"{engine}: solo {len(samples)} muestras completas, no se ajusta")
+            continue
+        result = fit_engine(engine, samples)
+        result.update(source=source, machine=platform.platform(), python=platform.python_version(),
+                      date=time.strftime('%Y-%m-%d'))
+        calibration['engines'][engine] = result
+        calibration['samples'][engine] = [
+            {'instance': s['instance'], 'm': s['features']['m'], 'n': s['features']['n'],
+             'moves': s['features']['moves'], 'time': round(s['time'], 6)}
+            for s in samples
+        ]
+        print_info(f"{engine}: {result['intercept']:.3g} + {result['slope']:.3g} * término "
+                   f"({result['samples']} muestras, m = {result['m_range'][0]:.0f}..{result['m_range'][1]:.0f}, "
+                   f"estimado/medido mediano {result['median_ratio']})")
+
+    args.output.write_text(json.dumps(calibration, indent=2, ensure_ascii=False) + '\n', encoding='utf-8')
+    print_success(f"Calibración guardada en: {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,103 @@
+"""
+Script para calcular la frontera polarización vs. presupuesto de una instancia.
+
+Barre una malla de presupuestos (ct, maxMovs) o un rayo que escala el
+presupuesto de la instancia desde 0, reutilizando soluciones y cotas entre
+puntos, y exporta la curva como tabla CSV.
+
+Uso:
+    python scripts/pareto_sweep.py tests/Prueba25.txt --ray 11 --csv frontera.csv
+    python scripts/pareto_sweep.py tests/Prueba25.txt --ct 20,60,100 --maxmovs 25,75,125
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from input_output.input import parse_input_file
+from solver.minizinc import MODEL_VARIANTS
+from solver.pareto import budget_grid, budget_ray, pareto_sweep, write_frontier_csv
+from run_tests import Colors, print_header, print_subheader, print_success, print_error, print_info
+
+
+def parse_values(text: str):
+    """Convierte "10,20,30" en [10.0, 20.0, 30.0]."""
+    return [float(x) for x in text.split(',') if x.strip()]
+
+
+def main():
+    """Función principal del barrido."""
+    parser = argparse.ArgumentParser(description="Frontera polarización vs. presupuesto (ct, maxMovs).")
+    parser.add_argument('input', type=Path, help="Archivo de entrada .txt")
+    parser.add_argument('--ct', type=parse_values, default=None,
+                        help="Valores de ct separados por coma (por defecto: el de la instancia)")
+    parser.add_argument('--maxmovs', type=parse_values, default=None,
+                        help="Valores de maxMovs separados por coma (por defecto: el de la instancia)")
+    parser.add_argument('--ray', type=int, default=None,
+                        help="Barrer N puntos escalando (ct, maxMovs) de la instancia desde 0")
+    parser.add_argument('--refine', action='store_true',
+                        help="Refinar entre puntos consecutivos hasta ubicar los escalones")
+    parser.add_argument('--resolution', type=float, default=0.5,
+                        help="Resolución del refinamiento en unidades de costo")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Puntos resueltos en paralelo")
+    parser.add_argument('--timeout', type=int, default=300,
+                        help="Tiempo máximo por punto en segundos")
+    parser.add_argument('--model', choices=sorted(MODEL_VARIANTS), default='default',
+                        help="Variante del modelo MiniZinc")
+    parser.add_argument('--csv', type=Path, default=None, help="Archivo .csv de salida")
+    args = parser.parse_args()
+
+    print_header("FRONTERA POLARIZACIÓN VS. PRESUPUESTO")
+
+    try:
+        params = parse_input_file(str(args.input))
+    except (FileNotFoundError, ValueError) as e:
+        print_error(str(e))
+        return 1
+
+    if args.ray:
+        budgets = budget_ray(params['ct'], params['maxMovs'], args.ray)
+    else:
+        budgets = budget_grid(args.ct or [params['ct']], args.maxmovs or [params['maxMovs']])
+
+    print_info(f"Instancia: {args.input.name} (n={params['n']}, m={params['m']})")
+    print_info(f"Barriendo {len(budgets)} presupuestos con {args.workers} procesos...")
+
+    start_time = time.time()
+    frontier = pareto_sweep(params, budgets, workers=args.workers, refine=args.refine,
+                            resolution=args.resolution, timeout=args.timeout,
+                            model=args.model)
+    elapsed_time = time.time() - start_time
+
+    print_subheader("FRONTERA")
+    print(f"{Colors.BOLD}{'ct':>10} {'maxMovs':>10} {'Polarización':>13} {'Costo':>8} "
+          f"{'Movs':>6}  {'Estado':<10} {'Origen':<9}{Colors.ENDC}")
+    for point in frontier:
+        line = (f"{point['ct']:>10.1f} {point['maxMovs']:>10.1f} {point['polarization']:>13.3f} "
+                f"{point['cost']:>8.1f} {point['moves']:>6}  {point['status']:<10} {point['source']:<9}")
+        print(f"{Colors.OKGREEN}{line}{Colors.ENDC}" if point['efficient'] else line)
+
+    solved = sum(1 for p in frontier if p['source'] == 'solver')
+    print()
+    print_success(f"{len(frontier)} puntos en {elapsed_time:.2f}s "
+                  f"({solved} resueltos, {len(frontier) - solved} inferidos)")
+
+    if args.csv:
+        write_frontier_csv(frontier, str(args.csv))
+        print_success(f"Tabla guardada en: {args.csv}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -8,20 +8,29 @@ Autores: Andrey Quiceño, Iván, Francesco, Jonathan
 Fecha: Diciembre 2025
 """
 
+import argparse
+import json
 import os
 import sys
-import subprocess
-import time
 from pathlib import Path
-from typing import Dict, List, Tuple
-import re
+from typing import Dict, List, Optional, Sequence
 
 # Agregar el directorio raíz al path
 ROOT_DIR = Path(__file__).parent.parent
 sys.path.insert(0, str(ROOT_DIR))
 
-from input_output.input import txt_to_dzn
-from input_output.output import parse_minizinc_output
+from input_output.input import parse_input_file
+from profiling import PROFILE_DIR, profile_dir, profile_run
+from solver.dispatch import ENGINE_CHOICES, choose_engine
+from solver.minizinc import MODEL_VARIANTS, SEARCH_STRATEGIES
+from solver.scheduling import (DEFAULT_TIMEOUT, MIN_TIME_LIMIT, grant_time, load_history,
+                               record_runtime, schedule_batch)
+from solver.symmetry import solve_symmetric
+from tracing import current_span, enable_tracing, instance_attrs, span
+
+
+# Bitácora de la última ejecución: un resultado por línea, escrito al terminar cada prueba
+DEFAULT_JOURNAL = ROOT_DIR / 'temp' / 'bitacora_pruebas.jsonl'
 
 
 # Colores ANSI para terminal
@@ -111,127 +120,121 @@ def load_expected_results(results_file: Path) -> Dict[int, float]:
         return {}
 
 
-def run_minizinc(mzn_file: Path, dzn_file: Path, timeout: int = 300) -> Tuple[bool, str, float]:
+def compare_results(obtained: float, expected: float, tolerance: float = 0.001) -> bool:
     """
-    Ejecuta MiniZinc con un modelo y datos.
+    Compara dos valores de polarización.
     
     Args:
-        mzn_file: Ruta al archivo .mzn
-        dzn_file: Ruta al archivo .dzn
-        timeout: Tiempo máximo de ejecución en segundos
+        obtained: Valor obtenido
+        expected: Valor esperado
+        tolerance: Tolerancia para la comparación
         
     Returns:
-        Tupla (éxito, salida, tiempo_ejecución)
+        True si los valores son iguales dentro de la tolerancia
     """
-    start_time = time.time()
-    
-    try:
-        # Comando para ejecutar MiniZinc
-        cmd = [
-            'minizinc',
-            '--solver', 'Gecode',
-            '--output-mode', 'json',
-            '--time-limit', str(timeout * 1000),  # en milisegundos
-            str(mzn_file),
-            str(dzn_file)
-        ]
-        
-        result = subprocess.run(
-            cmd,
-            capture_output=True,
-            text=True,
-            timeout=timeout
-        )
-        
-        elapsed_time = time.time() - start_time
-        
-        if result.returncode == 0:
-            return True, result.stdout, elapsed_time
-        else:
-            return False, result.stderr, elapsed_time
-            
-    except subprocess.TimeoutExpired:
-        elapsed_time = time.time() - start_time
-        return False, "TIMEOUT", elapsed_time
-    except FileNotFoundError:
-        return False, "MiniZinc no encontrado. Asegúrese de que esté instalado y en el PATH.", 0
-    except Exception as e:
-        return False, str(e), 0
+    if obtained is None:
+        return False
+    return abs(obtained - expected) <= tolerance
+
+
+def format_memory(n_bytes: Optional[int]) -> str:
+    """Formatea una cantidad de bytes en MB ('-' si no se midió)."""
+    if n_bytes is None:
+        return '-'
+    return f"{n_bytes / (1024 * 1024):.1f} MB"
 
 
-def extract_polarization(minizinc_output: str) -> float:
+def load_journal(journal_file: Path) -> Dict[int, Dict]:
     """
-    Extrae el valor de polarización de la salida de MiniZinc.
+    Carga los resultados registrados en la bitácora de una ejecución.
+    
+    Una línea cortada por una interrupción se ignora; si una prueba aparece
+    varias veces, queda el último resultado.
     
     Args:
-        minizinc_output: Salida de MiniZinc (JSON o texto)
+        journal_file: Archivo .jsonl de la bitácora
         
     Returns:
-        Valor de polarización
+        Diccionario {número_prueba: resultado}
     """
+    results = {}
+    
     try:
-        # Intentar parsear como JSON (puede ser multilínea)
-        import json
-        # Separar por los delimitadores de solución
-        parts = minizinc_output.split('----------')
-        for part in parts:
-            part = part.strip()
-            if part and part.startswith('{'):
-                # Puede ser JSON multilínea, tomar hasta el cierre
-                json_end = part.find('}\n')
-                if json_end == -1:
-                    json_end = part.find('}')
-                if json_end != -1:
-                    json_str = part[:json_end+1]
-                    try:
-                        data = json.loads(json_str)
-                        if 'polarization' in data:
-                            return float(data['polarization'])
-                    except:
-                        continue
-    except:
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    result = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(result, dict) and 'test_num' in result:
+                    results[result['test_num']] = result
+    except FileNotFoundError:
         pass
     
-    try:
-        # Intentar con el parser estándar
-        parsed = parse_minizinc_output(minizinc_output)
-        return parsed.get('polarization', None)
-    except:
-        # Intentar extraer directamente con regex
-        match = re.search(r'polarization=(-?[\d.]+(?:[eE][+-]?\d+)?)', minizinc_output)
-        if match:
-            return float(match.group(1))
-        return None
+    return results
 
 
-def compare_results(obtained: float, expected: float, tolerance: float = 0.001) -> bool:
+def journal_config(journal_file: Path) -> Optional[Dict]:
     """
-    Compara dos valores de polarización.
+    Lee la configuración (motor, modelo, estrategia) guardada en la bitácora.
     
     Args:
-        obtained: Valor obtenido
-        expected: Valor esperado
-        tolerance: Tolerancia para la comparación
+        journal_file: Archivo .jsonl de la bitácora
         
     Returns:
-        True si los valores son iguales dentro de la tolerancia
+        Diccionario de la configuración, o None si la bitácora no existe o
+        no la tiene (bitácoras anteriores a este registro)
     """
-    if obtained is None:
-        return False
-    return abs(obtained - expected) <= tolerance
+    try:
+        with open(journal_file, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(entry, dict) and 'config' in entry:
+                    return entry['config']
+    except FileNotFoundError:
+        pass
+    
+    return None
 
 
-def run_test(test_num: int, tests_dir: Path, mzn_file: Path, 
-             expected_pol: float, temp_dir: Path) -> Dict:
+def append_journal(journal_file: Path, result: Dict):
+    """
+    Agrega un resultado a la bitácora y lo fuerza a disco.
+    
+    Args:
+        journal_file: Archivo .jsonl de la bitácora
+        result: Resultado de run_test
+    """
+    with open(journal_file, 'a', encoding='utf-8') as f:
+        f.write(json.dumps(result) + '\n')
+        f.flush()
+        os.fsync(f.fileno())
+
+
+def run_test(test_num: int, tests_dir: Path, expected_pol: float,
+             engine: str = 'auto', timeout: int = DEFAULT_TIMEOUT,
+             history: Sequence[Dict] = (),
+             memory_limit_mb: Optional[int] = None,
+             cache: Optional[Dict] = None, search: str = 'default',
+             model: str = 'default') -> Dict:
     """
     Ejecuta una prueba individual.
     
     Args:
         test_num: Número de la prueba
         tests_dir: Directorio de pruebas
-        mzn_file: Archivo .mzn del modelo
         expected_pol: Polarización esperada
-        temp_dir: Directorio temporal para archivos .dzn
+        engine: Motor de resolución ('auto' para elegirlo por instancia)
+        timeout: Límite de tiempo del motor en segundos
+        history: Historial de tiempos usado por el selector de motor
+        memory_limit_mb: Límite de memoria del solver en MB (opcional)
+        cache: Soluciones del lote por forma canónica (opcional); las
+               pruebas equivalentes por simetría se resuelven una vez
+        search: Estrategia de búsqueda de MiniZinc (ver SEARCH_STRATEGIES)
+        model: Variante del modelo MiniZinc (ver MODEL_VARIANTS)
         
     Returns:
         Diccionario con los resultados de la prueba
@@ -245,11 +248,10 @@ def run_test(test_num: int, tests_dir: Path, mzn_file: Path,
             'message': f"Archivo {test_file.name} no encontrado"
         }
     
-    # Generar archivo .dzn
-    dzn_file = temp_dir / f"Prueba{test_num}.dzn"
-    
     try:
-        txt_to_dzn(str(test_file), str(dzn_file))
+        with span('parse_input'):
+            params = parse_input_file(str(test_file))
+        current_span().set(**instance_attrs(params))
     except Exception as e:
         return {
             'test_num': test_num,
@@ -257,27 +259,31 @@ def run_test(test_num: int, tests_dir: Path, mzn_file: Path,
             'message': f"Error al parsear entrada: {str(e)}"
         }
     
-    # Ejecutar MiniZinc
-    success, output, exec_time = run_minizinc(mzn_file, dzn_file)
+    # Resolver con el motor indicado o el elegido automáticamente
+    solution = solve_symmetric(params, cache, engine, timeout, history,
+                               model=model, memory_limit_mb=memory_limit_mb, search=search)
+    resources = {
+        'time': solution['time'],
+        'time_limit': timeout,
+        'engine': solution['engine'],
+        'reason': solution['reason'],
+        'engine_status': solution.get('engine_status'),
+        'complete': solution['status'] == 'OPTIMAL',
+        'cache_hit': solution['cache_hit'],
+        'user_time': solution.get('user_time'),
+        'sys_time': solution.get('sys_time'),
+        'peak_rss': solution.get('peak_rss')
+    }
     
-    if not success:
+    if solution['status'] not in ('OPTIMAL', 'SATISFIED'):
         return {
             'test_num': test_num,
-            'status': 'EXECUTION_ERROR',
-            'message': output,
-            'time': exec_time
+            'status': 'MEMORY_LIMIT' if solution['status'] == 'MEMORY_LIMIT' else 'EXECUTION_ERROR',
+            'message': 'TIMEOUT' if solution['status'] == 'TIMEOUT' else solution['message'],
+            **resources
         }
     
-    # Extraer polarización
-    obtained_pol = extract_polarization(output)
-    
-    if obtained_pol is None:
-        return {
-            'test_num': test_num,
-            'status': 'OUTPUT_ERROR',
-            'message': "No se pudo extraer la polarización de la salida",
-            'time': exec_time
-        }
+    obtained_pol = solution['polarization']
     
     # Comparar resultados
     matches = compare_results(obtained_pol, expected_pol)
@@ -288,8 +294,8 @@ def run_test(test_num: int, tests_dir: Path, mzn_file: Path,
         'expected': expected_pol,
         'obtained': obtained_pol,
         'diff': abs(obtained_pol - expected_pol),
-        'time': exec_time,
-        'message': 'OK' if matches else f"Diferencia: {abs(obtained_pol - expected_pol):.6f}"
+        'message': 'OK' if matches else f"Diferencia: {abs(obtained_pol - expected_pol):.6f}",
+        **resources
     }
 
 
@@ -303,21 +309,36 @@ def print_test_result(result: Dict):
     if status == 'PASS':
         pol = result['obtained']
         time_str = f"{result['time']:.3f}s"
-        print_success(f"{prefix}: Polarización = {pol:.3f} | Tiempo = {time_str}")
+        resources = ""
+        if result.get('user_time') is not None:
+            cpu_time = result['user_time'] + result['sys_time']
+            resources = f" | CPU = {cpu_time:.3f}s | Memoria = {format_memory(result['peak_rss'])}"
+        print_success(f"{prefix}: Polarización = {pol:.3f} | Tiempo = {time_str} | "
+                      f"Motor = {result['engine']}{resources}")
     elif status == 'FAIL':
         exp = result['expected']
         obt = result['obtained']
         diff = result['diff']
         print_error(f"{prefix}: Esperado = {exp:.3f}, Obtenido = {obt:.3f}, Diff = {diff:.6f}")
+    
+    # El motor se detuvo por memoria, pero el plan de la heurística se conservó
+    if status in ('PASS', 'FAIL') and result.get('engine_status') == 'MEMORY_LIMIT':
+        print_warning(f"{prefix}: el motor superó el límite de memoria "
+                      f"(pico {format_memory(result['peak_rss'])}); plan de la heurística")
     elif status == 'NOT_FOUND':
         print_warning(f"{prefix}: {result['message']}")
+    elif status == 'MEMORY_LIMIT':
+        print_error(f"{prefix}: LÍMITE DE MEMORIA (pico {format_memory(result['peak_rss'])})")
     elif status == 'EXECUTION_ERROR':
         if result['message'] == 'TIMEOUT':
-            print_error(f"{prefix}: TIMEOUT (>{result['time']:.1f}s)")
+            print_error(f"{prefix}: TIMEOUT (>{result['time_limit']}s)")
         else:
-            print_error(f"{prefix}: Error de ejecución")
+            print_error(f"{prefix}: Error de ejecución: {result['message']}")
     else:
         print_error(f"{prefix}: {result['message']}")
+    
+    if result.get('reason'):
+        print(f"      -> {result['reason']}")
 
 
 def print_summary(results: List[Dict]):
@@ -334,6 +355,12 @@ def print_summary(results: List[Dict]):
     print(f"{Colors.FAIL}{Colors.BOLD}Fallidas:{Colors.ENDC} {failed} ({100*failed/total:.1f}%)")
     print(f"{Colors.WARNING}{Colors.BOLD}Errores:{Colors.ENDC} {errors} ({100*errors/total:.1f}%)")
     
+    memory_stops = sum(1 for r in results
+                       if r['status'] == 'MEMORY_LIMIT' or r.get('engine_status') == 'MEMORY_LIMIT')
+    if memory_stops:
+        print(f"{Colors.WARNING}{Colors.BOLD}Detenidas por límite de memoria:{Colors.ENDC} {memory_stops} "
+              f"(las pasadas o fallidas usan el plan de la heurística)")
+    
     # Estadísticas de tiempo
     times = [r['time'] for r in results if 'time' in r and r['time'] > 0]
     if times:
@@ -345,23 +372,74 @@ def print_summary(results: List[Dict]):
         print(f"  Promedio: {avg_time:.3f}s")
         print(f"  Mínimo:   {min_time:.3f}s")
         print(f"  Máximo:   {max_time:.3f}s")
+    
+    # Recursos del solver (solo disponibles en Linux/macOS)
+    measured = [r for r in results if r.get('user_time') is not None]
+    if measured:
+        user_time = sum(r['user_time'] for r in measured)
+        sys_time = sum(r['sys_time'] for r in measured)
+        peak = max(measured, key=lambda r: r['peak_rss'] or 0)
+        
+        print(f"\n{Colors.BOLD}Recursos del solver:{Colors.ENDC}")
+        print(f"  CPU usuario: {user_time:.3f}s")
+        print(f"  CPU sistema: {sys_time:.3f}s")
+        print(f"  Memoria pico: {format_memory(peak['peak_rss'])} (Prueba {peak['test_num']})")
+    
+    # Motores usados
+    engines = {}
+    for r in results:
+        if 'engine' in r:
+            engines[r['engine']] = engines.get(r['engine'], 0) + 1
+    if engines:
+        print(f"\n{Colors.BOLD}Motores usados:{Colors.ENDC}")
+        for engine, count in sorted(engines.items(), key=lambda item: -item[1]):
+            print(f"  {engine}: {count}")
+    
+    reused = sum(1 for r in results if r.get('cache_hit'))
+    if reused:
+        print(f"\n{Colors.BOLD}Reutilizadas por simetría:{Colors.ENDC} {reused}")
 
 
 def main():
     """Función principal del script de pruebas."""
+    parser = argparse.ArgumentParser(description="Ejecuta la batería de pruebas del proyecto.")
+    parser.add_argument('--memory-limit', type=int, default=None, metavar='MB',
+                        help="Detener el solver si su memoria residente supera este límite")
+    parser.add_argument('--timeout', type=int, default=None, metavar='SEG',
+                        help="Límite fijo por prueba (por defecto se estima por instancia)")
+    parser.add_argument('--budget', type=float, default=None, metavar='SEG',
+                        help="Presupuesto total del lote; el tiempo sobrante se reparte")
+    parser.add_argument('--history', type=Path, default=None,
+                        help="Archivo de historial de tiempos (.jsonl)")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default='auto',
+                        help="Motor de resolución (por defecto se elige por instancia)")
+    parser.add_argument('--model', choices=sorted(MODEL_VARIANTS), default='default',
+                        help="Variante del modelo MiniZinc")
+    parser.add_argument('--search', choices=sorted(SEARCH_STRATEGIES), default='default',
+                        help="Estrategia de búsqueda de MiniZinc (archivos de model/busqueda)")
+    parser.add_argument('--journal', type=Path, default=DEFAULT_JOURNAL,
+                        help="Bitácora donde se guarda cada resultado al terminar (.jsonl)")
+    parser.add_argument('--resume', action='store_true',
+                        help="Continuar la ejecución registrada en la bitácora, sin repetir pruebas terminadas")
+    parser.add_argument('--trace', type=Path, default=None,
+                        help="Registrar los tiempos de cada fase en este archivo (.jsonl)")
+    parser.add_argument('--profile', type=Path, nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                        help="Perfilar cada prueba con cProfile y tracemalloc (por defecto en temp/perfiles)")
+    args = parser.parse_args()
+    
+    if args.trace:
+        enable_tracing(args.trace)
+    profile_path = profile_dir(args.profile) if args.profile else None
+    
     print_header("BATERÍA DE PRUEBAS - MINIMIZAR POLARIZACIÓN")
     
     # Rutas
     tests_dir = ROOT_DIR / 'tests'
     results_file = tests_dir / 'resultados.txt'
-    mzn_file = ROOT_DIR / 'model' / 'Proyecto.mzn'
-    temp_dir = ROOT_DIR / 'temp'
-    
-    # Crear directorio temporal
-    temp_dir.mkdir(exist_ok=True)
+    mzn_file = MODEL_VARIANTS[args.model]['file']
     
     # Verificar archivos
-    if not mzn_file.exists():
+    if args.engine == 'minizinc' and not mzn_file.exists():
         print_error(f"Archivo de modelo no encontrado: {mzn_file}")
         return 1
     
@@ -374,19 +452,94 @@ def main():
     expected_results = load_expected_results(results_file)
     print_success(f"Cargados {len(expected_results)} resultados esperados")
     
+    # Planificar: límites estimados y orden de la más corta a la más larga
+    history = load_history(args.history)
+    instances = []
+    for test_num in sorted(expected_results.keys()):
+        try:
+            params = parse_input_file(str(tests_dir / f"Prueba{test_num}.txt"))
+        except (FileNotFoundError, ValueError):
+            params = None  # run_test reporta el error
+        instances.append((test_num, params))
+    
+    if args.engine == 'auto':
+        engine = lambda params: choose_engine(params, history)['engine']
+    else:
+        engine = args.engine
+    
+    if args.timeout:
+        plan = [{'key': num, 'params': params, 'time_limit': args.timeout} for num, params in instances]
+        print_info(f"Límite fijo de {args.timeout}s por prueba")
+    else:
+        plan = [{'key': num, 'params': None, 'time_limit': MIN_TIME_LIMIT}
+                for num, params in instances if params is None]
+        plan += schedule_batch([(num, params) for num, params in instances if params is not None],
+                               history, engine)
+        limits = [item['time_limit'] for item in plan]
+        source = f"historial de {len(history)} ejecuciones" if history else "tamaño de las instancias"
+        print_info(f"Límites estimados entre {min(limits)}s y {max(limits)}s (según {source})")
+    
+    # Bitácora: al reanudar se saltan las pruebas ya registradas, siempre que
+    # se hayan corrido con la misma configuración
+    config = {'engine': args.engine, 'model': args.model, 'search': args.search}
+    finished = load_journal(args.journal) if args.resume else {}
+    finished = {num: result for num, result in finished.items() if num in expected_results}
+    if finished:
+        saved = journal_config(args.journal)
+        if saved != config:
+            stored = ', '.join(f"{key}={value}" for key, value in saved.items()) if saved else "sin registrar"
+            current = ', '.join(f"{key}={value}" for key, value in config.items())
+            print_error(f"La bitácora {args.journal} es de otra configuración ({stored}; actual: {current}). "
+                        f"Use las mismas opciones o ejecute sin --resume")
+            return 1
+    args.journal.parent.mkdir(parents=True, exist_ok=True)
+    # Se reescribe sin la última línea si quedó cortada por la interrupción
+    tmp_journal = args.journal.with_suffix('.tmp')
+    with open(tmp_journal, 'w', encoding='utf-8') as f:
+        f.write(json.dumps({'config': config}) + '\n')
+        for result in finished.values():
+            f.write(json.dumps(result) + '\n')
+    os.replace(tmp_journal, args.journal)
+    if args.model != 'default' or args.search != 'default':
+        print_info(f"Modelo: {args.model} | Estrategia de búsqueda: {args.search}")
+    if args.resume:
+        print_info(f"Reanudando: {len(finished)} pruebas terminadas en {args.journal}")
+    
     # Ejecutar pruebas
     print_subheader("EJECUTANDO PRUEBAS")
     
-    results = []
-    for test_num in sorted(expected_results.keys()):
-        expected_pol = expected_results[test_num]
-        result = run_test(test_num, tests_dir, mzn_file, expected_pol, temp_dir)
-        results.append(result)
-        print_test_result(result)
+    cache = {}
+    budget_left = args.budget
+    if budget_left is not None:
+        budget_left -= sum(result.get('time', 0.0) for result in finished.values())
+    plan = [item for item in plan if item['key'] not in finished]
+    for index, item in enumerate(plan):
+        test_num = item['key']
+        pending_limits = sum(other['time_limit'] for other in plan[index + 1:])
+        timeout = grant_time(item['time_limit'], pending_limits, budget_left)
+        
+        with span('test', test=test_num, file=f"Prueba{test_num}.txt",
+                  model=args.model, search=args.search) as current, \
+                profile_run(profile_path, f"Prueba{test_num}"):
+            result = run_test(test_num, tests_dir, expected_results[test_num], args.engine,
+                              timeout, history, args.memory_limit, cache, args.search, args.model)
+            current.set(status=result['status'])
+            append_journal(args.journal, result)
+            print_test_result(result)
+        
+        if budget_left is not None:
+            budget_left -= result.get('time', 0.0)
+        if item['params'] is not None and result['status'] in ('PASS', 'FAIL') and not result['cache_hit']:
+            record_runtime(item['params'], result['time'], result['complete'], timeout,
+                           name=f"Prueba{test_num}", engine=result['engine'], path=args.history)
     
-    # Mostrar resumen
+    # Mostrar resumen, reconstruido desde la bitácora
+    results = list(load_journal(args.journal).values())
     print_summary(results)
     
+    if profile_path:
+        print_info(f"Perfiles guardados en: {profile_path}")
+    
     # Retornar código de salida
     failed_count = sum(1 for r in results if r['status'] != 'PASS')
     return 0 if failed_count == 0 else 1
@@ -0,0 +1,125 @@
+"""
+Script para procesar lotes entre varios equipos con un directorio compartido.
+
+Los productores agregan instancias con `submit`; cada equipo que monte el
+mismo directorio (NFS, SMB, ...) ejecuta uno o varios `worker`. Los
+resultados quedan en <spool>/outbox como <nombre>.json y <nombre>_salida.txt.
+
+Uso:
+    python scripts/spool.py submit /mnt/spool tests/Prueba*.txt
+    python scripts/spool.py worker /mnt/spool --processes 4
+    python scripts/spool.py status /mnt/spool
+    python scripts/spool.py requeue /mnt/spool
+
+Para probar en un solo equipo basta con varios procesos:
+    python scripts/spool.py worker /tmp/spool --processes 3 --idle-exit 5
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import argparse
+import multiprocessing
+import sys
+from pathlib import Path
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from solver.dispatch import ENGINE_CHOICES
+from solver.minizinc import MODEL_VARIANTS
+from solver.spool import LEASE_SECONDS, requeue_expired, run_worker, spool_status, submit, worker_id
+from run_tests import print_header, print_subheader, print_success, print_error, print_info
+
+
+def print_record(record):
+    """Imprime una línea por trabajo resuelto."""
+    name = f"{record['file']} [{record['worker']}]"
+    if record['status'] in ('OPTIMAL', 'SATISFIED'):
+        print_success(f"{name}: {record['status']} {record['polarization']:.3f} "
+                      f"({record['engine']}, {record['time']:.2f}s)")
+    else:
+        print_error(f"{name}: {record['status']} - {record['message']}")
+
+
+def worker_process(args):
+    """Ejecuta un trabajador con las opciones de la línea de comandos."""
+    solved = run_worker(args.spool, poll_interval=args.poll, idle_exit=args.idle_exit,
+                        max_jobs=args.max_jobs, lease_seconds=args.lease,
+                        on_result=print_record, engine=args.engine, timeout=args.timeout,
+                        model=args.model, memory_limit_mb=args.memory_limit)
+    print_info(f"Trabajador {worker_id()} terminó: {solved} trabajos")
+
+
+def main():
+    """Función principal del procesamiento por directorio compartido."""
+    parser = argparse.ArgumentParser(description="Procesamiento de lotes con un directorio compartido.")
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    submit_parser = commands.add_parser('submit', help="Agregar instancias a inbox/")
+    submit_parser.add_argument('spool', type=Path, help="Directorio compartido")
+    submit_parser.add_argument('inputs', nargs='+', help="Archivos de entrada .txt")
+
+    worker_parser = commands.add_parser('worker', help="Resolver trabajos de inbox/")
+    worker_parser.add_argument('spool', type=Path, help="Directorio compartido")
+    worker_parser.add_argument('--processes', type=int, default=1,
+                               help="Trabajadores en este equipo")
+    worker_parser.add_argument('--engine', choices=ENGINE_CHOICES, default='auto',
+                               help="Motor de resolución")
+    worker_parser.add_argument('--model', choices=sorted(MODEL_VARIANTS), default='default',
+                               help="Variante del modelo MiniZinc")
+    worker_parser.add_argument('--timeout', type=int, default=None,
+                               help="Límite de tiempo por instancia (por defecto se estima)")
+    worker_parser.add_argument('--memory-limit', type=int, default=None, metavar='MB',
+                               help="Límite de memoria del solver")
+    worker_parser.add_argument('--lease', type=float, default=LEASE_SECONDS,
+                               help="Duración del arriendo en segundos")
+    worker_parser.add_argument('--poll', type=float, default=1.0,
+                               help="Espera entre revisiones de inbox/ vacío")
+    worker_parser.add_argument('--idle-exit', type=float, default=None,
+                               help="Terminar tras estos segundos sin trabajos")
+    worker_parser.add_argument('--max-jobs', type=int, default=None,
+                               help="Terminar tras resolver estos trabajos")
+
+    status_parser = commands.add_parser('status', help="Contar trabajos por etapa")
+    status_parser.add_argument('spool', type=Path, help="Directorio compartido")
+
+    requeue_parser = commands.add_parser('requeue', help="Re-encolar trabajos con arriendo vencido")
+    requeue_parser.add_argument('spool', type=Path, help="Directorio compartido")
+
+    args = parser.parse_args()
+
+    if args.command == 'submit':
+        jobs = submit(args.spool, args.inputs)
+        print_success(f"{len(jobs)} trabajos agregados a {args.spool / 'inbox'}")
+
+    elif args.command == 'worker':
+        print_header("PROCESAMIENTO POR DIRECTORIO COMPARTIDO")
+        print_info(f"Directorio: {args.spool} | Procesos: {args.processes} | Motor: {args.engine}")
+        if args.processes <= 1:
+            worker_process(args)
+        else:
+            processes = [multiprocessing.Process(target=worker_process, args=(args,))
+                         for _ in range(args.processes)]
+            for process in processes:
+                process.start()
+            for process in processes:
+                process.join()
+
+    elif args.command == 'status':
+        print_subheader(f"ESTADO DE {args.spool}")
+        for stage, count in spool_status(args.spool).items():
+            print(f"  {stage:<8} {count:>6}")
+
+    elif args.command == 'requeue':
+        requeued = requeue_expired(args.spool)
+        print_info(f"{len(requeued)} trabajos re-encolados o descartados")
+        for job in requeued:
+            print(f"  {job}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Script para resumir las trazas por fase en percentiles.
+
+Lee los archivos .jsonl escritos con --trace (o POLARIZACION_TRACE) y
+muestra, por cada fase, cuántas veces se ejecutó, el tiempo total, los
+percentiles 50/90/99 y el máximo. Las fases se identifican por su ruta
+en el árbol de tramos (por ejemplo test/engine/minizinc/search), y con
+--by se separan según un atributo, por ejemplo el número de opiniones.
+
+Uso:
+    python scripts/run_tests.py --trace temp/trazas.jsonl
+    python scripts/trace_report.py temp/trazas.jsonl
+    python scripts/trace_report.py temp/trazas.jsonl --by m --phase parse_output
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Dict, List, Sequence
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from run_tests import Colors, print_header, print_subheader, print_error, print_info
+
+
+def load_spans(paths: Sequence[Path]) -> List[Dict]:
+    """
+    Carga los tramos de uno o varios archivos de trazas.
+
+    Las líneas corruptas se ignoran. A cada tramo se le agrega 'path', la
+    ruta de nombres desde la raíz de su traza.
+
+    Args:
+        paths: Archivos .jsonl
+
+    Returns:
+        Lista de tramos
+    """
+    spans = []
+    for path in paths:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and 'name' in record and 'duration' in record:
+                    spans.append(record)
+
+    by_id = {record['id']: record for record in spans}
+    for record in spans:
+        names = [record['name']]
+        parent = by_id.get(record.get('parent'))
+        while parent is not None:
+            names.append(parent['name'])
+            parent = by_id.get(parent.get('parent'))
+        record['path'] = '/'.join(reversed(names))
+
+    return spans
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Percentil q (0-100) con interpolación lineal; values debe estar ordenado."""
+    if len(values) == 1:
+        return values[0]
+    position = (len(values) - 1) * q / 100
+    low = int(position)
+    high = min(low + 1, len(values) - 1)
+    return values[low] + (values[high] - values[low]) * (position - low)
+
+
+def summarize(spans: Sequence[Dict], by: str = None) -> List[Dict]:
+    """
+    Agrupa los tramos por fase (y atributo) y calcula sus estadísticas.
+
+    Args:
+        spans: Tramos de load_spans
+        by: Atributo por el que separar cada fase (opcional)
+
+    Returns:
+        Lista de diccionarios con 'phase', 'group', 'count', 'total',
+        'p50', 'p90', 'p99' y 'max', ordenada por tiempo total
+    """
+    groups = {}
+    for record in spans:
+        group = record.get('attrs', {}).get(by) if by else None
+        groups.setdefault((record['path'], group), []).append(record['duration'])
+
+    rows = []
+    for (phase, group), durations in groups.items():
+        durations.sort()
+        rows.append({
+            'phase': phase,
+            'group': group,
+            'count': len(durations),
+            'total': sum(durations),
+            'p50': percentile(durations, 50),
+            'p90': percentile(durations, 90),
+            'p99': percentile(durations, 99),
+            'max': durations[-1]
+        })
+
+    # Fases por tiempo total (dentro de cada raíz) y grupos en orden
+    phase_totals = {}
+    for row in rows:
+        phase_totals[row['phase']] = phase_totals.get(row['phase'], 0.0) + row['total']
+    numeric = lambda group: isinstance(group, (int, float))
+    rows.sort(key=lambda row: (row['phase'].split('/')[0], -phase_totals[row['phase']], row['phase'],
+                               not numeric(row['group']),
+                               row['group'] if numeric(row['group']) else str(row['group'])))
+    return rows
+
+
+def main():
+    """Función principal del resumen de trazas."""
+    parser = argparse.ArgumentParser(description="Percentiles de tiempo por fase a partir de trazas .jsonl.")
+    parser.add_argument('traces', nargs='+', type=Path, help="Archivos de trazas")
+    parser.add_argument('--by', default=None,
+                        help="Separar cada fase según este atributo (m, n, engine, ...)")
+    parser.add_argument('--phase', default=None,
+                        help="Mostrar solo las fases cuya ruta contiene este texto")
+    args = parser.parse_args()
+
+    print_header("TIEMPOS POR FASE")
+
+    try:
+        spans = load_spans(args.traces)
+    except FileNotFoundError as e:
+        print_error(str(e))
+        return 1
+
+    if args.phase:
+        spans = [record for record in spans if args.phase in record['path']]
+    if not spans:
+        print_error("No hay tramos que mostrar")
+        return 1
+
+    traces = {record['trace'] for record in spans}
+    print_info(f"{len(spans)} tramos de {len(traces)} ejecuciones")
+
+    rows = summarize(spans, args.by)
+    width = max(len(row['phase']) for row in rows)
+    group_header = f"{args.by:>8} " if args.by else ""
+
+    print_subheader("FASES (segundos)")
+    print(f"{Colors.BOLD}{'Fase':<{width}} {group_header}{'N':>6} {'Total':>10} "
+          f"{'p50':>9} {'p90':>9} {'p99':>9} {'Máx':>9}{Colors.ENDC}")
+    for row in rows:
+        group = f"{str(row['group']):>8} " if args.by else ""
+        print(f"{row['phase']:<{width}} {group}{row['count']:>6} {row['total']:>10.4f} "
+              f"{row['p50']:>9.4f} {row['p90']:>9.4f} {row['p99']:>9.4f} {row['max']:>9.4f}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
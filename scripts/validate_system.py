@@ -115,6 +115,93 @@ if mzn_file.exists():
 else:
     print("  ✗ Archivo model/Proyecto.mzn no encontrado")
 
+# Test 6: Cola compartida con varios trabajadores
+print("\n✓ Test 6: Cola compartida (solver.spool) con varios trabajadores")
+import random
+import shutil
+import tempfile
+import threading
+import solver.spool as spool_module
+from solver.spool import claim_next, process_job, requeue_expired, spool_status, submit
+
+spool_dir = Path(tempfile.mkdtemp(prefix='spool_', dir=temp_dir))
+try:
+    # Intercalado: mientras un trabajador re-encola un arriendo vencido,
+    # otro re-encola el mismo trabajo y un tercero lo reclama. El arriendo
+    # nuevo debe sobrevivir y su dueño publicar el resultado.
+    submit(spool_dir, [test_files[0]])
+    stale = claim_next(spool_dir, 'muerto', lease_seconds=0)
+    original_expired = spool_module._lease_expired
+    reclaimed = {}
+
+    def expired_with_interleaving(lease, now):
+        if not reclaimed:
+            spool_module._lease_expired = original_expired
+            requeue_expired(spool_dir)
+            reclaimed['claim'] = claim_next(spool_dir, 'nuevo')
+            spool_module._lease_expired = expired_with_interleaving
+        return original_expired(lease, now)
+
+    spool_module._lease_expired = expired_with_interleaving
+    try:
+        requeue_expired(spool_dir)
+    finally:
+        spool_module._lease_expired = original_expired
+
+    claim = reclaimed['claim']
+    record = process_job(spool_dir, claim, 'nuevo', engine='heuristica')
+    if claim['attempts'] == 2 and record['status'] in ('OPTIMAL', 'SATISFIED'):
+        print("  ✓ Re-encolar y reclamar intercalados: el nuevo dueño conserva su arriendo")
+    else:
+        print(f"  ✗ Intercalado: intento {claim['attempts']}, estado {record['status']}")
+        errors += 1
+
+    # Varios trabajadores en paralelo; algunos abandonan el trabajo reclamado
+    # (como si murieran) y su arriendo vence
+    jobs = submit(spool_dir, [test_files[i % len(test_files)] for i in range(12)])
+    lost = []
+
+    def worker(number):
+        rng = random.Random(number)
+        owner = f"trabajador{number}"
+        deadline = time.time() + 60
+        while time.time() < deadline:
+            counts = spool_status(spool_dir)
+            if counts['inbox'] == 0 and counts['leases'] == 0:
+                return
+            requeue_expired(spool_dir)
+            claim = claim_next(spool_dir, owner, lease_seconds=0.5)
+            if claim is None:
+                time.sleep(0.01)
+            elif rng.random() < 0.3:
+                continue  # abandona el trabajo
+            else:
+                record = process_job(spool_dir, claim, owner, 0.5, engine='heuristica')
+                if record['status'] == 'LEASE_LOST':
+                    lost.append(claim['job'])
+
+    threads = [threading.Thread(target=worker, args=(number,)) for number in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    finished = {path.name for stage in ('done', 'failed') for path in (spool_dir / stage).iterdir()}
+    counts = spool_status(spool_dir)
+    missing = [job for job in jobs if job not in finished
+               or not (spool_dir / 'outbox' / f"{Path(job).stem}.json").exists()]
+    if not missing and not lost and counts['inbox'] == 0 and counts['leases'] == 0:
+        print(f"  ✓ {len(jobs)} trabajos terminados por 4 trabajadores "
+              f"({counts['done'] - 1} resueltos, {counts['failed']} descartados tras agotar los intentos)")
+    else:
+        print(f"  ✗ Trabajos perdidos: {missing}, arriendos perdidos: {lost}, etapas: {counts}")
+        errors += 1
+except Exception as e:
+    print(f"  ✗ Error en la cola compartida: {e}")
+    errors += 1
+finally:
+    shutil.rmtree(spool_dir, ignore_errors=True)
+
 # Resumen final
 print("\n" + "=" * 80)
 print("RESUMEN DE VALIDACIÓN".center(80))
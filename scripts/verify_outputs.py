@@ -0,0 +1,196 @@
+"""
+Script para verificar archivos de salida guardados contra sus entradas.
+
+Empareja cada archivo de salida (por ejemplo Instancias/Instancia1_salida.txt)
+con su archivo de entrada (Instancias/Instancia1.txt), recalcula la
+distribución final, la mediana, la polarización, el costo y los movimientos,
+verifica todas las restricciones del modelo y reporta cualquier diferencia
+con la polarización declarada. Los pares se verifican en paralelo.
+
+Uso:
+    python scripts/verify_outputs.py [RUTA ...] [--inputs DIR] [--workers N]
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import argparse
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from input_output.input import parse_input_file
+from input_output.output import read_output_file
+from solver.evaluation import verify_solution
+from run_tests import (Colors, print_header, print_subheader, print_success,
+                       print_error, print_warning, print_info)
+
+
+def find_pairs(paths: List[Path], inputs_dir: Optional[Path], suffix: str) -> List[Tuple[Path, Path]]:
+    """
+    Empareja archivos de salida con sus archivos de entrada.
+
+    Args:
+        paths: Archivos de salida o directorios que los contienen
+        inputs_dir: Directorio de entradas (por defecto, el de cada salida)
+        suffix: Sufijo que distingue la salida de la entrada ("_salida")
+
+    Returns:
+        Lista de tuplas (entrada, salida)
+    """
+    outputs = []
+    for path in paths:
+        if path.is_dir():
+            outputs.extend(sorted(path.glob(f"*{suffix}.txt")))
+        else:
+            outputs.append(path)
+
+    pairs = []
+    for output_file in outputs:
+        stem = output_file.stem
+        base = stem[:-len(suffix)] if stem.endswith(suffix) else stem
+        input_file = (inputs_dir or output_file.parent) / f"{base}.txt"
+        pairs.append((input_file, output_file))
+
+    return pairs
+
+
+def verify_pair(pair: Tuple[Path, Path], tolerance: float = 0.001) -> Dict:
+    """
+    Verifica un par (entrada, salida).
+
+    Args:
+        pair: Tupla (archivo de entrada, archivo de salida)
+        tolerance: Tolerancia para comparar la polarización declarada
+
+    Returns:
+        Diccionario con el estado (OK, MISMATCH, INVALID, ERROR) y los
+        valores recalculados
+    """
+    input_file, output_file = pair
+    result = {
+        'input': str(input_file),
+        'output': str(output_file)
+    }
+
+    try:
+        params = parse_input_file(str(input_file))
+        solution = read_output_file(str(output_file), params['m'])
+    except (FileNotFoundError, ValueError) as e:
+        result['status'] = 'ERROR'
+        result['message'] = str(e)
+        return result
+
+    evaluation = verify_solution(params, solution, tolerance)
+    result.update(evaluation)
+
+    if not evaluation['valid']:
+        result['status'] = 'INVALID'
+        result['message'] = '; '.join(evaluation['violations'])
+    elif not evaluation['matches']:
+        result['status'] = 'MISMATCH'
+        result['message'] = (f"Declarada = {evaluation['stated_polarization']:.3f}, "
+                             f"recalculada = {evaluation['polarization']:.3f}")
+    else:
+        result['status'] = 'OK'
+        result['message'] = 'OK'
+
+    return result
+
+
+def _verify_pair_task(args: Tuple[Tuple[Path, Path], float]) -> Dict:
+    """Adaptador para ProcessPoolExecutor.map (un solo argumento)."""
+    pair, tolerance = args
+    return verify_pair(pair, tolerance)
+
+
+def verify_pairs(pairs: List[Tuple[Path, Path]], workers: int, tolerance: float = 0.001):
+    """
+    Verifica muchos pares, en paralelo si workers > 1.
+
+    Args:
+        pairs: Lista de tuplas (entrada, salida)
+        workers: Número de procesos
+        tolerance: Tolerancia para comparar la polarización declarada
+
+    Yields:
+        Resultado de verify_pair para cada par, en el mismo orden
+    """
+    tasks = [(pair, tolerance) for pair in pairs]
+
+    if workers <= 1 or len(pairs) <= 1:
+        yield from map(_verify_pair_task, tasks)
+        return
+
+    # Bloques grandes para que miles de pares no paguen un viaje IPC cada uno
+    chunksize = max(1, len(tasks) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        yield from executor.map(_verify_pair_task, tasks, chunksize=chunksize)
+
+
+def print_verification_result(result: Dict, verbose: bool = False):
+    """Imprime el resultado de la verificación de un par."""
+    name = Path(result['output']).name
+    status = result['status']
+
+    if status == 'OK':
+        if verbose:
+            print_success(f"{name}: Polarización = {result['polarization']:.3f} | "
+                          f"Costo = {result['cost']:.1f} | Movimientos = {result['moves']}")
+    elif status == 'MISMATCH':
+        print_warning(f"{name}: {result['message']}")
+    else:
+        print_error(f"{name} [{status}]: {result['message']}")
+
+
+def main():
+    """Función principal del verificador."""
+    parser = argparse.ArgumentParser(description="Verifica archivos de salida contra sus entradas.")
+    parser.add_argument('paths', nargs='*', type=Path, default=[ROOT_DIR / 'Instancias'],
+                        help="Archivos de salida o directorios que los contienen (por defecto: Instancias)")
+    parser.add_argument('--inputs', type=Path, default=None,
+                        help="Directorio de los archivos de entrada (por defecto: el de cada salida)")
+    parser.add_argument('--suffix', default='_salida',
+                        help="Sufijo de los archivos de salida (por defecto: _salida)")
+    parser.add_argument('--workers', type=int, default=os.cpu_count() or 1,
+                        help="Número de procesos en paralelo")
+    parser.add_argument('--tolerance', type=float, default=0.001,
+                        help="Tolerancia para comparar la polarización")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Mostrar también los pares correctos")
+    args = parser.parse_args()
+
+    print_header("VERIFICACIÓN DE ARCHIVOS DE SALIDA")
+
+    pairs = find_pairs(args.paths, args.inputs, args.suffix)
+    if not pairs:
+        print_warning("No se encontraron archivos de salida")
+        return 1
+
+    print_info(f"Verificando {len(pairs)} pares con {args.workers} procesos...")
+    print_subheader("RESULTADOS")
+
+    counts = {'OK': 0, 'MISMATCH': 0, 'INVALID': 0, 'ERROR': 0}
+    for result in verify_pairs(pairs, args.workers, args.tolerance):
+        counts[result['status']] += 1
+        print_verification_result(result, args.verbose)
+
+    print_subheader("RESUMEN DE VERIFICACIÓN")
+    total = len(pairs)
+    print(f"\n{Colors.BOLD}Total de pares:{Colors.ENDC} {total}")
+    print(f"{Colors.OKGREEN}{Colors.BOLD}Correctos:{Colors.ENDC} {counts['OK']}")
+    print(f"{Colors.WARNING}{Colors.BOLD}Polarización distinta:{Colors.ENDC} {counts['MISMATCH']}")
+    print(f"{Colors.FAIL}{Colors.BOLD}Restricciones violadas:{Colors.ENDC} {counts['INVALID']}")
+    print(f"{Colors.FAIL}{Colors.BOLD}Errores de lectura:{Colors.ENDC} {counts['ERROR']}")
+
+    return 0 if counts['OK'] == total else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
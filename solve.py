@@ -0,0 +1,175 @@
+"""
+Punto de entrada sin interfaz gráfica para resolver instancias.
+
+Resuelve uno o varios archivos de entrada con el selector automático de
+motores y escribe la solución en el formato de salida del enunciado o
+como líneas JSON (una por instancia), pensado para scripts y tuberías.
+Nunca importa la GUI ni tkinter, y SciPy/MiniZinc solo se cargan si el
+motor elegido los necesita.
+
+Uso:
+    python solve.py tests/Prueba1.txt
+    python solve.py tests/Prueba*.txt --format jsonl
+    python solve.py Instancias/Instancia*.txt --output-dir resultados
+    python solve.py tests/Prueba*.txt --format jsonl --history temp/historial_tiempos.jsonl
+
+Códigos de salida:
+    0  Todas las instancias resueltas
+    1  Alguna instancia quedó sin solución (error del motor, tiempo, ...)
+    2  Uso incorrecto o archivo de entrada ilegible
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import time
+
+START_TIME = time.perf_counter()
+
+import argparse
+import json
+import os
+import sys
+from pathlib import Path
+from typing import Dict, List
+
+# Agregar el directorio raíz al path
+ROOT_DIR = Path(__file__).parent
+sys.path.insert(0, str(ROOT_DIR))
+
+from input_output.input import parse_input_file
+from profiling import PROFILE_DIR, profile_dir, profile_run
+from solver.dispatch import ENGINE_CHOICES, solution_record
+from solver.minizinc import MODEL_VARIANTS, SEARCH_STRATEGIES
+from solver.scheduling import load_history, record_runtime
+from solver.symmetry import solve_symmetric
+from tracing import current_span, enable_tracing, instance_attrs, span
+
+
+EXIT_OK = 0
+EXIT_UNSOLVED = 1
+EXIT_USAGE = 2
+
+SOLVED = ('OPTIMAL', 'SATISFIED')
+
+
+def solve_file(path: str, args: argparse.Namespace, history: List[Dict], cache: Dict) -> int:
+    """
+    Resuelve un archivo de entrada y escribe su salida.
+
+    Args:
+        path: Archivo de entrada
+        args: Opciones de la línea de comandos
+        history: Historial de tiempos
+        cache: Soluciones de la ejecución por forma canónica
+
+    Returns:
+        EXIT_OK, EXIT_UNSOLVED o EXIT_USAGE
+    """
+    try:
+        with span('parse_input'):
+            params = parse_input_file(path)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"{path}: {e}", file=sys.stderr)
+        if args.format == 'jsonl':
+            print(json.dumps({'file': path, 'status': 'INPUT_ERROR', 'message': str(e)}), flush=True)
+        return EXIT_USAGE
+
+    current_span().set(**instance_attrs(params))
+    solution = solve_symmetric(params, cache, args.engine, args.timeout, history,
+                               model=args.model, search=args.search, memory_limit_mb=args.memory_limit)
+    solved = solution['status'] in SOLVED
+
+    if args.history and solved and not solution['cache_hit']:
+        record_runtime(params, solution['time'], solution['status'] == 'OPTIMAL',
+                       solution.get('time_limit'), name=Path(path).name, engine=solution['engine'],
+                       path=args.history)
+
+    if args.verbose or not solved:
+        summary = (f"{path}: {solution['status']}"
+                   + (f" {solution['polarization']:.3f}" if solved else f" ({solution['message']})")
+                   + f" [{solution['engine']}, {solution['time']:.3f}s]")
+        print(summary, file=sys.stderr)
+
+    with span('write_output', format=args.format):
+        if args.format == 'jsonl':
+            print(json.dumps(solution_record(path, params, solution)), flush=True)
+        elif solved:
+            text = solution.format()
+            if args.output_dir:
+                (args.output_dir / f"{Path(path).stem}_salida.txt").write_text(text, encoding='utf-8')
+            else:
+                sys.stdout.write(text)
+
+    return EXIT_OK if solved else EXIT_UNSOLVED
+
+
+def main() -> int:
+    """Función principal del solver sin interfaz gráfica."""
+    parser = argparse.ArgumentParser(
+        description="Resuelve instancias del problema de Minimizar Polarización sin interfaz gráfica."
+    )
+    parser.add_argument('inputs', nargs='+', help="Archivos de entrada .txt")
+    parser.add_argument('--format', choices=('txt', 'jsonl'), default='txt',
+                        help="Formato de salida: el del enunciado o una línea JSON por instancia")
+    parser.add_argument('--output-dir', type=Path, default=None,
+                        help="Escribir <nombre>_salida.txt en este directorio en lugar de stdout")
+    parser.add_argument('--engine', choices=ENGINE_CHOICES, default='auto',
+                        help="Motor de resolución (por defecto se elige por instancia)")
+    parser.add_argument('--model', choices=sorted(MODEL_VARIANTS), default='default',
+                        help="Variante del modelo MiniZinc")
+    parser.add_argument('--search', choices=sorted(SEARCH_STRATEGIES), default='default',
+                        help="Estrategia de búsqueda de MiniZinc (archivos de model/busqueda)")
+    parser.add_argument('--timeout', type=int, default=None,
+                        help="Límite de tiempo por instancia en segundos (por defecto se estima)")
+    parser.add_argument('--history', type=Path, default=None, metavar='PATH',
+                        help="Historial de tiempos (.jsonl) para estimar límites y elegir motor; "
+                             "cada instancia resuelta se agrega a él (por defecto no se usa)")
+    parser.add_argument('--memory-limit', type=int, default=None, metavar='MB',
+                        help="Límite de memoria del solver")
+    parser.add_argument('--trace', type=Path, default=None,
+                        help="Registrar los tiempos de cada fase en este archivo (.jsonl)")
+    parser.add_argument('--profile', type=Path, nargs='?', const=PROFILE_DIR, default=None, metavar='DIR',
+                        help="Perfilar cada instancia con cProfile y tracemalloc (por defecto en temp/perfiles)")
+    parser.add_argument('--verbose', action='store_true',
+                        help="Mostrar tiempos de arranque y de cada instancia en stderr")
+    args = parser.parse_args()
+
+    if args.format == 'txt' and args.output_dir is None and len(args.inputs) > 1:
+        parser.error("con varias instancias use --format jsonl o --output-dir")
+
+    if args.output_dir:
+        args.output_dir.mkdir(parents=True, exist_ok=True)
+
+    if args.trace:
+        enable_tracing(args.trace)
+    profile_path = profile_dir(args.profile) if args.profile else None
+
+    if args.verbose:
+        startup_ms = (time.perf_counter() - START_TIME) * 1000
+        print(f"Arranque: {startup_ms:.1f} ms", file=sys.stderr)
+
+    history = load_history(args.history) if args.history else []
+    cache = {}
+    exit_code = EXIT_OK
+
+    for path in args.inputs:
+        with span('instance', file=path), profile_run(profile_path, Path(path).stem):
+            status = solve_file(path, args, history, cache)
+        if status == EXIT_USAGE or exit_code == EXIT_OK:
+            exit_code = status
+
+    if profile_path:
+        print(f"Perfiles guardados en: {profile_path}", file=sys.stderr)
+
+    return exit_code
+
+
+if __name__ == "__main__":
+    try:
+        sys.exit(main())
+    except BrokenPipeError:
+        # El consumidor cerró la tubería (p. ej. `| head`): salir sin traza
+        devnull = os.open(os.devnull, os.O_WRONLY)
+        os.dup2(devnull, sys.stdout.fileno())
+        sys.exit(EXIT_UNSOLVED)
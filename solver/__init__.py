@@ -0,0 +1,77 @@
+"""
+Módulo de resolución y análisis para el problema de Minimizar Polarización.
+"""
+
+from .evaluation import (
+    RESISTANCE_FACTORS,
+    compute_median_opinion,
+    compute_polarization,
+    evaluate_plan,
+    verify_solution
+)
+from .editor import PlanEditor
+from .dispatch import ENGINES, available_engines, choose_engine, solution_record, solve
+from .flow import flow_bounds, solve_flow
+from .heuristic import polarization_lower_bound, solve_heuristic
+from .incremental import apply_delta, repair_plan, resolve
+from .lns import NEIGHBORHOODS, solve_lns
+from .milp import HAS_SCIPY, reachable_moves, solve_milp
+from .minizinc import run_minizinc, solve_params
+from .pareto import budget_grid, budget_ray, pareto_sweep, write_frontier_csv
+from .scheduling import (
+    instance_features,
+    load_history,
+    predict_runtime,
+    record_runtime,
+    schedule_batch,
+    time_limit
+)
+from .symmetry import canonical_form, from_canonical, solve_symmetric
+from .spool import claim_next, init_spool, requeue_expired, run_worker, spool_status, submit
+
+__all__ = [
+    'RESISTANCE_FACTORS',
+    'compute_median_opinion',
+    'compute_polarization',
+    'evaluate_plan',
+    'verify_solution',
+    'PlanEditor',
+    'ENGINES',
+    'available_engines',
+    'choose_engine',
+    'solution_record',
+    'solve',
+    'flow_bounds',
+    'solve_flow',
+    'polarization_lower_bound',
+    'solve_heuristic',
+    'apply_delta',
+    'repair_plan',
+    'resolve',
+    'NEIGHBORHOODS',
+    'solve_lns',
+    'HAS_SCIPY',
+    'reachable_moves',
+    'solve_milp',
+    'run_minizinc',
+    'solve_params',
+    'budget_grid',
+    'budget_ray',
+    'pareto_sweep',
+    'write_frontier_csv',
+    'instance_features',
+    'load_history',
+    'predict_runtime',
+    'record_runtime',
+    'schedule_batch',
+    'time_limit',
+    'canonical_form',
+    'from_canonical',
+    'solve_symmetric',
+    'claim_next',
+    'init_spool',
+    'requeue_expired',
+    'run_worker',
+    'spool_status',
+    'submit'
+]
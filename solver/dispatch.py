@@ -0,0 +1,227 @@
+"""
+Selección automática del motor de resolución.
+
+Cada instancia se resuelve primero con la heurística voraz, que además
+entrega una cota inferior; si el plan alcanza la cota ya es óptimo. Si no,
+se estima el tiempo de cada motor exacto disponible (MILP en proceso, MILP
+por flujos o el modelo completo de MiniZinc) con los modelos de costo de
+solver.scheduling y se usa el más rápido, con la polarización de la
+heurística como cota superior. Si ningún motor exacto terminaría en un
+tiempo razonable, se entrega el plan heurístico con su cota.
+
+El motor 'lns' (búsqueda en vecindarios grandes sobre MiniZinc) no prueba
+optimalidad, así que solo se usa si se pide explícitamente.
+
+El motor elegido y el motivo quedan en el resultado ('engine' y 'reason').
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import shutil
+import time
+from typing import Dict, Optional, Sequence
+
+from input_output.structures import Solution
+from tracing import span
+
+from .flow import solve_flow
+from .heuristic import solve_heuristic
+from .lns import solve_lns
+from .milp import HAS_SCIPY, solve_milp
+from .minizinc import solve_params
+from .scheduling import predict_runtime, time_limit
+
+
+ENGINES = {
+    'minizinc': solve_params,
+    'milp': solve_milp,
+    'flujo': solve_flow,
+    'heuristica': solve_heuristic,
+    'lns': solve_lns,
+}
+
+ENGINE_LABELS = {
+    'minizinc': 'MiniZinc (Gecode)',
+    'milp': 'MILP (HiGHS)',
+    'flujo': 'MILP por flujos (HiGHS)',
+    'heuristica': 'Heurística + cota inferior',
+    'lns': 'LNS sobre MiniZinc (Gecode)',
+}
+
+ENGINE_CHOICES = ('auto',) + tuple(ENGINES)
+
+# Motores que no prueban optimalidad: la selección automática no los usa
+APPROXIMATE_ENGINES = ('heuristica', 'lns')
+
+# Si el motor exacto más rápido tardaría más que esto, se usa la heurística
+HEURISTIC_THRESHOLD = 600
+
+
+def available_engines() -> Sequence[str]:
+    """
+    Lista los motores que se pueden usar en este equipo.
+
+    Returns:
+        Nombres de motores (claves de ENGINES); la heurística siempre está
+    """
+    engines = ['heuristica']
+    if HAS_SCIPY:
+        engines += ['milp', 'flujo']
+    if shutil.which('minizinc'):
+        engines += ['minizinc', 'lns']
+    return engines
+
+
+def choose_engine(params: Dict, history: Sequence[Dict] = (),
+                  engines: Optional[Sequence[str]] = None,
+                  threshold: float = HEURISTIC_THRESHOLD) -> Dict:
+    """
+    Elige el motor exacto más rápido para una instancia.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        history: Registros de tiempos (solver.scheduling.load_history)
+        engines: Motores disponibles (por defecto available_engines())
+        threshold: Tiempo estimado desde el cual se prefiere la heurística
+
+    Returns:
+        Diccionario con 'engine', 'reason' y 'estimates' ({motor: segundos})
+    """
+    engines = available_engines() if engines is None else engines
+    exact = [engine for engine in engines if engine not in APPROXIMATE_ENGINES]
+    estimates = {engine: predict_runtime(params, history, engine)['seconds'] for engine in exact}
+
+    if not estimates:
+        return {
+            'engine': 'heuristica',
+            'reason': "No hay motor exacto disponible (instale SciPy o MiniZinc)",
+            'estimates': estimates
+        }
+
+    fastest = min(estimates, key=estimates.get)
+    if estimates[fastest] > threshold:
+        return {
+            'engine': 'heuristica',
+            'reason': (f"Instancia grande: {ENGINE_LABELS[fastest]} tardaría ~{estimates[fastest]:.0f}s "
+                       f"(> {threshold:.0f}s)"),
+            'estimates': estimates
+        }
+
+    others = ', '.join(f"{ENGINE_LABELS[e]} ~{s:.2f}s" for e, s in estimates.items() if e != fastest)
+    reason = f"{ENGINE_LABELS[fastest]} es el motor exacto más rápido (~{estimates[fastest]:.2f}s"
+    reason += f"; {others})" if others else ")"
+    return {'engine': fastest, 'reason': reason, 'estimates': estimates}
+
+
+def solve(params: Dict, engine: str = 'auto', timeout: Optional[int] = None,
+          history: Sequence[Dict] = (), **solve_kwargs) -> Dict:
+    """
+    Resuelve una instancia con el motor indicado o el elegido automáticamente.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        engine: 'auto' o un motor de ENGINES
+        timeout: Límite de tiempo en segundos (por defecto se estima con
+                 solver.scheduling.time_limit)
+        history: Registros de tiempos para las estimaciones
+        **solve_kwargs: Argumentos adicionales del motor (model,
+                        memory_limit_mb, ...)
+
+    Returns:
+        Solución (input_output.structures.Solution) con las claves de
+        solve_params y además 'engine', 'reason', 'lower_bound',
+        'time_limit' y 'engine_status' (estado del motor antes de
+        conservar el plan de la heurística: un MEMORY_LIMIT o TIMEOUT
+        terminan como SATISFIED, pero quedan aquí)
+
+    Raises:
+        ValueError: Si el motor no existe
+    """
+    if engine not in ENGINE_CHOICES:
+        raise ValueError(f"Motor desconocido: {engine} (opciones: {', '.join(ENGINE_CHOICES)})")
+
+    start_time = time.time()
+    with span('heuristic'):
+        heuristic = Solution(solve_heuristic(params))
+    heuristic['engine'] = 'heuristica'
+    heuristic['time_limit'] = None
+    heuristic['engine_status'] = heuristic['status']
+
+    if engine == 'heuristica':
+        heuristic['reason'] = "Motor elegido por el usuario"
+        return heuristic
+
+    if engine == 'auto':
+        if heuristic['status'] == 'OPTIMAL':
+            heuristic['reason'] = "La heurística alcanzó la cota inferior: el plan es óptimo"
+            return heuristic
+        decision = choose_engine(params, history)
+        if decision['engine'] == 'heuristica':
+            heuristic['reason'] = decision['reason']
+            return heuristic
+    else:
+        decision = {'engine': engine, 'reason': "Motor elegido por el usuario"}
+
+    if timeout is None:
+        timeout, _ = time_limit(params, history, decision['engine'])
+
+    # La heurística poda la búsqueda del motor exacto
+    with span('engine', engine=decision['engine'], time_limit=timeout) as current:
+        result = Solution(ENGINES[decision['engine']](params, timeout=timeout,
+                                                      upper_bound=heuristic['polarization'],
+                                                      **solve_kwargs))
+        current.set(status=result['status'])
+    result['engine'] = decision['engine']
+    result['reason'] = decision['reason']
+    result['lower_bound'] = heuristic['lower_bound']
+    result['time_limit'] = timeout
+    result['engine_status'] = result['status']
+
+    if result['status'] == 'UNSATISFIABLE':
+        # Nada mejor que la heurística: su plan es óptimo
+        result.update({key: heuristic[key] for key in ('polarization', 'movements', 'final_distribution')})
+        result['status'] = 'OPTIMAL'
+    elif result['movements'] is None and (engine == 'auto' or result['status'] in ('UNKNOWN', 'TIMEOUT')):
+        # El motor exacto no mejoró la heurística a tiempo: se conserva su
+        # plan. Si el usuario eligió el motor, los errores se reportan tal cual.
+        result['message'] = f"{ENGINE_LABELS[decision['engine']]}: {result['status']}. {result['message']}".strip()
+        result.update({key: heuristic[key] for key in ('polarization', 'movements', 'final_distribution')})
+        result['status'] = 'SATISFIED'
+
+    result['time'] = time.time() - start_time
+    return result
+
+
+def solution_record(path: str, params: Dict, solution: Dict) -> Dict:
+    """
+    Convierte una solución en un registro serializable a JSON.
+
+    Args:
+        path: Archivo de entrada
+        params: Parámetros de la instancia
+        solution: Solución de solve
+
+    Returns:
+        Diccionario con archivo, estado, polarización, motor, tiempos y
+        matrices de movimientos
+    """
+    movements = solution.get('movements')
+    rounded = lambda value: round(value, 6) if value is not None else None
+    return {
+        'file': path,
+        'status': solution['status'],
+        'polarization': rounded(solution.get('polarization')),
+        'lower_bound': rounded(solution.get('lower_bound')),
+        'engine': solution.get('engine'),
+        'reason': solution.get('reason'),
+        'engine_status': solution.get('engine_status'),
+        'time': round(solution.get('time', 0.0), 6),
+        'n': params['n'],
+        'm': params['m'],
+        'final_distribution': (list(solution['final_distribution'])
+                               if solution.get('final_distribution') is not None else None),
+        'movements': ({str(k): [list(row) for row in movements[k]] for k in range(1, 4)}
+                      if movements else None),
+        'message': solution.get('message', '')
+    }
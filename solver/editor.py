@@ -0,0 +1,292 @@
+"""
+Editor de planes con re-evaluación incremental.
+
+Permite modificar a mano un plan de movimientos (por ejemplo, mover 5
+personas de resistencia alta de la opinión 2 a la 3) y ver de inmediato la
+distribución final, la mediana, la polarización, el costo, los movimientos
+y las restricciones violadas, sin volver a resolver ni re-evaluar todo el
+plan.
+
+La distribución final se guarda en dos árboles de Fenwick: uno en el orden
+de las opiniones, para encontrar la mediana (primera opinión cuyo acumulado
+alcanza (n + 1) div 2), y otro en el orden de los valores v, con conteos y
+sumas de valores, para calcular Σ p_i |v_i - v_mediana| por prefijos. Cada
+edición y cada consulta cuestan O(log m); el costo y los movimientos se
+actualizan en O(1).
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import bisect
+from typing import Dict, List, Mapping, Optional, Sequence
+
+from input_output.input import COST_SCALE, SCALED_FACTORS
+from input_output.structures import Movements, Solution
+
+from .evaluation import evaluate_plan
+
+
+class _Fenwick:
+    """Árbol de Fenwick de sumas de prefijos (índices base 0)."""
+
+    __slots__ = ('tree',)
+
+    def __init__(self, values: Sequence[float]):
+        # Construcción en O(m)
+        tree = [0] + list(values)
+        for i in range(1, len(tree)):
+            parent = i + (i & -i)
+            if parent < len(tree):
+                tree[parent] += tree[i]
+        self.tree = tree
+
+    def add(self, index: int, delta: float):
+        """Suma delta a la posición index."""
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += delta
+            index += index & -index
+
+    def prefix(self, count: int) -> float:
+        """Suma de las primeras count posiciones."""
+        total = 0
+        while count > 0:
+            total += self.tree[count]
+            count -= count & -count
+        return total
+
+    def search(self, target: float) -> int:
+        """
+        Primera posición cuyo acumulado alcanza target (valores no negativos).
+
+        Returns:
+            Índice base 0, o el tamaño del árbol si el total no alcanza target
+        """
+        position = 0
+        step = 1 << (len(self.tree) - 1).bit_length()
+        while step:
+            following = position + step
+            if following < len(self.tree) and self.tree[following] < target:
+                position = following
+                target -= self.tree[following]
+            step >>= 1
+        return position
+
+
+class PlanEditor:
+    """
+    Plan de movimientos editable con métricas en O(log m) por edición.
+
+    Los índices de opinión son base 0 y los niveles de resistencia 1..3,
+    como en el resto del paquete. Las ediciones que exceden ct, maxMovs o
+    s[i][k] se aceptan y se informan en summary()['violations'], para poder
+    explorar alternativas; las que dejarían un movimiento negativo o de una
+    opinión a sí misma se rechazan.
+    """
+
+    def __init__(self, params: Dict, movements: Optional[Mapping[int, Sequence[Sequence[int]]]] = None):
+        """
+        Args:
+            params: Parámetros de la instancia
+            movements: Plan inicial {nivel: matriz m x m} (por defecto, sin
+                       movimientos); se copia
+        """
+        self.params = params
+        self.m = m = params['m']
+        self.n = params['n']
+        self.v = list(params['v'])
+        if movements is None:
+            self.movements = Movements(m)
+        elif isinstance(movements, Movements):
+            self.movements = movements.copy()
+        else:
+            self.movements = Movements.from_matrices(movements, m)
+        self.history: List[tuple] = []
+
+        # Personas que salen de cada opinión por nivel, costo (en medios) y movimientos
+        self.moved_out = [[0] * m for _ in range(3)]
+        self.final = list(params['p'])
+        self.scaled_cost = 0
+        self.moves = 0
+        for k in range(1, 4):
+            for i, row in enumerate(self.movements[k]):
+                if not any(row):
+                    continue
+                for j, count in enumerate(row):
+                    if count:
+                        distance = abs(i - j)
+                        self.moved_out[k - 1][i] += count
+                        self.final[i] -= count
+                        self.final[j] += count
+                        self.moves += count * distance
+                        self.scaled_cost += count * distance * SCALED_FACTORS[k - 1]
+        self.over_capacity = {(k, i) for k in range(1, 4) for i in range(m)
+                              if self.moved_out[k - 1][i] > params['s'][i][k - 1]}
+
+        # Posición de cada opinión en el orden de v (los empates comparten posición)
+        sorted_v = sorted(self.v)
+        self.rank = [bisect.bisect_left(sorted_v, value) for value in self.v]
+        by_rank_count = [0] * m
+        by_rank_sum = [0.0] * m
+        for i, count in enumerate(self.final):
+            by_rank_count[self.rank[i]] += count
+            by_rank_sum[self.rank[i]] += count * self.v[i]
+        self.by_index = _Fenwick(self.final)
+        self.by_rank_count = _Fenwick(by_rank_count)
+        self.by_rank_sum = _Fenwick(by_rank_sum)
+        self.value_total = sum(by_rank_sum)
+
+    def _shift(self, i: int, delta: int):
+        """Cambia la distribución final de la opinión i en delta personas."""
+        self.final[i] += delta
+        self.by_index.add(i, delta)
+        self.by_rank_count.add(self.rank[i], delta)
+        self.by_rank_sum.add(self.rank[i], delta * self.v[i])
+        self.value_total += delta * self.v[i]
+
+    def move(self, k: int, i: int, j: int, count: int) -> Dict:
+        """
+        Suma count personas de resistencia k al movimiento de i a j.
+
+        Args:
+            k: Nivel de resistencia (1..3)
+            i: Opinión de origen (base 0)
+            j: Opinión de destino (base 0)
+            count: Personas a agregar (negativo para quitar)
+
+        Returns:
+            Resumen del plan editado (ver summary)
+
+        Raises:
+            ValueError: Si los índices no son válidos, o el movimiento o
+                        la distribución final quedarían negativos
+        """
+        if k not in (1, 2, 3):
+            raise ValueError(f"Nivel de resistencia inválido: {k}")
+        if not (0 <= i < self.m and 0 <= j < self.m):
+            raise ValueError(f"Opinión fuera de rango: {i + 1} -> {j + 1}")
+        if i == j:
+            raise ValueError("El origen y el destino deben ser opiniones distintas")
+        row = self.movements[k][i]
+        if row[j] + count < 0:
+            raise ValueError(f"x[{k},{i + 1},{j + 1}] quedaría negativo ({row[j] + count})")
+        if self.final[i] - count < 0:
+            raise ValueError(f"La opinión {i + 1} quedaría con {self.final[i] - count} personas")
+        if self.final[j] + count < 0:
+            raise ValueError(f"La opinión {j + 1} quedaría con {self.final[j] + count} personas")
+        if count == 0:
+            return self.summary()
+
+        row[j] += count
+        distance = abs(i - j)
+        self.moves += count * distance
+        self.scaled_cost += count * distance * SCALED_FACTORS[k - 1]
+        self.moved_out[k - 1][i] += count
+        if self.moved_out[k - 1][i] > self.params['s'][i][k - 1]:
+            self.over_capacity.add((k, i))
+        else:
+            self.over_capacity.discard((k, i))
+        self._shift(i, -count)
+        self._shift(j, count)
+        self.history.append((k, i, j, count))
+        return self.summary()
+
+    def set(self, k: int, i: int, j: int, value: int) -> Dict:
+        """Fija x[k][i][j] = value (ver move)."""
+        return self.move(k, i, j, value - self.movements[k][i][j])
+
+    def undo(self) -> Optional[Dict]:
+        """
+        Deshace la última edición.
+
+        Returns:
+            Resumen del plan, o None si no hay ediciones que deshacer
+        """
+        if not self.history:
+            return None
+        k, i, j, count = self.history.pop()
+        summary = self.move(k, i, j, -count)
+        self.history.pop()
+        return summary
+
+    def median_opinion(self) -> int:
+        """Opinión mediana (base 0) de la distribución final."""
+        return min(self.by_index.search((self.n + 1) // 2), self.m - 1)
+
+    def polarization(self, median: Optional[int] = None) -> float:
+        """Polarización Σ p_i |v_i - v_mediana| de la distribución final."""
+        if median is None:
+            median = self.median_opinion()
+        center = self.v[median]
+        below = self.rank[median]
+        count_below = self.by_rank_count.prefix(below)
+        sum_below = self.by_rank_sum.prefix(below)
+        count_above = self.n - count_below
+        sum_above = self.value_total - sum_below
+        return max(center * count_below - sum_below + sum_above - center * count_above, 0.0)
+
+    @property
+    def cost(self) -> float:
+        """Costo total del plan."""
+        return self.scaled_cost / COST_SCALE
+
+    def violations(self) -> List[str]:
+        """Restricciones que el plan editado no cumple."""
+        found = []
+        for k, i in sorted(self.over_capacity):
+            found.append(f"Se mueven {self.moved_out[k - 1][i]} personas de la opinión {i + 1} con "
+                         f"resistencia {k}, pero solo hay {self.params['s'][i][k - 1]}")
+        if self.cost > self.params['ct'] + 1e-9:
+            found.append(f"El costo total ({self.cost:.3f}) supera el máximo ({self.params['ct']})")
+        if self.moves > self.params['maxMovs'] + 1e-9:
+            found.append(f"Los movimientos ({self.moves}) superan el máximo ({self.params['maxMovs']})")
+        return found
+
+    def summary(self) -> Dict:
+        """
+        Métricas del plan editado.
+
+        Returns:
+            Diccionario con 'median_opinion' (base 1, como evaluate_plan),
+            'median_value', 'polarization', 'cost', 'moves', 'violations' y
+            'feasible'
+        """
+        median = self.median_opinion()
+        violations = self.violations()
+        return {
+            'median_opinion': median + 1,
+            'median_value': self.v[median],
+            'polarization': self.polarization(median),
+            'cost': self.cost,
+            'moves': self.moves,
+            'violations': violations,
+            'feasible': not violations
+        }
+
+    def final_distribution(self) -> List[int]:
+        """Copia de la distribución final (O(m))."""
+        return list(self.final)
+
+    def to_solution(self) -> Solution:
+        """
+        Convierte el plan editado en una solución.
+
+        La polarización se recalcula con evaluate_plan, sin el redondeo
+        acumulado de las sumas incrementales.
+
+        Returns:
+            Solución con estado 'SATISFIED' si el plan es factible o
+            'INFEASIBLE' si no
+        """
+        evaluation = evaluate_plan(self.params, self.movements)
+        return Solution(
+            status='SATISFIED' if not evaluation['violations'] else 'INFEASIBLE',
+            polarization=evaluation['polarization'],
+            movements=self.movements.copy(),
+            final_distribution=evaluation['final_distribution'],
+            time=0.0,
+            message='; '.join(evaluation['violations']),
+            engine='editor',
+            reason="Plan editado a mano"
+        )
@@ -0,0 +1,163 @@
+"""
+Módulo para evaluar planes de movimientos del problema de Minimizar Polarización.
+
+Recalcula, a partir de una instancia y de las tres matrices de movimientos,
+la distribución final, la mediana, la polarización, el costo y la cantidad
+de movimientos, y verifica todas las restricciones del modelo.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+from typing import Dict, List, Mapping, Sequence
+
+
+# Factores de resistencia según nivel (1=baja, 2=media, 3=alta)
+RESISTANCE_FACTORS = (1.0, 1.5, 2.0)
+
+# Holgura para comparar costos y movimientos (valores float)
+EPSILON = 1e-9
+
+
+def compute_median_opinion(distribution: Sequence[int], n: int) -> int:
+    """
+    Calcula la opinión donde cae la mediana de una distribución.
+
+    Igual que en el modelo: la primera opinión cuyo acumulado alcanza
+    la posición central (n + 1) div 2.
+
+    Args:
+        distribution: Número de personas por opinión
+        n: Número total de personas
+
+    Returns:
+        Índice (base 0) de la opinión mediana
+    """
+    median_pos = (n + 1) // 2
+    cumulative = 0
+
+    for i, count in enumerate(distribution):
+        cumulative += count
+        if cumulative >= median_pos:
+            return i
+
+    return len(distribution) - 1
+
+
+def compute_polarization(distribution: Sequence[int], v: Sequence[float], median_opinion: int) -> float:
+    """
+    Calcula Pol(p, v) = Σ p[i] * |v[i] - mediana|.
+
+    Args:
+        distribution: Número de personas por opinión
+        v: Valores de las opiniones
+        median_opinion: Índice (base 0) de la opinión mediana
+
+    Returns:
+        Valor de polarización
+    """
+    median_value = v[median_opinion]
+    return sum(count * abs(v[i] - median_value) for i, count in enumerate(distribution))
+
+
+def evaluate_plan(params: Dict, movements: Mapping[int, Sequence[Sequence[int]]]) -> Dict:
+    """
+    Evalúa un plan de movimientos sobre una instancia.
+
+    Args:
+        params: Diccionario con los parámetros del problema (parse_input_file)
+        movements: Matrices de movimientos {nivel (1..3): matriz m x m}
+
+    Returns:
+        Diccionario con distribución final, mediana, polarización, costo,
+        movimientos y la lista de restricciones violadas (vacía si es factible)
+    """
+    n = params['n']
+    m = params['m']
+    s = params['s']
+    violations: List[str] = []
+
+    final_distribution = list(params['p'])
+    cost = 0.0
+    moves = 0
+
+    for k in range(1, 4):
+        matrix = movements.get(k)
+
+        if matrix is None or len(matrix) != m or any(len(row) != m for row in matrix):
+            violations.append(f"La matriz del nivel {k} no es de tamaño {m}x{m}")
+            continue
+
+        factor = RESISTANCE_FACTORS[k - 1]
+
+        for i, row in enumerate(matrix):
+            moved = 0
+
+            for j, count in enumerate(row):
+                if count == 0:
+                    continue
+
+                if count < 0:
+                    violations.append(f"Movimiento negativo x[{k},{i+1},{j+1}] = {count}")
+                elif i == j:
+                    violations.append(f"Movimiento de una opinión a sí misma x[{k},{i+1},{i+1}] = {count}")
+
+                distance = abs(i - j)
+                moved += count
+                moves += count * distance
+                cost += count * distance * factor
+                final_distribution[i] -= count
+                final_distribution[j] += count
+
+            if moved > s[i][k - 1]:
+                violations.append(
+                    f"Se mueven {moved} personas de la opinión {i+1} con resistencia {k}, "
+                    f"pero solo hay {s[i][k - 1]}"
+                )
+
+    if any(count < 0 for count in final_distribution):
+        violations.append("La distribución final tiene valores negativos")
+
+    if sum(final_distribution) != n:
+        violations.append(f"La distribución final suma {sum(final_distribution)} en lugar de {n}")
+
+    if cost > params['ct'] + EPSILON:
+        violations.append(f"El costo total ({cost:.3f}) supera el máximo ({params['ct']})")
+
+    if moves > params['maxMovs'] + EPSILON:
+        violations.append(f"Los movimientos ({moves}) superan el máximo ({params['maxMovs']})")
+
+    median_opinion = compute_median_opinion(final_distribution, n)
+
+    return {
+        'final_distribution': final_distribution,
+        'median_opinion': median_opinion + 1,
+        'median_value': params['v'][median_opinion],
+        'polarization': compute_polarization(final_distribution, params['v'], median_opinion),
+        'cost': cost,
+        'moves': moves,
+        'violations': violations
+    }
+
+
+def verify_solution(params: Dict, solution: Dict, tolerance: float = 0.001) -> Dict:
+    """
+    Verifica una solución leída con read_output_file contra su instancia.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        solution: Diccionario con 'polarization' y 'movements'
+        tolerance: Tolerancia para comparar la polarización declarada
+
+    Returns:
+        Resultado de evaluate_plan más 'stated_polarization', 'valid'
+        (sin restricciones violadas) y 'matches' (polarización coincide)
+    """
+    evaluation = evaluate_plan(params, solution['movements'])
+    stated = solution['polarization']
+
+    evaluation['stated_polarization'] = stated
+    evaluation['valid'] = not evaluation['violations']
+    evaluation['matches'] = abs(evaluation['polarization'] - stated) <= tolerance
+
+    return evaluation
@@ -0,0 +1,172 @@
+"""
+Formulación por flujos agregados entre opiniones vecinas.
+
+El costo |i-j| * f_k y los movimientos |i-j| son lineales en la distancia
+sobre la línea de opiniones. Por eso cualquier plan se puede expresar por
+las personas de cada resistencia que cruzan cada frontera entre opiniones
+vecinas, hacia la derecha (right[k][b], de b a b+1) o hacia la izquierda
+(left[k][b], de b+1 a b). Son 6(m-1) variables en lugar de las 3m² del
+tensor x.
+
+Un flujo es un plan válido si lo que sale neto de cada opinión con cada
+resistencia no supera s[i,k]; input_output.output.movements_from_flows
+reconstruye las matrices de movimientos sin exceder los presupuestos.
+
+El motor 'flujo' resuelve esta formulación con un MILP por cada mediana,
+como solver.milp; model/ProyectoFlujo.mzn es la misma formulación en
+MiniZinc.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import math
+from typing import Dict, List, Optional, Tuple
+
+from input_output.input import COST_SCALE, SCALED_FACTORS
+from input_output.output import movements_from_flows
+
+from .evaluation import RESISTANCE_FACTORS
+from .milp import median_search
+
+
+# Sentidos de cruce de una frontera
+RIGHT = 0
+LEFT = 1
+
+
+def flow_bounds(params: Dict) -> List[Tuple[int, int, int, int]]:
+    """
+    Lista las variables de flujo que pueden ser distintas de cero y su cota.
+
+    Por la frontera b solo cruzan hacia la derecha personas de las
+    opiniones 1..b (hacia la izquierda, de b+1..m), y ninguna variable
+    supera lo que cabe en ct o maxMovs con un solo cruce.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+
+    Returns:
+        Lista de tuplas (k, b, sentido, cota) con k en 1..3, frontera b base
+        0 (entre las opiniones b y b+1) y sentido RIGHT o LEFT
+    """
+    m = params['m']
+    cost_budget = math.floor(params['ct'] * COST_SCALE + 1e-9)
+    move_budget = math.floor(params['maxMovs'] + 1e-9)
+    bounds = []
+
+    for k in range(1, 4):
+        column = [row[k - 1] for row in params['s']]
+        total = sum(column)
+        budget = min(move_budget, cost_budget // SCALED_FACTORS[k - 1])
+        before = 0
+        for b in range(m - 1):
+            before += column[b]
+            for direction, people in ((RIGHT, before), (LEFT, total - before)):
+                bound = min(people, budget)
+                if bound > 0:
+                    bounds.append((k, b, direction, bound))
+
+    return bounds
+
+
+def _build_problem(params: Dict, variables: List[Tuple[int, int, int, int]], median: int):
+    """
+    Construye el programa entero de flujos con la opinión mediana fija.
+
+    Returns:
+        Tupla (c, constante, restricciones, cotas) para scipy.optimize.milp
+    """
+    import numpy as np
+    from scipy.optimize import Bounds, LinearConstraint
+    from scipy.sparse import coo_matrix
+
+    m = params['m']
+    v = params['v']
+    distance_to_median = [abs(v[i] - v[median]) for i in range(m)]
+
+    # Objetivo: cruzar b -> b+1 cambia Σ f_i d_i en d_{b+1} - d_b
+    constant = sum(p_i * d for p_i, d in zip(params['p'], distance_to_median))
+    c = np.array([(distance_to_median[b + 1] - distance_to_median[b]) * (1 if direction == RIGHT else -1)
+                  for _, b, direction, _ in variables])
+
+    rows, cols, data = [], [], []
+    lower, upper = [], []
+
+    def add_row(entries, lo, hi):
+        row = len(lower)
+        for col, value in entries:
+            rows.append(row)
+            cols.append(col)
+            data.append(value)
+        lower.append(lo)
+        upper.append(hi)
+
+    # 1. Salida neta de cada opinión con cada resistencia <= s[i,k]
+    net_out: Dict[Tuple[int, int], List[Tuple[int, float]]] = {}
+    for col, (k, b, direction, _) in enumerate(variables):
+        origin, target = (b, b + 1) if direction == RIGHT else (b + 1, b)
+        net_out.setdefault((k, origin), []).append((col, 1.0))
+        net_out.setdefault((k, target), []).append((col, -1.0))
+    for (k, i), entries in net_out.items():
+        add_row(entries, -np.inf, params['s'][i][k - 1])
+
+    # 2. Costo y movimientos: cada cruce es una unidad de distancia
+    add_row([(col, RESISTANCE_FACTORS[k - 1]) for col, (k, _, _, _) in enumerate(variables)],
+            0, params['ct'])
+    add_row([(col, 1.0) for col in range(len(variables))], 0, params['maxMovs'])
+
+    # 3. Mediana: acumulado[r] = Σ_{i<=r} p_i + left[·,r] - right[·,r]
+    median_pos = (params['n'] + 1) // 2
+
+    def cumulative_row(r):
+        entries = [(col, 1.0 if direction == LEFT else -1.0)
+                   for col, (_, b, direction, _) in enumerate(variables) if b == r]
+        return entries, sum(params['p'][:r + 1])
+
+    if median < m - 1:
+        entries, base = cumulative_row(median)
+        add_row(entries, median_pos - base, np.inf)
+    if median > 0:
+        entries, base = cumulative_row(median - 1)
+        add_row(entries, -np.inf, median_pos - 1 - base)
+
+    matrix = coo_matrix((data, (rows, cols)), shape=(len(lower), len(variables))).tocsr()
+    constraints = LinearConstraint(matrix, lower, upper)
+    bounds = Bounds(np.zeros(len(variables)),
+                    np.array([bound for _, _, _, bound in variables], dtype=float))
+
+    return c, constant, constraints, bounds
+
+
+def _to_movements(params: Dict, variables: List[Tuple[int, int, int, int]], x) -> Dict[int, List[List[int]]]:
+    """Traduce el vector solución a flujos y reconstruye el plan."""
+    m = params['m']
+    flows = {RIGHT: [[0] * (m - 1) for _ in range(3)], LEFT: [[0] * (m - 1) for _ in range(3)]}
+    for (k, b, direction, _), value in zip(variables, x):
+        flows[direction][k - 1][b] = int(round(value))
+    return movements_from_flows(m, flows[RIGHT], flows[LEFT])
+
+
+def solve_flow(params: Dict, timeout: int = 300, upper_bound: Optional[float] = None,
+               lower_bound: Optional[float] = None, **kwargs) -> Dict:
+    """
+    Resuelve una instancia parseada con la formulación por flujos.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        timeout: Tiempo máximo total en segundos
+        upper_bound: Cota superior conocida de la polarización (opcional)
+        lower_bound: Cota inferior conocida de la polarización (opcional)
+        **kwargs: Ignorados (compatibilidad con solve_params)
+
+    Returns:
+        Diccionario con 'status', 'polarization', 'movements',
+        'final_distribution', 'time' y 'message', igual que solve_params
+    """
+    variables = flow_bounds(params)
+
+    return median_search(params, len(variables),
+                         lambda median: _build_problem(params, variables, median),
+                         lambda x: _to_movements(params, variables, x),
+                         timeout, upper_bound, lower_bound)
@@ -0,0 +1,198 @@
+"""
+Heurística voraz y cota inferior para el problema de Minimizar Polarización.
+
+Con los valores de opinión ordenados, la mediana ponderada minimiza
+Σ f_i |v_i - c|, de modo que la polarización de cualquier distribución es
+el mínimo sobre c de esa suma. Esto permite:
+
+- Heurística: para cada opinión objetivo t, mover personas hacia t con el
+  mejor beneficio por unidad de presupuesto. La polarización real del
+  plan (medida con su propia mediana) nunca supera la suma respecto a t.
+- Cota inferior: para cada t, relajar el problema a una mochila
+  fraccionaria sobre pasos unitarios hacia t, una vez con el costo y otra
+  con los movimientos, y quedarse con la menor reducción.
+
+Si la heurística alcanza la cota, su plan es óptimo. Ambas corren en
+O(m² log m), sin solver externo.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import time
+from typing import Dict, List, Optional, Tuple
+
+from .evaluation import RESISTANCE_FACTORS, evaluate_plan
+
+
+POL_EPSILON = 1e-6
+
+
+def _is_sorted(v: List[float]) -> bool:
+    """True si los valores de opinión están en orden no decreciente."""
+    return all(a <= b for a, b in zip(v, v[1:]))
+
+
+def _target_plan(params: Dict, target: int) -> Dict[int, List[List[int]]]:
+    """
+    Construye un plan voraz que acerca personas a la opinión target.
+
+    Los grupos (i, k) se ordenan por beneficio por unidad de presupuesto,
+    con el costo y los movimientos normalizados por ct y maxMovs. Cada
+    grupo se mueve completo hasta target mientras alcance el presupuesto;
+    con el sobrante se hacen movimientos parciales.
+    """
+    m = params['m']
+    v = params['v']
+    ct = params['ct']
+    max_movs = params['maxMovs']
+    plan = {k: [[0] * m for _ in range(m)] for k in range(1, 4)}
+
+    groups = []
+    for i in range(m):
+        distance = abs(i - target)
+        if distance == 0:
+            continue
+        for k in range(1, 4):
+            if params['s'][i][k - 1] == 0:
+                continue
+            factor = RESISTANCE_FACTORS[k - 1]
+            weight = max(distance * factor / ct if ct else float('inf'),
+                         distance / max_movs if max_movs else float('inf'))
+            benefit = abs(v[i] - v[target])
+            groups.append((benefit / weight if weight else float('inf'), i, k))
+
+    groups.sort(reverse=True)
+    cost_left = ct
+    movs_left = max_movs
+
+    for _, i, k in groups:
+        factor = RESISTANCE_FACTORS[k - 1]
+        step = 1 if target > i else -1
+        available = params['s'][i][k - 1]
+
+        # Destinos desde target hacia i: primero el movimiento completo
+        for j in range(target, i, -step):
+            distance = abs(i - j)
+            count = min(available,
+                        int(cost_left / (distance * factor) + POL_EPSILON),
+                        int(movs_left / distance + POL_EPSILON))
+            if count <= 0:
+                continue
+            plan[k][i][j] += count
+            available -= count
+            cost_left -= count * distance * factor
+            movs_left -= count * distance
+            if available == 0:
+                break
+
+    return plan
+
+
+def _target_lower_bound(params: Dict, target: int) -> float:
+    """
+    Cota inferior de Σ f_i |v_i - v[target]| sobre todos los planes.
+
+    Cada persona que cruza el tramo entre dos opiniones consecutivas hacia
+    target reduce la suma en el largo del tramo. Tomando los tramos como
+    artículos independientes (mochila fraccionaria) se obtiene una cota
+    superior de la reducción, por separado para ct y para maxMovs.
+    """
+    m = params['m']
+    v = params['v']
+    p = params['p']
+    s = params['s']
+
+    base = sum(p[i] * abs(v[i] - v[target]) for i in range(m))
+
+    # Tramos: (beneficio por persona, personas que pueden cruzarlo, factor)
+    items = []
+    for k in range(3):
+        crossing = 0
+        for gap in range(target):  # tramo entre gap y gap+1, a la izquierda
+            crossing += s[gap][k]
+            items.append((v[gap + 1] - v[gap], crossing, RESISTANCE_FACTORS[k]))
+        crossing = 0
+        for gap in range(m - 1, target, -1):  # tramo entre gap-1 y gap, a la derecha
+            crossing += s[gap][k]
+            items.append((v[gap] - v[gap - 1], crossing, RESISTANCE_FACTORS[k]))
+
+    def max_reduction(budget, unit_cost):
+        reduction = 0.0
+        for benefit, count, factor in sorted(items, key=lambda it: -it[0] / unit_cost(it[2])):
+            if budget <= 0 or benefit <= 0:
+                break
+            cost = unit_cost(factor)
+            taken = min(count, budget / cost)
+            reduction += taken * benefit
+            budget -= taken * cost
+        return reduction
+
+    reduction = min(max_reduction(params['ct'], lambda factor: factor),
+                    max_reduction(params['maxMovs'], lambda factor: 1.0))
+    return max(base - reduction, 0.0)
+
+
+def polarization_lower_bound(params: Dict) -> float:
+    """
+    Calcula una cota inferior de la polarización óptima.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+
+    Returns:
+        Cota inferior (0.0 si los valores de opinión no están ordenados)
+    """
+    if not _is_sorted(params['v']):
+        return 0.0
+    return min(_target_lower_bound(params, t) for t in range(params['m']))
+
+
+def solve_heuristic(params: Dict, upper_bound: Optional[float] = None, **kwargs) -> Dict:
+    """
+    Resuelve una instancia con la heurística voraz y la acota por debajo.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        upper_bound: Cota superior conocida de la polarización (opcional)
+        **kwargs: Ignorados (compatibilidad con solve_params)
+
+    Returns:
+        Diccionario con 'status' ('OPTIMAL' si alcanza la cota inferior,
+        'SATISFIED' si no), 'polarization', 'movements',
+        'final_distribution', 'lower_bound', 'time' y 'message'
+    """
+    start_time = time.time()
+    best: Optional[Tuple[float, Dict, Dict]] = None
+
+    for target in range(params['m']):
+        plan = _target_plan(params, target)
+        evaluation = evaluate_plan(params, plan)
+        if evaluation['violations']:
+            continue
+        if best is None or evaluation['polarization'] < best[0] - POL_EPSILON:
+            best = (evaluation['polarization'], plan, evaluation)
+
+    lower_bound = polarization_lower_bound(params)
+    polarization, plan, evaluation = best
+    optimal = polarization <= lower_bound + POL_EPSILON
+
+    result = {
+        'status': 'OPTIMAL' if optimal else 'SATISFIED',
+        'polarization': polarization,
+        'movements': plan,
+        'final_distribution': evaluation['final_distribution'],
+        'lower_bound': lower_bound,
+        'time': time.time() - start_time,
+        'message': '' if optimal else f"Brecha con la cota inferior: {polarization - lower_bound:.3f}"
+    }
+
+    if upper_bound is not None and polarization > upper_bound + POL_EPSILON:
+        # Igual que los demás motores: sin solución por debajo de la cota
+        result['status'] = 'UNSATISFIABLE' if lower_bound > upper_bound + POL_EPSILON else 'UNKNOWN'
+        result['polarization'] = None
+        result['movements'] = None
+        result['final_distribution'] = None
+        result['message'] = "La heurística no mejora la cota superior dada"
+
+    return result
@@ -0,0 +1,228 @@
+"""
+Módulo para re-optimizar una instancia tras cambios pequeños.
+
+Cuando solo cambian ct, maxMovs o algunos conteos s[i][k] (y con ellos p[i]
+y n), la solución anterior casi siempre sigue siendo buena: se repara para
+que sea factible en la nueva instancia, se reutilizan las cotas que siguen
+siendo válidas y solo se llama al solver si hace falta. El solver recibe la
+polarización del plan reparado como cota superior, la cota inferior
+reutilizada (termina en cuanto la alcanza) y el plan reparado como punto de
+partida (warm_start de MiniZinc; HiGHS no admite un plan inicial).
+
+La aceleración no está garantizada: depende de que la cota inferior siga
+siendo ajustada y de que el solver aproveche el punto de partida. Sin cota
+inferior reutilizable (por ejemplo, si aumentó el presupuesto), probar la
+optimalidad cuesta casi lo mismo que resolver desde cero.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import math
+from typing import Callable, Dict, List, Mapping, Sequence
+
+from input_output.structures import Instance
+
+from .evaluation import RESISTANCE_FACTORS, evaluate_plan
+from .minizinc import solve_params
+
+
+POL_EPSILON = 1e-6
+
+
+def apply_delta(params: Dict, delta: Dict) -> Dict:
+    """
+    Aplica un cambio a una instancia y devuelve la instancia nueva.
+
+    Formato del cambio (todas las claves son opcionales):
+    - 'ct': nuevo costo total máximo
+    - 'maxMovs': nuevos movimientos máximos
+    - 's': {i: [bajo, medio, alto]} nuevas resistencias de la opinión i
+      (índice base 0); p[i] y n se recalculan
+    - 'p': {i: p_i} valores esperados de p[i], solo como verificación
+
+    Args:
+        params: Diccionario con los parámetros de la instancia anterior
+        delta: Diccionario con los cambios
+
+    Returns:
+        Instancia nueva (Instance)
+
+    Raises:
+        ValueError: Si el cambio es inválido
+    """
+    new_params = dict(params)
+    new_params['s'] = [list(row) for row in params['s']]
+
+    for key in ('ct', 'maxMovs'):
+        if key in delta:
+            if delta[key] < 0:
+                raise ValueError(f"{key} debe ser no negativo")
+            new_params[key] = float(delta[key])
+
+    for i, resistances in delta.get('s', {}).items():
+        if not 0 <= i < params['m']:
+            raise ValueError(f"Opinión fuera de rango: {i}")
+        if len(resistances) != 3 or any(r < 0 for r in resistances):
+            raise ValueError(f"Las resistencias de la opinión {i+1} deben ser 3 valores no negativos")
+        new_params['s'][i] = [int(r) for r in resistances]
+
+    new_params['p'] = [sum(row) for row in new_params['s']]
+    new_params['n'] = sum(new_params['p'])
+
+    for i, count in delta.get('p', {}).items():
+        if not 0 <= i < params['m']:
+            raise ValueError(f"Opinión fuera de rango: {i}")
+        if new_params['p'][i] != count:
+            raise ValueError(
+                f"p[{i+1}] = {count} no coincide con la suma de resistencias ({new_params['p'][i]}); "
+                f"indique también 's' para esa opinión"
+            )
+
+    if new_params['n'] <= 0:
+        raise ValueError("El número de personas debe ser positivo")
+
+    return Instance.from_dict(new_params)
+
+
+def _copy_movements(movements: Mapping[int, Sequence[Sequence[int]]]) -> Dict[int, List[List[int]]]:
+    """Copia las matrices de movimientos a listas mutables."""
+    return {k: [list(row) for row in movements[k]] for k in range(1, 4)}
+
+
+def repair_plan(params: Dict, movements: Mapping[int, Sequence[Sequence[int]]]) -> Dict[int, List[List[int]]]:
+    """
+    Convierte un plan de otra versión de la instancia en un plan factible.
+
+    Primero recorta las filas que mueven más personas de las disponibles
+    (quitando los movimientos más largos), y luego, si el costo o los
+    movimientos superan el presupuesto, quita los movimientos que menos
+    reducen la polarización por unidad de costo.
+
+    Args:
+        params: Parámetros de la instancia nueva
+        movements: Matrices de movimientos {nivel: matriz} del plan anterior
+
+    Returns:
+        Matrices de movimientos factibles para params
+    """
+    m = params['m']
+    plan = _copy_movements(movements)
+
+    # 1. Respetar s[i][k]
+    for k in range(1, 4):
+        for i, row in enumerate(plan[k]):
+            excess = sum(row) - params['s'][i][k - 1]
+            for j in sorted(range(m), key=lambda j: -abs(i - j)):
+                if excess <= 0:
+                    break
+                removed = min(row[j], excess)
+                row[j] -= removed
+                excess -= removed
+
+    # 2. Respetar ct y maxMovs
+    evaluation = evaluate_plan(params, plan)
+    excess_cost = evaluation['cost'] - params['ct']
+    excess_moves = evaluation['moves'] - params['maxMovs']
+    if excess_cost <= POL_EPSILON and excess_moves <= POL_EPSILON:
+        return plan
+
+    median = evaluation['median_opinion'] - 1
+    v = params['v']
+
+    def benefit_per_cost(entry):
+        k, i, j = entry
+        benefit = abs(v[i] - v[median]) - abs(v[j] - v[median])
+        return benefit / (abs(i - j) * RESISTANCE_FACTORS[k - 1])
+
+    entries = [(k, i, j) for k in range(1, 4) for i in range(m) for j in range(m)
+               if i != j and plan[k][i][j] > 0]
+
+    for k, i, j in sorted(entries, key=benefit_per_cost):
+        if excess_cost <= POL_EPSILON and excess_moves <= POL_EPSILON:
+            break
+
+        distance = abs(i - j)
+        unit_cost = distance * RESISTANCE_FACTORS[k - 1]
+        needed = max(excess_cost / unit_cost, excess_moves / distance)
+        removed = min(plan[k][i][j], math.ceil(needed - POL_EPSILON))
+
+        plan[k][i][j] -= removed
+        excess_cost -= removed * unit_cost
+        excess_moves -= removed * distance
+
+    return plan
+
+
+def _budget_only_shrank(old: Dict, new: Dict) -> bool:
+    """True si solo se redujo el presupuesto (la población no cambió)."""
+    return (old['s'] == new['s'] and new['ct'] <= old['ct'] and new['maxMovs'] <= old['maxMovs'])
+
+
+def resolve(prev_params: Dict, prev_solution: Dict, delta: Dict,
+            solve: Callable = solve_params, **solve_kwargs) -> Dict:
+    """
+    Re-optimiza una instancia tras un cambio pequeño.
+
+    Args:
+        prev_params: Parámetros de la instancia anterior
+        prev_solution: Solución anterior, con 'polarization', 'movements' y
+                       opcionalmente 'status' ('OPTIMAL' si estaba demostrada)
+        delta: Cambios a aplicar (ver apply_delta)
+        solve: Función solve(params, upper_bound=..., lower_bound=...,
+               warm_start=..., **solve_kwargs) que devuelve una solución
+               como solve_params (por defecto MiniZinc)
+        **solve_kwargs: Argumentos adicionales para solve (timeout, ...)
+
+    Returns:
+        Diccionario con 'status', 'polarization', 'movements', 'params'
+        (la instancia nueva), 'source' ('reused', 'repaired' o 'solver'),
+        'time' y 'message'
+    """
+    params = apply_delta(prev_params, delta)
+    plan = repair_plan(params, prev_solution['movements'])
+    evaluation = evaluate_plan(params, plan)
+
+    result = {
+        'status': 'SATISFIED',
+        'polarization': evaluation['polarization'],
+        'movements': plan,
+        'final_distribution': evaluation['final_distribution'],
+        'params': params,
+        'source': 'repaired',
+        'time': 0.0,
+        'message': ''
+    }
+
+    # Cotas que siguen siendo válidas: con menos presupuesto y la misma
+    # población, el óptimo anterior sigue siendo cota inferior
+    lower_bound = 0.0
+    if prev_solution.get('status') == 'OPTIMAL' and _budget_only_shrank(prev_params, params):
+        lower_bound = prev_solution['polarization']
+
+    if evaluation['polarization'] <= lower_bound + POL_EPSILON:
+        result['status'] = 'OPTIMAL'
+        result['source'] = 'reused'
+        result['message'] = "El plan anterior (reparado) alcanza la cota inferior"
+        return result
+
+    solution = solve(params, upper_bound=evaluation['polarization'],
+                     lower_bound=lower_bound if lower_bound > 0 else None,
+                     warm_start=plan, **solve_kwargs)
+    result['time'] = solution.get('time', 0.0)
+
+    if solution['status'] in ('OPTIMAL', 'SATISFIED') and solution['movements'] is not None:
+        candidate = evaluate_plan(params, solution['movements'])
+        if not candidate['violations'] and candidate['polarization'] <= result['polarization'] + POL_EPSILON:
+            result['polarization'] = candidate['polarization']
+            result['movements'] = solution['movements']
+            result['final_distribution'] = candidate['final_distribution']
+            result['source'] = 'solver'
+
+    if solution['status'] in ('OPTIMAL', 'UNSATISFIABLE'):
+        # Insatisfactible bajo la cota: el plan reparado ya era óptimo
+        result['status'] = 'OPTIMAL'
+    else:
+        result['message'] = solution.get('message', '')
+
+    return result
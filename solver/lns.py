@@ -0,0 +1,342 @@
+"""
+Búsqueda en vecindarios grandes (LNS) alrededor del modelo de MiniZinc.
+
+En instancias donde Gecode no alcanza a probar optimalidad, una sola
+ejecución larga suele quedarse con soluciones malas: la búsqueda pasa casi
+todo el tiempo en el fondo del árbol. Este módulo mejora un plan
+incumbente resolviendo muchos problemas pequeños con el mismo modelo:
+
+- Se fijan las entradas x[k,i,j] del incumbente fuera de un vecindario y
+  solo las del vecindario quedan libres, con una cota superior estricta
+  (la polarización del incumbente menos IMPROVEMENT_MARGIN): así
+  UNSATISFIABLE significa que el vecindario no tiene nada mejor.
+- Cada subproblema se resuelve con un límite corto; si su plan mejora al
+  incumbente, pasa a ser el nuevo incumbente.
+- Varios vecindarios se resuelven en paralelo en procesos separados,
+  hasta agotar el presupuesto de tiempo total.
+
+Vecindarios (ver NEIGHBORHOODS): una ventana de opiniones al azar, una
+ventana alrededor de la mediana del incumbente y un solo nivel de
+resistencia sobre una ventana más ancha. Una entrada está libre si su
+nivel es del vecindario y su origen o su destino cae en la ventana. Si
+los vecindarios se agotan sin mejorar, la ventana crece.
+
+LNS no prueba optimalidad salvo que un vecindario cubra la instancia
+completa (instancias pequeñas) o que el plan alcance la cota inferior de
+la heurística.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import math
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from input_output.input import VALUE_SCALE
+
+from .evaluation import evaluate_plan
+from .heuristic import solve_heuristic
+from .minizinc import DEFAULT_SOLVER, solve_params
+
+
+# Tolerancia para comparar polarizaciones
+POL_EPSILON = 1e-6
+
+# Mejora mínima exigida a un subproblema. Los valores de opinión tienen
+# tres decimales, así que las polarizaciones distintas difieren en al menos
+# 1 / VALUE_SCALE; medio paso hace estricta la cota sin excluir mejoras
+IMPROVEMENT_MARGIN = 0.5 / VALUE_SCALE
+
+# Variantes del modelo con la matriz completa x[k,i,j] (ver MODEL_VARIANTS)
+LNS_MODELS = ('default', 'entero', 'mediana')
+
+NEIGHBORHOODS = ('ventana', 'mediana', 'nivel')
+
+# Fracción de las opiniones en la ventana: con 0.1, queda libre cerca del
+# 20 % de x (origen o destino en la ventana)
+DEFAULT_FRACTION = 0.1
+MAX_FRACTION = 1.0
+GROWTH = 1.5
+
+# Límite de tiempo de cada subproblema (segundos)
+DEFAULT_SUB_TIMEOUT = 10
+MIN_SUB_TIMEOUT = 1
+
+# Procesos por defecto (Gecode usa un hilo por proceso)
+DEFAULT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+
+# Errores que no se arreglan con otro vecindario
+FATAL_STATUSES = ('NOT_FOUND', 'ERROR', 'MEMORY_LIMIT')
+
+
+def make_neighborhood(kind: str, m: int, fraction: float, rng: random.Random,
+                      median: int = 0) -> Dict:
+    """
+    Elige un vecindario al azar.
+
+    Args:
+        kind: Tipo de vecindario (uno de NEIGHBORHOODS)
+        m: Número de opiniones
+        fraction: Fracción de las opiniones en la ventana
+        rng: Generador de números aleatorios
+        median: Opinión mediana del incumbente (base 0), para 'mediana'
+
+    Returns:
+        Diccionario con 'kind', 'levels' (niveles libres) y 'window'
+        (primera y última opinión de la ventana, base 0)
+
+    Raises:
+        ValueError: Si el tipo de vecindario no existe
+    """
+    width = min(m, max(1, math.ceil(fraction * m)))
+    levels = (1, 2, 3)
+
+    if kind == 'ventana':
+        first = rng.randrange(m - width + 1)
+    elif kind == 'mediana':
+        first = min(max(median - width // 2, 0), m - width)
+    elif kind == 'nivel':
+        # Un nivel tiene un tercio de las variables: ventana tres veces más ancha
+        levels = (rng.randint(1, 3),)
+        width = min(m, 3 * width)
+        first = rng.randrange(m - width + 1)
+    else:
+        raise ValueError(f"Vecindario desconocido: {kind} (opciones: {', '.join(NEIGHBORHOODS)})")
+
+    return {'kind': kind, 'levels': levels, 'window': (first, first + width - 1)}
+
+
+def covers_instance(neighborhood: Dict, m: int) -> bool:
+    """True si el vecindario deja libres todas las entradas de x."""
+    return len(neighborhood['levels']) == 3 and neighborhood['window'] == (0, m - 1)
+
+
+def neighborhood_model(incumbent: Mapping[int, Sequence[Sequence[int]]], m: int,
+                       neighborhood: Dict) -> str:
+    """
+    Genera las restricciones MiniZinc que fijan el incumbente fuera del vecindario.
+
+    Solo se escriben las entradas no nulas fijadas; el resto de las fijadas
+    se iguala a cero con una única restricción, así que el texto crece con
+    los movimientos del plan y no con m².
+
+    Args:
+        incumbent: Plan incumbente {nivel: matriz m x m}
+        m: Número de opiniones
+        neighborhood: Vecindario (make_neighborhood)
+
+    Returns:
+        Texto para solve_params(extra_model=...)
+    """
+    levels = neighborhood['levels']
+    first, last = neighborhood['window']
+    free = lambda k, i, j: k in levels and (first <= i <= last or first <= j <= last)
+
+    lines = [
+        f"% Vecindario LNS '{neighborhood['kind']}'",
+        f"set of int: lns_levels = {{{', '.join(str(k) for k in levels)}}};",
+        f"set of int: lns_window = {first + 1}..{last + 1};",
+    ]
+    kept = []
+    for k in range(1, 4):
+        for i, row in enumerate(incumbent[k]):
+            if not any(row):
+                continue
+            for j, count in enumerate(row):
+                if count and not free(k, i, j):
+                    lines.append(f"constraint x[{k},{i + 1},{j + 1}] = {count};")
+                    kept.append(((k - 1) * m + i) * m + j + 1)
+
+    lines.append(f"set of int: lns_kept = {{{', '.join(map(str, kept))}}};")
+    lines.append(
+        "constraint forall(k in 1..3, i in 1..m, j in 1..m where "
+        "not (k in lns_levels /\\ (i in lns_window \\/ j in lns_window)) /\\ "
+        "not (((k - 1) * m + i - 1) * m + j in lns_kept))(x[k,i,j] = 0);"
+    )
+    return '\n'.join(lines) + '\n'
+
+
+def _solve_neighborhood(task: Tuple[Dict, Dict, float, Dict, float, Dict]) -> Tuple[Dict, Dict]:
+    """Adaptador para ProcessPoolExecutor.submit: resuelve un vecindario."""
+    params, incumbent, polarization, neighborhood, timeout, solve_kwargs = task
+    extra_model = neighborhood_model(incumbent, params['m'], neighborhood)
+    # Cota estricta: solo se aceptan planes mejores que el incumbente
+    solution = solve_params(params, timeout=timeout, upper_bound=polarization - IMPROVEMENT_MARGIN,
+                            extra_model=extra_model, **solve_kwargs)
+    return neighborhood, solution
+
+
+def solve_lns(params: Dict, timeout: float = 300, upper_bound: Optional[float] = None,
+              incumbent: Optional[Mapping[int, Sequence[Sequence[int]]]] = None,
+              workers: int = DEFAULT_WORKERS, sub_timeout: float = DEFAULT_SUB_TIMEOUT,
+              neighborhoods: Sequence[str] = NEIGHBORHOODS, fraction: float = DEFAULT_FRACTION,
+              seed: Optional[int] = None, model: str = 'default', solver: str = DEFAULT_SOLVER,
+              search: str = 'default', memory_limit_mb: Optional[int] = None) -> Dict:
+    """
+    Mejora un plan con búsqueda en vecindarios grandes sobre el modelo MiniZinc.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        timeout: Presupuesto de tiempo total en segundos
+        upper_bound: Cota superior conocida de la polarización (opcional)
+        incumbent: Plan inicial {nivel: matriz m x m} (por defecto, el de la
+                   heurística)
+        workers: Vecindarios que se resuelven en paralelo
+        sub_timeout: Límite de tiempo de cada subproblema en segundos
+        neighborhoods: Tipos de vecindario que se alternan (NEIGHBORHOODS)
+        fraction: Fracción inicial de las opiniones en cada ventana
+        seed: Semilla de los vecindarios (opcional, para repetir una corrida)
+        model: Variante del modelo (una de LNS_MODELS)
+        solver: Solver de MiniZinc a usar
+        search: Estrategia de búsqueda de cada subproblema
+        memory_limit_mb: Límite de memoria de cada subproblema en MB
+
+    Returns:
+        Diccionario con 'status' ('OPTIMAL' solo si se probó, 'SATISFIED' si
+        no), 'polarization', 'movements', 'final_distribution',
+        'lower_bound', 'time', 'message', 'rounds' (subproblemas resueltos)
+        e 'improvements' (lista de {'time', 'polarization', 'neighborhood'}).
+        Si un subproblema lanza una excepción, la búsqueda se detiene y se
+        devuelve el incumbente con el error en 'message'
+
+    Raises:
+        ValueError: Si el modelo o algún vecindario no existen
+    """
+    if model not in LNS_MODELS:
+        raise ValueError(f"LNS necesita un modelo con la matriz x completa "
+                         f"(opciones: {', '.join(LNS_MODELS)})")
+    if not neighborhoods:
+        raise ValueError("Se necesita al menos un tipo de vecindario")
+    for kind in neighborhoods:
+        if kind not in NEIGHBORHOODS:
+            raise ValueError(f"Vecindario desconocido: {kind} (opciones: {', '.join(NEIGHBORHOODS)})")
+
+    start_time = time.time()
+    deadline = start_time + timeout
+    rng = random.Random(seed)
+    m = params['m']
+
+    heuristic = solve_heuristic(params)
+    lower_bound = heuristic['lower_bound']
+    if incumbent is None:
+        incumbent = heuristic['movements']
+    evaluation = evaluate_plan(params, incumbent)
+    if evaluation['violations']:
+        raise ValueError(f"El plan inicial no es factible: {evaluation['violations'][0]}")
+
+    best = {'movements': incumbent, 'evaluation': evaluation}
+    improvements: List[Dict] = []
+    solve_kwargs = {'model': model, 'solver': solver, 'search': search, 'memory_limit_mb': memory_limit_mb}
+    state = {'rounds': 0, 'stalled': 0, 'fraction': fraction, 'proven': False, 'error': None}
+
+    def next_task() -> Optional[Tuple]:
+        remaining = deadline - time.time()
+        if remaining < MIN_SUB_TIMEOUT or state['proven'] or state['error']:
+            return None
+        if best['evaluation']['polarization'] <= lower_bound + POL_EPSILON:
+            return None
+        kind = neighborhoods[state['rounds'] % len(neighborhoods)]
+        state['rounds'] += 1
+        neighborhood = make_neighborhood(kind, m, state['fraction'], rng,
+                                         best['evaluation']['median_opinion'] - 1)
+        return (params, best['movements'], best['evaluation']['polarization'], neighborhood,
+                min(sub_timeout, remaining), solve_kwargs)
+
+    def failed(neighborhood: Dict, error: Exception):
+        # Un subproceso caído cuenta como error fatal; el incumbente se conserva
+        state['error'] = {'status': 'ERROR', 'exception': True,
+                          'message': f"Vecindario '{neighborhood['kind']}' falló: {error}"}
+
+    def accept(neighborhood: Dict, solution: Dict):
+        status = solution['status']
+        if status in FATAL_STATUSES:
+            state['error'] = solution
+            return
+
+        improved = False
+        if status in ('OPTIMAL', 'SATISFIED') and solution['movements'] is not None:
+            candidate = evaluate_plan(params, solution['movements'])
+            if (not candidate['violations']
+                    and candidate['polarization'] < best['evaluation']['polarization'] - POL_EPSILON):
+                best['movements'] = solution['movements']
+                best['evaluation'] = candidate
+                improvements.append({'time': time.time() - start_time,
+                                     'polarization': candidate['polarization'],
+                                     'neighborhood': neighborhood['kind']})
+                improved = True
+
+        # Con todo x libre y la búsqueda completa, el incumbente es óptimo
+        if status in ('OPTIMAL', 'UNSATISFIABLE') and covers_instance(neighborhood, m):
+            state['proven'] = True
+
+        # Vecindarios agotados sin mejora: ampliar la ventana
+        if improved:
+            state['stalled'] = 0
+        elif status in ('OPTIMAL', 'UNSATISFIABLE'):
+            state['stalled'] += 1
+            if state['stalled'] >= 2 * max(workers, 1):
+                state['fraction'] = min(state['fraction'] * GROWTH, MAX_FRACTION)
+                state['stalled'] = 0
+
+    if workers > 1:
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = {}
+            while True:
+                while len(pending) < workers:
+                    task = next_task()
+                    if task is None:
+                        break
+                    pending[executor.submit(_solve_neighborhood, task)] = task[3]
+                if not pending:
+                    break
+                done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    neighborhood = pending.pop(future)
+                    try:
+                        accept(*future.result())
+                    except Exception as e:
+                        failed(neighborhood, e)
+    else:
+        task = next_task()
+        while task is not None:
+            try:
+                accept(*_solve_neighborhood(task))
+            except Exception as e:
+                failed(task[3], e)
+            task = next_task()
+
+    evaluation = best['evaluation']
+    polarization = evaluation['polarization']
+    proven = state['proven'] or polarization <= lower_bound + POL_EPSILON
+    result = {
+        'status': 'OPTIMAL' if proven else 'SATISFIED',
+        'polarization': polarization,
+        'movements': best['movements'],
+        'final_distribution': evaluation['final_distribution'],
+        'lower_bound': lower_bound,
+        'time': time.time() - start_time,
+        'message': (f"LNS: {state['rounds']} vecindarios, {len(improvements)} mejoras"
+                    + ("" if proven else f", brecha con la cota inferior {polarization - lower_bound:.3f}")),
+        'rounds': state['rounds'],
+        'improvements': improvements
+    }
+
+    error = state['error']
+    if error and not improvements and not error.get('exception'):
+        # MiniZinc no está disponible o falló: mismo reporte que solve_params
+        result.update(status=error['status'], polarization=None, movements=None,
+                      final_distribution=None, message=error['message'])
+    elif error:
+        result['message'] += f" (detenido: {error['message'] if error.get('exception') else error['status']})"
+
+    if upper_bound is not None and result['polarization'] is not None \
+            and polarization > upper_bound + POL_EPSILON:
+        # Igual que los demás motores: sin solución por debajo de la cota
+        result.update(status='UNKNOWN', polarization=None, movements=None, final_distribution=None,
+                      message="LNS no mejora la cota superior dada")
+
+    return result
@@ -0,0 +1,280 @@
+"""
+Motor MILP en proceso para el problema de Minimizar Polarización.
+
+Con la opinión mediana t fija, el modelo es lineal en x: la distribución
+final y los acumulados son lineales, y |v[i] - v[t]| es una constante. Se
+plantea entonces un programa entero por cada mediana posible (con las
+restricciones de acumulado que obligan a que t sea la mediana) y se
+resuelve con HiGHS a través de scipy.optimize.milp, sin pasar por MiniZinc.
+
+Las medianas se visitan en orden de su cota de relajación lineal y se
+descartan las que no pueden mejorar la mejor solución encontrada.
+
+Requiere SciPy >= 1.9 (opcional: pip install scipy). SciPy se importa
+solo al resolver, para no retrasar el arranque de quien no usa este motor.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import importlib.util
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+
+from input_output.input import movement_bounds
+from tracing import span
+
+from .evaluation import RESISTANCE_FACTORS, evaluate_plan
+
+# Solo se comprueba que SciPy esté instalado; se importa al resolver
+try:
+    HAS_SCIPY = importlib.util.find_spec('scipy') is not None
+except (ImportError, ValueError):  # instalación rota o módulo sin __spec__
+    HAS_SCIPY = False
+
+
+POL_EPSILON = 1e-6
+
+
+def reachable_moves(params: Dict) -> List[Tuple[int, int, int]]:
+    """
+    Lista los movimientos (k, i, j) que pueden ser distintos de cero.
+
+    Un movimiento es alcanzable si hay personas con esa resistencia en i,
+    i != j, y un solo movimiento cabe en ct y maxMovs (ver movement_bounds).
+
+    Args:
+        params: Diccionario con los parámetros del problema
+
+    Returns:
+        Lista de tuplas (k, i, j) con k en 1..3 e índices de opinión base 0
+    """
+    return [(k, i, j) for k, i, j, _ in movement_bounds(params)]
+
+
+def _build_problem(params: Dict, moves: List[Tuple[int, int, int]], move_ub: List[int], median: int):
+    """
+    Construye el programa entero con la opinión mediana fija.
+
+    Cada x[k,i,j] se acota por su cota de movement_bounds, más ajustada
+    que s[i,k], lo que también ajusta las relajaciones lineales.
+
+    Returns:
+        Tupla (c, constante, restricciones, cotas) para scipy.optimize.milp
+    """
+    import numpy as np
+    from scipy.optimize import Bounds, LinearConstraint
+    from scipy.sparse import coo_matrix
+
+    m = params['m']
+    v = params['v']
+    s = params['s']
+    n_vars = len(moves)
+    distance_to_median = [abs(v[i] - v[median]) for i in range(m)]
+
+    # Objetivo: Σ f_i d_i = Σ p_i d_i + Σ x[k,i,j] (d_j - d_i)
+    constant = sum(p_i * d for p_i, d in zip(params['p'], distance_to_median))
+    c = np.array([distance_to_median[j] - distance_to_median[i] for _, i, j in moves])
+
+    rows, cols, data = [], [], []
+    lower, upper = [], []
+
+    def add_row(entries, lo, hi):
+        row = len(lower)
+        for col, value in entries:
+            rows.append(row)
+            cols.append(col)
+            data.append(value)
+        lower.append(lo)
+        upper.append(hi)
+
+    # 1. Σ_j x[k,i,j] <= s[i,k]
+    by_origin: Dict[Tuple[int, int], List[int]] = {}
+    for col, (k, i, _) in enumerate(moves):
+        by_origin.setdefault((k, i), []).append(col)
+    for (k, i), cols_ki in by_origin.items():
+        add_row([(col, 1.0) for col in cols_ki], 0, s[i][k - 1])
+
+    # 2. Costo y movimientos
+    add_row([(col, abs(i - j) * RESISTANCE_FACTORS[k - 1]) for col, (k, i, j) in enumerate(moves)],
+            0, params['ct'])
+    add_row([(col, abs(i - j)) for col, (k, i, j) in enumerate(moves)], 0, params['maxMovs'])
+
+    # 3. Mediana: acumulado[t-1] < (n+1) div 2 <= acumulado[t]
+    #    acumulado[r] = Σ_{i<=r} p_i + (entradas a 1..r) - (salidas de 1..r)
+    median_pos = (params['n'] + 1) // 2
+
+    def cumulative_row(r):
+        base = sum(params['p'][:r + 1])
+        entries = [(col, 1.0 if i > r else -1.0)
+                   for col, (_, i, j) in enumerate(moves) if (i > r) != (j > r)]
+        return entries, base
+
+    entries, base = cumulative_row(median)
+    add_row(entries, median_pos - base, np.inf)
+    if median > 0:
+        entries, base = cumulative_row(median - 1)
+        add_row(entries, -np.inf, median_pos - 1 - base)
+
+    matrix = coo_matrix((data, (rows, cols)), shape=(len(lower), n_vars)).tocsr()
+    constraints = LinearConstraint(matrix, lower, upper)
+    bounds = Bounds(np.zeros(n_vars), np.array(move_ub, dtype=float))
+
+    return c, constant, constraints, bounds
+
+
+def _to_movements(m: int, moves: List[Tuple[int, int, int]], x) -> Dict[int, List[List[int]]]:
+    """Traduce el vector solución a las tres matrices de movimientos."""
+    movements = {k: [[0] * m for _ in range(m)] for k in range(1, 4)}
+    for (k, i, j), value in zip(moves, x):
+        movements[k][i][j] = int(round(value))
+    return movements
+
+
+def median_search(params: Dict, n_vars: int, build: Callable, decode: Callable,
+                  timeout: int, upper_bound: Optional[float],
+                  lower_bound: Optional[float] = None) -> Dict:
+    """
+    Resuelve un programa entero por cada mediana posible y se queda con el mejor.
+
+    Las medianas se visitan en orden de su cota de relajación lineal y se
+    descartan las que no pueden mejorar la mejor solución encontrada. Lo
+    comparten este motor y el de flujos (solver.flow), que solo cambian
+    las variables.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        n_vars: Número de variables del programa
+        build: Función mediana -> (c, constante, restricciones, cotas)
+        decode: Función vector solución -> matrices de movimientos
+        timeout: Tiempo máximo total en segundos
+        upper_bound: Cota superior conocida de la polarización (opcional)
+        lower_bound: Cota inferior conocida de la polarización (opcional);
+                     la búsqueda termina en cuanto una solución la alcanza
+
+    Returns:
+        Diccionario con 'status', 'polarization', 'movements',
+        'final_distribution', 'time' y 'message', igual que solve_params
+    """
+    start_time = time.time()
+    result = {
+        'status': 'ERROR',
+        'polarization': None,
+        'movements': None,
+        'final_distribution': None,
+        'time': 0.0,
+        'message': ''
+    }
+
+    if not HAS_SCIPY:
+        result['message'] = "SciPy no está instalado (pip install scipy)"
+        return result
+
+    with span('import', module='scipy'):
+        import numpy as np
+        from scipy.optimize import milp
+
+    m = params['m']
+    best_value = upper_bound + POL_EPSILON if upper_bound is not None else np.inf
+    best = None
+    proven = True
+
+    if not n_vars:
+        # Nada puede moverse: la única solución es la distribución inicial
+        movements = decode([])
+        evaluation = evaluate_plan(params, movements)
+        if evaluation['polarization'] < best_value:
+            best = (movements, evaluation)
+
+    # Cota de relajación lineal de cada mediana, para ordenar y podar
+    candidates = []
+    with span('relaxations', moves=n_vars):
+        for median in range(m if n_vars else 0):
+            remaining = timeout - (time.time() - start_time)
+            if remaining <= 0:
+                # Sin tiempo para acotar todas las medianas: no se prueba optimalidad
+                proven = False
+                break
+            c, constant, constraints, bounds = build(median)
+            relaxed = milp(c, constraints=constraints, bounds=bounds,
+                           options={'time_limit': remaining})
+            if relaxed.status == 0:
+                candidates.append((constant + relaxed.fun, median))
+            elif relaxed.status != 2:
+                # Relajación sin resolver (por tiempo): la mediana no se puede descartar
+                proven = False
+
+    for bound, median in sorted(candidates):
+        if bound >= best_value - POL_EPSILON:
+            break
+        if lower_bound is not None and best is not None and best_value <= lower_bound + POL_EPSILON:
+            # La mejor solución alcanza la cota inferior: es óptima
+            break
+
+        remaining = timeout - (time.time() - start_time)
+        if remaining <= 0:
+            proven = False
+            break
+
+        with span('search', median=median):
+            c, constant, constraints, bounds = build(median)
+            solution = milp(c, constraints=constraints, bounds=bounds,
+                            integrality=np.ones(n_vars),
+                            options={'time_limit': remaining})
+        if solution.x is None:
+            proven = proven and solution.status == 2  # 2 = infactible
+            continue
+        if solution.status != 0:
+            proven = False
+
+        movements = decode(solution.x)
+        evaluation = evaluate_plan(params, movements)
+        if evaluation['violations']:
+            proven = False
+            continue
+
+        if evaluation['polarization'] < best_value - POL_EPSILON:
+            best_value = evaluation['polarization']
+            best = (movements, evaluation)
+
+    result['time'] = time.time() - start_time
+
+    if best is None:
+        # Sin solución por debajo de la cota (o sin tiempo para encontrarla)
+        result['status'] = 'UNSATISFIABLE' if proven else 'UNKNOWN'
+        return result
+
+    movements, evaluation = best
+    result['status'] = 'OPTIMAL' if proven else 'SATISFIED'
+    result['polarization'] = evaluation['polarization']
+    result['movements'] = movements
+    result['final_distribution'] = evaluation['final_distribution']
+
+    return result
+
+
+def solve_milp(params: Dict, timeout: int = 300, upper_bound: Optional[float] = None,
+               lower_bound: Optional[float] = None, **kwargs) -> Dict:
+    """
+    Resuelve una instancia parseada con un MILP por cada mediana posible.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        timeout: Tiempo máximo total en segundos
+        upper_bound: Cota superior conocida de la polarización (opcional)
+        lower_bound: Cota inferior conocida de la polarización (opcional)
+        **kwargs: Ignorados (compatibilidad con solve_params; HiGHS no
+                  admite un plan inicial, así que warm_start no se usa)
+
+    Returns:
+        Diccionario con 'status', 'polarization', 'movements',
+        'final_distribution', 'time' y 'message', igual que solve_params
+    """
+    reachable = movement_bounds(params)
+    moves = [(k, i, j) for k, i, j, _ in reachable]
+    move_ub = [bound for _, _, _, bound in reachable]
+
+    return median_search(params, len(moves),
+                         lambda median: _build_problem(params, moves, move_ub, median),
+                         lambda x: _to_movements(params['m'], moves, x),
+                         timeout, upper_bound, lower_bound)
@@ -0,0 +1,527 @@
+"""
+Módulo para resolver instancias con MiniZinc desde Python.
+
+Genera el archivo .dzn de una instancia ya parseada, ejecuta MiniZinc y
+devuelve la solución con el mismo formato que usan los demás motores:
+estado, polarización y las tres matrices de movimientos.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import math
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Mapping, Optional, Sequence, Tuple
+
+from input_output.input import VALUE_SCALE, generate_dzn_file, movement_bounds
+from input_output.output import parse_minizinc_output
+from tracing import record_span, span, tracing_enabled
+
+
+ROOT_DIR = Path(__file__).parent.parent
+MODEL_FILE = ROOT_DIR / 'model' / 'Proyecto.mzn'
+DEFAULT_SOLVER = 'Gecode'
+
+# Variantes del modelo: archivo, si esperan los datos escalados a enteros,
+# si solo declaran los movimientos alcanzables (datos dispersos) y si
+# search_moves son las entradas de x (para arrancar desde un plan)
+MODEL_VARIANTS = {
+    'default': {'file': MODEL_FILE, 'scaled': False, 'reduced': False, 'moves': True},
+    'entero': {'file': ROOT_DIR / 'model' / 'ProyectoEntero.mzn', 'scaled': True, 'reduced': False,
+               'moves': True},
+    'reducido': {'file': ROOT_DIR / 'model' / 'ProyectoReducido.mzn', 'scaled': False, 'reduced': True,
+                 'moves': True},
+    'mediana': {'file': ROOT_DIR / 'model' / 'ProyectoMediana.mzn', 'scaled': True, 'reduced': False,
+                'moves': True},
+    'flujo': {'file': ROOT_DIR / 'model' / 'ProyectoFlujo.mzn', 'scaled': True, 'reduced': False,
+              'moves': False},
+}
+
+# Estrategias de búsqueda: cada archivo de model/busqueda tiene el solve
+# item que reemplaza al del modelo; 'default' deja la búsqueda del solver
+SEARCH_DIR = ROOT_DIR / 'model' / 'busqueda'
+SEARCH_STRATEGIES = {'default': None}
+SEARCH_STRATEGIES.update((path.stem, path) for path in sorted(SEARCH_DIR.glob('*.mzn')))
+SOLVE_ITEM = re.compile(r'^solve\s+minimize\s+polarization\s*;', re.MULTILINE)
+SOLVE_KEYWORD = re.compile(r'^solve\b', re.MULTILINE)
+
+# Segundos extra que se da al proceso sobre el --time-limit de MiniZinc,
+# para que alcance a imprimir la mejor solución encontrada
+TIMEOUT_MARGIN = 20
+
+# Intervalo de sondeo del proceso (segundos) y espera antes de SIGKILL
+POLL_INTERVAL = 0.05
+TERMINATE_GRACE = 2.0
+
+# os.wait4 (CPU y memoria pico del hijo) solo existe en sistemas POSIX
+HAS_WAIT4 = hasattr(os, 'wait4')
+
+
+def _process_tree_rss(pid: int) -> int:
+    """
+    Suma la memoria residente (bytes) de un proceso y sus descendientes.
+
+    Usa /proc, por lo que solo funciona en Linux; en otros sistemas
+    devuelve 0.
+
+    Args:
+        pid: Proceso raíz (minizinc; el solver corre como hijo suyo)
+
+    Returns:
+        RSS total en bytes
+    """
+    total = 0
+    pending = [pid]
+
+    while pending:
+        current = pending.pop()
+        try:
+            with open(f'/proc/{current}/status', 'r') as f:
+                for line in f:
+                    if line.startswith('VmRSS:'):
+                        total += int(line.split()[1]) * 1024
+                        break
+            with open(f'/proc/{current}/task/{current}/children', 'r') as f:
+                pending.extend(int(child) for child in f.read().split())
+        except (OSError, ValueError):
+            continue
+
+    return total
+
+
+def _terminate(proc: subprocess.Popen):
+    """
+    Termina MiniZinc y su solver: SIGTERM al grupo y SIGKILL si no responde.
+
+    Args:
+        proc: Proceso de MiniZinc
+
+    Returns:
+        Uso de recursos del proceso terminado (os.wait4) o None
+    """
+    if not HAS_WAIT4:
+        proc.kill()
+        proc.wait()
+        return None
+
+    try:
+        os.killpg(proc.pid, signal.SIGTERM)
+        deadline = time.time() + TERMINATE_GRACE
+        while time.time() < deadline:
+            pid, wait_status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid != 0:
+                proc.returncode = os.waitstatus_to_exitcode(wait_status)
+                return usage
+            time.sleep(POLL_INTERVAL)
+        os.killpg(proc.pid, signal.SIGKILL)
+    except ProcessLookupError:
+        pass
+
+    try:
+        _, wait_status, usage = os.wait4(proc.pid, 0)
+        proc.returncode = os.waitstatus_to_exitcode(wait_status)
+        return usage
+    except ChildProcessError:
+        return None
+
+
+def run_minizinc(mzn_file: Path, dzn_file: Path, timeout: int = 300,
+                 solver: str = DEFAULT_SOLVER, extra_files: Sequence[Path] = (),
+                 output_mode: Optional[str] = None,
+                 memory_limit_mb: Optional[int] = None) -> Dict:
+    """
+    Ejecuta MiniZinc con un modelo y datos, midiendo los recursos usados.
+
+    Además del tiempo real, registra el tiempo de CPU (usuario y sistema)
+    y la memoria residente pico de MiniZinc y su solver. Si se indica
+    memory_limit_mb, el solver se termina en cuanto el árbol de procesos
+    lo supera, con estado 'MEMORY_LIMIT' en lugar de esperar al OOM killer.
+
+    La medición de CPU/memoria y el límite de memoria requieren Linux
+    (os.wait4 y /proc); en otros sistemas esos campos quedan en None.
+
+    Args:
+        mzn_file: Ruta al archivo .mzn
+        dzn_file: Ruta al archivo .dzn
+        timeout: Tiempo máximo de ejecución en segundos
+        solver: Solver de MiniZinc a usar
+        extra_files: Archivos .mzn/.dzn adicionales (por ejemplo, cotas)
+        output_mode: Modo de salida de MiniZinc ('json', 'dzn', ...), opcional
+        memory_limit_mb: Límite de memoria residente en MB (opcional)
+
+    Returns:
+        Diccionario con 'success', 'status' ('OK', 'ERROR', 'TIMEOUT',
+        'MEMORY_LIMIT' o 'NOT_FOUND'), 'output' (stdout), 'message'
+        (stderr o explicación), 'time', 'user_time', 'sys_time' (segundos)
+        y 'peak_rss' (bytes)
+    """
+    run = {
+        'success': False,
+        'status': 'ERROR',
+        'output': '',
+        'message': '',
+        'time': 0.0,
+        'user_time': None,
+        'sys_time': None,
+        'peak_rss': None
+    }
+
+    cmd = [
+        'minizinc',
+        '--solver', solver,
+        '--time-limit', str(int(timeout * 1000)),  # en milisegundos
+    ]
+    if output_mode:
+        cmd += ['--output-mode', output_mode]
+    if tracing_enabled():
+        # Tiempos de compilación y búsqueda para las trazas (líneas %%%mzn-stat)
+        cmd += ['--statistics']
+    cmd += [str(mzn_file), str(dzn_file)] + [str(f) for f in extra_files]
+
+    start_time = time.time()
+
+    try:
+        # Grupo de procesos propio para poder terminar también al solver
+        proc = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE,
+                                text=True, start_new_session=HAS_WAIT4)
+    except FileNotFoundError:
+        run['status'] = 'NOT_FOUND'
+        run['message'] = "MiniZinc no encontrado. Asegúrese de que esté instalado y en el PATH."
+        return run
+    except Exception as e:
+        run['message'] = str(e)
+        return run
+
+    # Leer las tuberías en hilos para que una salida grande no bloquee al solver
+    streams = {}
+    readers = [
+        threading.Thread(target=lambda name=name, pipe=pipe: streams.__setitem__(name, pipe.read()), daemon=True)
+        for name, pipe in (('stdout', proc.stdout), ('stderr', proc.stderr))
+    ]
+    for reader in readers:
+        reader.start()
+
+    memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+    peak_rss = 0
+    killed = None
+    usage = None
+
+    while True:
+        if HAS_WAIT4:
+            pid, wait_status, usage = os.wait4(proc.pid, os.WNOHANG)
+            if pid != 0:
+                proc.returncode = os.waitstatus_to_exitcode(wait_status)
+                break
+        elif proc.poll() is not None:
+            break
+
+        if HAS_WAIT4:
+            peak_rss = max(peak_rss, _process_tree_rss(proc.pid))
+
+        if memory_limit and peak_rss > memory_limit:
+            killed = 'MEMORY_LIMIT'
+        elif time.time() - start_time > timeout + TIMEOUT_MARGIN:
+            killed = 'TIMEOUT'
+
+        if killed:
+            usage = _terminate(proc)
+            break
+
+        time.sleep(POLL_INTERVAL)
+
+    for reader in readers:
+        reader.join()
+    proc.stdout.close()
+    proc.stderr.close()
+
+    run['time'] = time.time() - start_time
+    run['output'] = streams.get('stdout', '')
+    run['message'] = streams.get('stderr', '')
+
+    if usage is not None:
+        run['user_time'] = usage.ru_utime
+        run['sys_time'] = usage.ru_stime
+        # ru_maxrss está en KB en Linux y en bytes en macOS
+        maxrss = usage.ru_maxrss if sys.platform == 'darwin' else usage.ru_maxrss * 1024
+        run['peak_rss'] = max(maxrss, peak_rss)
+
+    if killed == 'MEMORY_LIMIT':
+        run['status'] = 'MEMORY_LIMIT'
+        run['message'] = f"El solver superó el límite de memoria ({memory_limit_mb} MB) y fue detenido"
+    elif killed == 'TIMEOUT':
+        run['status'] = 'TIMEOUT'
+        run['message'] = "TIMEOUT"
+    elif proc.returncode == 0:
+        run['status'] = 'OK'
+        run['success'] = True
+    else:
+        run['status'] = 'ERROR'
+
+    return run
+
+
+def strategy_model(model_file: Path, search: str,
+                   warm_start: Optional[Sequence[int]] = None) -> Optional[Path]:
+    """
+    Escribe una copia temporal del modelo con la estrategia de búsqueda.
+
+    Args:
+        model_file: Modelo base (con "solve minimize polarization;")
+        search: Nombre de la estrategia (clave de SEARCH_STRATEGIES)
+        warm_start: Valores iniciales de search_moves (opcional); se agregan
+                    como anotación warm_start al solve item. Los solvers que
+                    no la admiten la ignoran
+
+    Returns:
+        Ruta del modelo temporal, o None con 'default' y sin warm_start (se
+        usa el modelo base)
+
+    Raises:
+        ValueError: Si la estrategia no existe o el modelo no tiene el solve item
+    """
+    if search not in SEARCH_STRATEGIES:
+        raise ValueError(f"Estrategia de búsqueda desconocida: {search} "
+                         f"(opciones: {', '.join(SEARCH_STRATEGIES)})")
+    if SEARCH_STRATEGIES[search] is None and warm_start is None:
+        return None
+
+    text = Path(model_file).read_text(encoding='utf-8')
+    if len(SOLVE_ITEM.findall(text)) != 1:
+        raise ValueError(f"{Path(model_file).name} no tiene un único 'solve minimize polarization;'")
+    if SEARCH_STRATEGIES[search] is not None:
+        solve_item = SEARCH_STRATEGIES[search].read_text(encoding='utf-8')
+        text = SOLVE_ITEM.sub(lambda _: solve_item, text)
+    if warm_start is not None:
+        annotation = f"solve :: warm_start(search_moves, [{', '.join(map(str, warm_start))}])"
+        text = SOLVE_KEYWORD.sub(lambda _: annotation, text, count=1)
+
+    fd, path = tempfile.mkstemp(suffix='.mzn', prefix=f'modelo_{search}_')
+    with os.fdopen(fd, 'w', encoding='utf-8') as f:
+        f.write(text)
+    return Path(path)
+
+
+def trace_statistics(statistics: Dict, parent=None):
+    """
+    Registra como tramos los tiempos que informa MiniZinc con --statistics.
+
+    Args:
+        statistics: Estadísticas de parse_minizinc_output
+        parent: Tramo de la ejecución de MiniZinc
+    """
+    for name, key in (('flatten', 'flatTime'), ('search', 'solveTime')):
+        if isinstance(statistics.get(key), float):
+            record_span(name, statistics[key], parent)
+
+
+def movements_from_parsed(parsed: Dict, m: int,
+                          bounds: Optional[Sequence[Tuple[int, int, int, int]]] = None
+                          ) -> Dict[int, List[List[int]]]:
+    """
+    Convierte las claves movements_k1..k3 de parse_minizinc_output al
+    formato {nivel: matriz} que usan read_output_file y evaluate_plan.
+
+    La variante reducida entrega en 'moves' un valor por movimiento
+    alcanzable, en el orden de movement_bounds.
+
+    Args:
+        parsed: Resultado de parse_minizinc_output
+        m: Número de opiniones
+        bounds: Movimientos alcanzables (movement_bounds), si la salida es dispersa
+
+    Returns:
+        Diccionario {nivel (1..3): matriz m x m}
+    """
+    if bounds is not None and 'moves' in parsed:
+        movements = {k: [[0] * m for _ in range(m)] for k in range(1, 4)}
+        for (k, i, j, _), value in zip(bounds, parsed['moves']):
+            movements[k][i][j] = value
+        return movements
+
+    movements = {}
+    for k in range(1, 4):
+        matrix = parsed.get(f'movements_k{k}')
+        if not matrix or len(matrix) != m:
+            matrix = [[0] * m for _ in range(m)]
+        movements[k] = matrix
+    return movements
+
+
+def bound_expression(upper_bound: float, scaled: bool) -> str:
+    """
+    Expresa una cota superior de la polarización en las unidades del modelo.
+
+    Args:
+        upper_bound: Cota en unidades reales
+        scaled: Si el modelo usa la polarización escalada a enteros
+
+    Returns:
+        Lado derecho de la restricción "polarization <= ..."
+    """
+    # Pequeña holgura: el incumbente que define la cota sigue siendo factible
+    if scaled:
+        return str(math.floor(upper_bound * VALUE_SCALE + 1e-6))
+    return str(upper_bound + 1e-6)
+
+
+def lower_bound_expression(lower_bound: float, scaled: bool) -> str:
+    """
+    Expresa una cota inferior de la polarización en las unidades del modelo.
+
+    Args:
+        lower_bound: Cota en unidades reales
+        scaled: Si el modelo usa la polarización escalada a enteros
+
+    Returns:
+        Lado derecho de la restricción "polarization >= ..."
+    """
+    # Misma holgura que bound_expression, hacia abajo
+    if scaled:
+        return str(math.ceil(lower_bound * VALUE_SCALE - 1e-6))
+    return str(lower_bound - 1e-6)
+
+
+def warm_start_values(params: Dict, movements: Mapping[int, Sequence[Sequence[int]]],
+                      reduced: bool) -> List[int]:
+    """
+    Ordena un plan como el arreglo search_moves del modelo.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        movements: Plan {nivel: matriz m x m}
+        reduced: Si el modelo solo declara los movimientos alcanzables
+
+    Returns:
+        Valores de search_moves
+    """
+    if reduced:
+        return [movements[k][i][j] for k, i, j, _ in movement_bounds(params)]
+    m = params['m']
+    return [movements[k][i][j] for k in range(1, 4) for i in range(m) for j in range(m)]
+
+
+def solve_params(params: Dict, model: str = 'default', timeout: int = 300,
+                 solver: str = DEFAULT_SOLVER, upper_bound: Optional[float] = None,
+                 memory_limit_mb: Optional[int] = None, search: str = 'default',
+                 extra_model: Optional[str] = None, lower_bound: Optional[float] = None,
+                 warm_start: Optional[Mapping[int, Sequence[Sequence[int]]]] = None) -> Dict:
+    """
+    Resuelve una instancia parseada con MiniZinc.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        model: Variante del modelo (clave de MODEL_VARIANTS)
+        timeout: Tiempo máximo de ejecución en segundos
+        solver: Solver de MiniZinc a usar
+        upper_bound: Cota superior conocida de la polarización (opcional);
+                     se agrega como restricción para podar la búsqueda
+        memory_limit_mb: Límite de memoria del solver en MB (opcional)
+        search: Estrategia de búsqueda (clave de SEARCH_STRATEGIES)
+        extra_model: Texto MiniZinc que se agrega al modelo (opcional), por
+                     ejemplo restricciones que fijan parte de x
+        lower_bound: Cota inferior conocida de la polarización (opcional);
+                     la búsqueda termina en cuanto una solución la alcanza
+        warm_start: Plan {nivel: matriz} desde el que arranca la búsqueda
+                    (opcional; se ignora con la variante 'flujo', cuyas
+                    variables son flujos)
+
+    Returns:
+        Diccionario con 'status', 'polarization', 'movements',
+        'final_distribution', 'time', 'user_time', 'sys_time',
+        'peak_rss' y 'message'
+
+    Raises:
+        ValueError: Si la estrategia de búsqueda no existe
+    """
+    result = {
+        'status': 'ERROR',
+        'polarization': None,
+        'movements': None,
+        'final_distribution': None,
+        'time': 0.0,
+        'user_time': None,
+        'sys_time': None,
+        'peak_rss': None,
+        'message': ''
+    }
+
+    variant = MODEL_VARIANTS[model]
+    start_values = None
+    if warm_start is not None and variant['moves']:
+        start_values = warm_start_values(params, warm_start, variant['reduced'])
+    mzn_path = strategy_model(variant['file'], search, start_values)
+    fd, dzn_path = tempfile.mkstemp(suffix='.dzn', prefix='polarizacion_')
+    os.close(fd)
+    extra_files = []
+
+    try:
+        with span('dzn'):
+            generate_dzn_file(params, dzn_path, variant['scaled'], variant['reduced'])
+
+        if upper_bound is not None or lower_bound is not None:
+            fd, bound_path = tempfile.mkstemp(suffix='.mzn', prefix='cota_')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                if upper_bound is not None:
+                    f.write(f"constraint polarization <= {bound_expression(upper_bound, variant['scaled'])};\n")
+                if lower_bound is not None:
+                    f.write("constraint polarization >= "
+                            f"{lower_bound_expression(lower_bound, variant['scaled'])};\n")
+            extra_files.append(Path(bound_path))
+
+        if extra_model:
+            fd, extra_path = tempfile.mkstemp(suffix='.mzn', prefix='extra_')
+            with os.fdopen(fd, 'w', encoding='utf-8') as f:
+                f.write(extra_model)
+            extra_files.append(Path(extra_path))
+
+        with span('minizinc', model=model, solver=solver, search=search) as current:
+            run = run_minizinc(mzn_path or variant['file'], Path(dzn_path), timeout, solver,
+                               extra_files, memory_limit_mb=memory_limit_mb)
+            current.set(status=run['status'])
+        result['time'] = run['time']
+        result['user_time'] = run['user_time']
+        result['sys_time'] = run['sys_time']
+        result['peak_rss'] = run['peak_rss']
+        result['message'] = run['message']
+
+        # Una sola pasada: estado, estadísticas y la última (mejor) solución
+        try:
+            with span('parse_output', output_bytes=len(run['output'])):
+                parsed = parse_minizinc_output(run['output'], require_solution=False,
+                                               value_scale=VALUE_SCALE if variant['scaled'] else None)
+        except ValueError as e:
+            result['message'] = f"{e}\n{run['message']}".strip()
+            return result
+        trace_statistics(parsed['statistics'], current)
+
+        if run['success']:
+            result['status'] = parsed['status']
+        elif parsed['solutions']:
+            # Detenido por tiempo o memoria, pero con una solución ya impresa
+            result['status'] = 'SATISFIED'
+        else:
+            result['status'] = run['status'] if run['status'] != 'OK' else 'ERROR'
+            return result
+
+        if result['status'] in ('OPTIMAL', 'SATISFIED') and 'polarization' in parsed:
+            result['polarization'] = parsed['polarization']
+            result['final_distribution'] = parsed.get('final_distribution')
+            bounds = movement_bounds(params) if variant['reduced'] else None
+            result['movements'] = movements_from_parsed(parsed, params['m'], bounds)
+
+        return result
+
+    finally:
+        for path in [Path(dzn_path)] + extra_files + ([mzn_path] if mzn_path else []):
+            try:
+                path.unlink()
+            except OSError:
+                pass
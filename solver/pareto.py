@@ -0,0 +1,308 @@
+"""
+Módulo para calcular la frontera polarización vs. presupuesto (ct, maxMovs).
+
+Resuelve una misma instancia para muchos presupuestos aprovechando la
+monotonía del problema:
+
+- Un plan factible con presupuesto b sigue siendo factible con cualquier
+  presupuesto mayor, así que su polarización es cota superior allí.
+- El óptimo con presupuesto b es cota inferior del óptimo con cualquier
+  presupuesto menor; si además el plan cabe en ese presupuesto menor, es
+  óptimo también allí y no hace falta resolverlo.
+
+Los puntos que siguen abiertos se resuelven en paralelo por oleadas,
+pasando al solver la mejor cota superior conocida.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import csv
+from concurrent.futures import ProcessPoolExecutor
+from itertools import product
+from typing import Callable, Dict, Iterable, List, Sequence, Tuple
+
+from .evaluation import evaluate_plan
+from .minizinc import solve_params
+
+
+# Tolerancia para comparar polarizaciones
+POL_EPSILON = 1e-6
+
+FRONTIER_COLUMNS = ['ct', 'maxMovs', 'polarization', 'lower_bound', 'status',
+                    'source', 'cost', 'moves', 'efficient']
+
+
+def budget_grid(ct_values: Iterable[float], maxmovs_values: Iterable[float]) -> List[Tuple[float, float]]:
+    """
+    Genera la malla de presupuestos (ct, maxMovs) como producto cartesiano.
+
+    Args:
+        ct_values: Valores de costo máximo
+        maxmovs_values: Valores de movimientos máximos
+
+    Returns:
+        Lista de presupuestos (ct, maxMovs)
+    """
+    return [(float(ct), float(mv)) for ct, mv in product(ct_values, maxmovs_values)]
+
+
+def budget_ray(ct_max: float, maxmovs_max: float, points: int) -> List[Tuple[float, float]]:
+    """
+    Genera presupuestos sobre el rayo que escala (ct_max, maxmovs_max) desde 0.
+
+    Args:
+        ct_max: Costo máximo en el extremo del rayo
+        maxmovs_max: Movimientos máximos en el extremo del rayo
+        points: Número de puntos (incluye ambos extremos)
+
+    Returns:
+        Lista de presupuestos (ct, maxMovs) crecientes
+    """
+    if points < 2:
+        return [(float(ct_max), float(maxmovs_max))]
+
+    return [(ct_max * t / (points - 1), maxmovs_max * t / (points - 1)) for t in range(points)]
+
+
+def _covers(budget: Tuple[float, float], other: Tuple[float, float]) -> bool:
+    """True si budget es al menos tan holgado como other en ambas componentes."""
+    return budget[0] >= other[0] and budget[1] >= other[1]
+
+
+def _new_point(budget: Tuple[float, float], zero_plan: Dict) -> Dict:
+    """Crea un punto abierto cuya única solución conocida es no mover a nadie."""
+    return {
+        'ct': budget[0],
+        'maxMovs': budget[1],
+        'polarization': zero_plan['polarization'],
+        'lower_bound': 0.0,
+        'status': None,
+        'source': 'inferred',
+        'cost': 0.0,
+        'moves': 0,
+        'movements': zero_plan['movements']
+    }
+
+
+def _set_incumbent(point: Dict, polarization: float, cost: float, moves: int, movements: Dict):
+    """Actualiza la mejor solución conocida de un punto si la mejora."""
+    if polarization < point['polarization'] - POL_EPSILON:
+        point['polarization'] = polarization
+        point['cost'] = cost
+        point['moves'] = moves
+        point['movements'] = movements
+
+
+def _propagate(points: List[Dict], source: Dict, proven: bool):
+    """
+    Propaga la solución de un punto resuelto a los puntos abiertos.
+
+    Args:
+        points: Todos los puntos del barrido
+        source: Punto recién resuelto
+        proven: True si la polarización de source es óptima (cota inferior válida)
+    """
+    source_budget = (source['ct'], source['maxMovs'])
+    used = (source['cost'], source['moves'])
+
+    for point in points:
+        if point['status'] is not None:
+            continue
+
+        budget = (point['ct'], point['maxMovs'])
+
+        # El plan cabe en este presupuesto: cota superior
+        if _covers(budget, used):
+            _set_incumbent(point, source['polarization'], source['cost'],
+                           source['moves'], source['movements'])
+
+        # Presupuesto menor o igual que el de un óptimo: cota inferior
+        if proven and _covers(source_budget, budget):
+            point['lower_bound'] = max(point['lower_bound'], source['polarization'])
+
+        _close_if_tight(point)
+
+
+def _close_if_tight(point: Dict):
+    """Cierra un punto abierto cuyas cotas superior e inferior coinciden."""
+    if point['status'] is None and point['polarization'] <= point['lower_bound'] + POL_EPSILON:
+        point['status'] = 'OPTIMAL'
+        point['source'] = 'inferred'
+
+
+def _pick_wave(points: List[Dict], size: int) -> List[Dict]:
+    """
+    Elige hasta size puntos abiertos, repartidos a lo largo del barrido y
+    empezando siempre por el de mayor presupuesto (su óptimo acota a todos).
+    """
+    open_points = sorted((p for p in points if p['status'] is None),
+                         key=lambda p: (p['ct'], p['maxMovs']))
+    if not open_points:
+        return []
+
+    last = len(open_points) - 1
+    indices = sorted({last - round(i * last / size) for i in range(size)}, reverse=True)
+    return [open_points[i] for i in indices]
+
+
+def _solve_point(task: Tuple[Callable, Dict, float, Dict]) -> Dict:
+    """Adaptador para ProcessPoolExecutor.map (un solo argumento)."""
+    solve, params, upper_bound, solve_kwargs = task
+    return solve(params, upper_bound=upper_bound, **solve_kwargs)
+
+
+def _apply_solution(point: Dict, params: Dict, solution: Dict) -> bool:
+    """
+    Registra en un punto la solución devuelta por el solver.
+
+    Returns:
+        True si la polarización del punto quedó demostrada como óptima
+    """
+    status = solution['status']
+
+    if status in ('OPTIMAL', 'SATISFIED') and solution['movements'] is not None:
+        evaluation = evaluate_plan(params, solution['movements'])
+        if not evaluation['violations']:
+            _set_incumbent(point, evaluation['polarization'], evaluation['cost'],
+                           evaluation['moves'], solution['movements'])
+
+    point['source'] = 'solver'
+
+    # Con la cota superior impuesta, "insatisfactible" significa que el
+    # incumbente ya era óptimo
+    if status in ('OPTIMAL', 'UNSATISFIABLE'):
+        point['status'] = 'OPTIMAL'
+        point['lower_bound'] = point['polarization']
+        return True
+
+    point['status'] = 'SATISFIED' if status == 'SATISFIED' else status
+    return False
+
+
+def _refinement_budgets(points: List[Dict], resolution: float) -> List[Tuple[float, float]]:
+    """
+    Propone puntos intermedios entre presupuestos consecutivos (uno
+    dominando al otro) cuya polarización difiere, para localizar los
+    escalones de la frontera.
+    """
+    ordered = sorted(points, key=lambda p: (p['ct'], p['maxMovs']))
+    existing = {(p['ct'], p['maxMovs']) for p in points}
+    budgets = []
+
+    for low, high in zip(ordered, ordered[1:]):
+        if not _covers((high['ct'], high['maxMovs']), (low['ct'], low['maxMovs'])):
+            continue
+        if low['polarization'] - high['polarization'] <= POL_EPSILON:
+            continue
+        if high['ct'] - low['ct'] <= resolution and high['maxMovs'] - low['maxMovs'] <= 1:
+            continue
+
+        middle = ((low['ct'] + high['ct']) / 2, (low['maxMovs'] + high['maxMovs']) / 2)
+        if middle not in existing:
+            budgets.append(middle)
+            existing.add(middle)
+
+    return budgets
+
+
+def pareto_sweep(params: Dict, budgets: Sequence[Tuple[float, float]],
+                 solve: Callable = solve_params, workers: int = 1,
+                 refine: bool = False, resolution: float = 0.5,
+                 max_points: int = 200, **solve_kwargs) -> List[Dict]:
+    """
+    Calcula la mejor polarización para cada presupuesto (ct, maxMovs).
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        budgets: Presupuestos (ct, maxMovs) a evaluar
+        solve: Función solve(params, upper_bound=..., **solve_kwargs) que
+               devuelve una solución como solve_params (por defecto MiniZinc).
+               Debe ser una función de módulo si workers > 1
+        workers: Número de puntos que se resuelven en paralelo
+        refine: Si es True, agrega puntos intermedios donde la polarización
+                cambia hasta la resolución dada (útil en barridos 1-D,
+                como los de budget_ray)
+        resolution: Resolución del refinamiento en unidades de costo
+        max_points: Máximo de puntos totales al refinar
+        **solve_kwargs: Argumentos adicionales para solve (timeout, ...)
+
+    Returns:
+        Lista de puntos ordenados por presupuesto, cada uno con 'ct',
+        'maxMovs', 'polarization', 'lower_bound', 'status', 'source'
+        ('solver' o 'inferred'), 'cost', 'moves', 'movements' y
+        'efficient' (si ningún presupuesto menor logra lo mismo)
+    """
+    zero_plan = {
+        'movements': {k: [[0] * params['m'] for _ in range(params['m'])] for k in range(1, 4)}
+    }
+    zero_plan['polarization'] = evaluate_plan(params, zero_plan['movements'])['polarization']
+
+    points = [_new_point(budget, zero_plan) for budget in dict.fromkeys(budgets)]
+    executor = ProcessPoolExecutor(max_workers=workers) if workers > 1 else None
+
+    try:
+        while True:
+            # Puntos triviales: polarización 0 ya es óptima
+            for point in points:
+                _close_if_tight(point)
+
+            wave = _pick_wave(points, workers)
+
+            if not wave:
+                if not refine or len(points) >= max_points:
+                    break
+                new_budgets = _refinement_budgets(points, resolution)[:max_points - len(points)]
+                if not new_budgets:
+                    break
+                for budget in new_budgets:
+                    point = _new_point(budget, zero_plan)
+                    points.append(point)
+                    # Reaplicar lo ya resuelto sobre los puntos nuevos
+                    for solved in points:
+                        if solved['status'] is not None and solved['movements'] is not None:
+                            _propagate([point], solved, solved['status'] == 'OPTIMAL')
+                continue
+
+            tasks = [
+                (solve, dict(params, ct=p['ct'], maxMovs=p['maxMovs']), p['polarization'], solve_kwargs)
+                for p in wave
+            ]
+            solutions = executor.map(_solve_point, tasks) if executor else map(_solve_point, tasks)
+
+            for point, task, solution in zip(wave, tasks, solutions):
+                proven = _apply_solution(point, task[1], solution)
+                _propagate(points, point, proven)
+    finally:
+        if executor:
+            executor.shutdown()
+
+    points.sort(key=lambda p: (p['ct'], p['maxMovs']))
+    for point in points:
+        point['efficient'] = not any(
+            other is not point
+            and _covers((point['ct'], point['maxMovs']), (other['ct'], other['maxMovs']))
+            and other['polarization'] <= point['polarization'] + POL_EPSILON
+            for other in points
+        )
+
+    return points
+
+
+def write_frontier_csv(frontier: List[Dict], output_path: str):
+    """
+    Exporta la frontera como tabla CSV.
+
+    Args:
+        frontier: Resultado de pareto_sweep
+        output_path: Ruta del archivo .csv
+    """
+    with open(output_path, 'w', encoding='utf-8', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=FRONTIER_COLUMNS, extrasaction='ignore')
+        writer.writeheader()
+        for point in frontier:
+            row = dict(point)
+            row['polarization'] = f"{point['polarization']:.3f}"
+            row['lower_bound'] = f"{point['lower_bound']:.3f}"
+            row['cost'] = f"{point['cost']:.1f}"
+            writer.writerow(row)
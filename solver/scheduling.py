@@ -0,0 +1,345 @@
+"""
+Módulo para asignar límites de tiempo adaptativos a cada instancia.
+
+En lugar de dar a todas las instancias el mismo límite de cinco minutos,
+se estima el tiempo de resolución a partir de características de la
+instancia (tamaño, holgura del presupuesto, mezcla de resistencias) y del
+historial de ejecuciones anteriores, y se fija un límite proporcional.
+
+En lotes, las instancias se ordenan de la más corta a la más larga y el
+tiempo que sobra de las primeras se reparte entre las siguientes.
+
+Los límites solo se acortan por debajo de DEFAULT_TIMEOUT cuando hay
+historial de instancias parecidas: sin él, la estimación por tamaño solo
+sirve para ordenar y para elegir motor, y el límite se queda en los cinco
+minutos de siempre (o más, si la estimación lo pide).
+
+Un límite corto no hace fallar a MiniZinc: al vencer entrega la mejor
+solución encontrada (estado SATISFIED) y la ejecución queda registrada
+como incompleta, lo que aumenta la estimación de instancias parecidas.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import json
+import math
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Sequence, Tuple, Union
+
+from .evaluation import RESISTANCE_FACTORS
+from .milp import reachable_moves
+
+
+ROOT_DIR = Path(__file__).parent.parent
+HISTORY_FILE = ROOT_DIR / 'temp' / 'historial_tiempos.jsonl'
+
+# Coeficientes medidos de las estimaciones sin historial (los escribe
+# scripts/calibrate_priors.py, junto con las muestras usadas)
+PRIORS_FILE = Path(__file__).parent / 'tiempos_base.json'
+
+DEFAULT_TIMEOUT = 300
+MIN_TIME_LIMIT = 10
+MAX_TIME_LIMIT = 1200
+
+# Margen sobre el tiempo estimado: mayor cuando no hay historial
+PRIOR_SAFETY = 10.0
+HISTORY_SAFETY = 3.0
+
+# Vecinos del historial usados en la estimación
+NEIGHBOURS = 5
+
+# Distancia de características (ver _distance) hasta la que una ejecución
+# del historial cuenta como instancia parecida para acortar el límite
+SIMILAR_DISTANCE = 1.0
+
+# Una ejecución que agotó su límite tardaría al menos esto más
+CENSORED_FACTOR = 2.0
+
+
+def instance_features(params: Dict) -> Dict[str, float]:
+    """
+    Calcula las características de una instancia usadas para estimar tiempos.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+
+    Returns:
+        Diccionario con 'n', 'm', 'moves' (variables alcanzables),
+        'ct_ratio' y 'movs_ratio' (presupuesto relativo a mover a todos
+        una posición) y 'high_ratio', 'medium_ratio' (mezcla de resistencias)
+    """
+    n = max(params['n'], 1)
+    totals = [sum(row[k] for row in params['s']) for k in range(3)]
+    unit_cost = sum(count * factor for count, factor in zip(totals, RESISTANCE_FACTORS))
+
+    return {
+        'n': float(params['n']),
+        'm': float(params['m']),
+        'moves': float(len(reachable_moves(params))),
+        'ct_ratio': min(params['ct'] / unit_cost, 1.0) if unit_cost else 0.0,
+        'movs_ratio': min(params['maxMovs'] / n, 1.0),
+        'high_ratio': totals[2] / n,
+        'medium_ratio': totals[1] / n
+    }
+
+
+# Término de tamaño de cada motor: MiniZinc crece con las variables
+# alcanzables y con el logaritmo del número de personas; el MILP resuelve
+# un programa por cada mediana (el de flujos, con O(m) variables en cada
+# uno); la heurística es O(m² log m) en Python
+PRIOR_TERMS: Dict[str, Callable[[Dict[str, float]], float]] = {
+    'minizinc': lambda f: f['moves'] * math.log2(f['n'] + 2),
+    'milp': lambda f: f['moves'] * f['m'],
+    'flujo': lambda f: f['m'] ** 2,
+    'heuristica': lambda f: f['m'] ** 2 * math.log2(f['m'] + 2),
+}
+
+# Coeficientes (intercepto, pendiente) para motores sin calibración
+# medida: solo dan el orden de magnitud
+FALLBACK_PRIORS = {
+    'minizinc': (0.5, 0.002),
+    'milp': (0.01, 5e-6),
+    'flujo': (0.01, 3e-5),
+    'heuristica': (0.001, 2e-6),
+}
+
+
+def _load_priors(path: Path = PRIORS_FILE) -> Dict[str, Tuple[float, float]]:
+    """
+    Lee los coeficientes medidos de PRIORS_FILE.
+
+    Returns:
+        Diccionario {motor: (intercepto, pendiente)}; los motores sin
+        calibración usan FALLBACK_PRIORS
+    """
+    priors = dict(FALLBACK_PRIORS)
+    try:
+        calibration = json.loads(Path(path).read_text(encoding='utf-8'))
+        for engine, fitted in calibration.get('engines', {}).items():
+            priors[engine] = (float(fitted['intercept']), float(fitted['slope']))
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return priors
+
+
+PRIORS = _load_priors()
+
+
+def _prior_runtime(features: Dict[str, float], engine: str = 'minizinc') -> float:
+    """
+    Estimación del tiempo sin historial: intercepto + pendiente * término.
+
+    El término depende del motor (PRIOR_TERMS). Los coeficientes se ajustan
+    con scripts/calibrate_priors.py: mide cada motor en las pruebas de
+    tests/ y en instancias aleatorias de tamaño creciente (o toma un
+    historial registrado) y ajusta por mínimos cuadrados sobre el error
+    relativo. El resultado y las muestras quedan en PRIORS_FILE. Los
+    motores que no estaban disponibles al calibrar (por ejemplo MiniZinc
+    sin instalar) usan FALLBACK_PRIORS. Los motores sin modelo propio (lns)
+    usan el de MiniZinc.
+    """
+    if engine not in PRIOR_TERMS:
+        engine = 'minizinc'
+    intercept, slope = PRIORS[engine]
+    return intercept + slope * PRIOR_TERMS[engine](features)
+
+
+def _distance(a: Dict[str, float], b: Dict[str, float]) -> float:
+    """Distancia entre características (tamaños en escala logarítmica)."""
+    total = 0.0
+    for key in ('n', 'm', 'moves'):
+        total += (math.log1p(a[key]) - math.log1p(b.get(key, 0.0))) ** 2
+    for key in ('ct_ratio', 'movs_ratio', 'high_ratio', 'medium_ratio'):
+        total += (a[key] - b.get(key, 0.0)) ** 2
+    return math.sqrt(total)
+
+
+def load_history(path: Optional[Path] = None) -> List[Dict]:
+    """
+    Carga el historial de ejecuciones.
+
+    Las líneas corruptas se ignoran; si el archivo no existe, el historial
+    está vacío.
+
+    Args:
+        path: Archivo .jsonl del historial (por defecto HISTORY_FILE)
+
+    Returns:
+        Lista de registros con 'features', 'time' y 'complete'
+    """
+    path = Path(path) if path else HISTORY_FILE
+    history = []
+
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                if isinstance(record, dict) and 'features' in record and 'time' in record:
+                    history.append(record)
+    except FileNotFoundError:
+        pass
+
+    return history
+
+
+def record_runtime(params: Dict, elapsed: float, complete: bool, time_limit: Optional[float] = None,
+                   name: str = '', engine: str = 'minizinc', path: Optional[Path] = None) -> Dict:
+    """
+    Agrega una ejecución al historial.
+
+    Args:
+        params: Parámetros de la instancia resuelta
+        elapsed: Tiempo de resolución en segundos
+        complete: True si el solver terminó (óptimo demostrado o
+                  insatisfactible); False si agotó el límite
+        time_limit: Límite de tiempo usado (opcional)
+        name: Nombre de la instancia (informativo)
+        engine: Motor usado
+        path: Archivo .jsonl del historial (por defecto HISTORY_FILE)
+
+    Returns:
+        El registro agregado. Si el historial no se puede escribir (por
+        ejemplo, en una instalación de solo lectura) el registro se
+        devuelve igual, sin guardarse: el historial es solo una ayuda
+    """
+    path = Path(path) if path else HISTORY_FILE
+    record = {
+        'instance': name,
+        'engine': engine,
+        'features': instance_features(params),
+        'time': round(elapsed, 4),
+        'complete': bool(complete),
+        'time_limit': time_limit,
+        'timestamp': time.time()
+    }
+
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with open(path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(record) + '\n')
+    except OSError:
+        pass
+
+    return record
+
+
+def predict_runtime(params: Dict, history: Sequence[Dict] = (), engine: str = 'minizinc') -> Dict:
+    """
+    Estima el tiempo de resolución de una instancia.
+
+    Sin historial usa una estimación por tamaño. Con historial toma las
+    ejecuciones más parecidas del mismo motor, escala cada tiempo por la
+    razón de tamaños y se queda con el mayor (estimación conservadora).
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        history: Registros de load_history
+        engine: Motor cuyo historial se usa
+
+    Returns:
+        Diccionario con 'seconds', 'source' ('prior' o 'history'),
+        'neighbours' (ejecuciones usadas) y 'distance' (distancia a la
+        ejecución más parecida; None sin historial)
+    """
+    features = instance_features(params)
+    prior = _prior_runtime(features, engine)
+    records = [r for r in history if r.get('engine', 'minizinc') == engine]
+
+    if not records:
+        return {'seconds': prior, 'source': 'prior', 'neighbours': 0, 'distance': None}
+
+    nearest = sorted(records, key=lambda r: _distance(features, r['features']))[:NEIGHBOURS]
+    estimates = []
+    for record in nearest:
+        record_features = dict(features, **record['features'])
+        seconds = record['time'] * prior / _prior_runtime(record_features, engine)
+        if not record.get('complete', True):
+            seconds *= CENSORED_FACTOR
+        estimates.append(seconds)
+
+    return {'seconds': max(estimates), 'source': 'history', 'neighbours': len(nearest),
+            'distance': _distance(features, nearest[0]['features'])}
+
+
+def time_limit(params: Dict, history: Sequence[Dict] = (), engine: str = 'minizinc') -> Tuple[int, Dict]:
+    """
+    Calcula el límite de tiempo de una instancia.
+
+    Con historial de instancias parecidas (a distancia SIMILAR_DISTANCE o
+    menos) el límite es el tiempo estimado por HISTORY_SAFETY. Sin él, el
+    límite nunca baja de DEFAULT_TIMEOUT: la estimación por tamaño no es
+    lo bastante confiable para cortar una búsqueda antes de tiempo.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        history: Registros de load_history
+        engine: Motor cuyo historial se usa
+
+    Returns:
+        Tupla (límite en segundos, estimación de predict_runtime)
+    """
+    prediction = predict_runtime(params, history, engine)
+    similar = prediction['source'] == 'history' and prediction['distance'] <= SIMILAR_DISTANCE
+    if similar:
+        limit = max(math.ceil(prediction['seconds'] * HISTORY_SAFETY), MIN_TIME_LIMIT)
+    else:
+        limit = max(math.ceil(prediction['seconds'] * PRIOR_SAFETY), DEFAULT_TIMEOUT)
+    return min(limit, MAX_TIME_LIMIT), prediction
+
+
+def schedule_batch(instances: Iterable[Tuple[object, Dict]], history: Sequence[Dict] = (),
+                   engine: Union[str, Callable[[Dict], str]] = 'minizinc') -> List[Dict]:
+    """
+    Ordena un lote de instancias de la más corta a la más larga.
+
+    Args:
+        instances: Pares (clave, params)
+        history: Registros de load_history
+        engine: Motor cuyo historial se usa, o función params -> motor
+                para lotes que mezclan motores
+
+    Returns:
+        Lista de diccionarios con 'key', 'params', 'engine', 'time_limit'
+        y 'prediction', ordenada por tiempo estimado
+    """
+    plan = []
+    for key, params in instances:
+        instance_engine = engine(params) if callable(engine) else engine
+        limit, prediction = time_limit(params, history, instance_engine)
+        plan.append({'key': key, 'params': params, 'engine': instance_engine,
+                     'time_limit': limit, 'prediction': prediction})
+
+    plan.sort(key=lambda item: item['prediction']['seconds'])
+    return plan
+
+
+def grant_time(base_limit: float, pending_limits: float, budget_left: Optional[float]) -> int:
+    """
+    Ajusta el límite de la siguiente instancia de un lote al presupuesto.
+
+    La instancia recibe del presupuesto restante la misma proporción que
+    su límite base representa entre las pendientes: si las anteriores
+    terminaron antes de lo previsto, el sobrante se reparte y las
+    instancias difíciles (al final del orden) reciben más tiempo; si el
+    lote va atrasado, los límites se reducen.
+
+    Args:
+        base_limit: Límite estimado de la instancia
+        pending_limits: Suma de los límites estimados de las instancias
+                        que faltan después de esta
+        budget_left: Segundos que quedan del presupuesto del lote
+                     (None: sin presupuesto, se usa el límite base)
+
+    Returns:
+        Límite de tiempo en segundos
+    """
+    if budget_left is None:
+        return int(base_limit)
+
+    share = budget_left * base_limit / (base_limit + pending_limits)
+    return int(min(max(share, MIN_TIME_LIMIT), MAX_TIME_LIMIT))
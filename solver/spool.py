@@ -0,0 +1,506 @@
+"""
+Procesamiento de lotes en varios equipos mediante un directorio compartido.
+
+Los productores dejan archivos de entrada en inbox/ y los trabajadores, en
+cualquier equipo que vea el mismo sistema de archivos, los reclaman,
+resuelven y publican el resultado en outbox/. No hay un intermediario:
+la coordinación se hace solo con operaciones atómicas del sistema de
+archivos (rename y replace).
+
+Estructura del directorio:
+
+    inbox/    trabajos pendientes (.txt)
+    leases/   trabajos reclamados y su arriendo (<trabajo>.lease)
+    outbox/   resultados: <nombre>.json y <nombre>_salida.txt
+    done/     entradas ya resueltas
+    failed/   entradas ilegibles o cuyo trabajador murió demasiadas veces
+
+Un trabajador reclama un trabajo moviéndolo de inbox/ a leases/ (solo uno
+gana el rename) y escribe un arriendo con fecha de vencimiento, que
+renueva mientras resuelve. Si el trabajador muere, el arriendo vence y
+cualquier otro trabajador devuelve el trabajo a inbox/. Cada reclamo
+lleva un token propio: antes de renovar, publicar o liberar, el trabajador
+relee el arriendo y, si ya no es suyo (venció y otro lo re-encoló o
+reclamó), deja de renovarlo y descarta su resultado sin tocar outbox/ ni
+leases/. Como la relectura y la escritura no son una sola operación
+atómica, la entrega sigue siendo "al menos una vez": en la ventana entre
+ambas, el resultado puede escribirse dos veces.
+
+Los vencimientos se comparan con el reloj de cada equipo, por lo que
+LEASE_SECONDS debe ser mucho mayor que el desfase entre relojes (NTP).
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from input_output.input import parse_input_file
+from tracing import instance_attrs, span
+
+from .dispatch import solution_record
+from .symmetry import solve_symmetric
+
+
+SPOOL_DIRS = ('inbox', 'leases', 'outbox', 'done', 'failed')
+
+# Duración del arriendo; se renueva cada LEASE_SECONDS / 3 mientras se resuelve
+LEASE_SECONDS = 60
+
+# Trabajos reclamados sin arriendo (el trabajador murió justo después del
+# rename) se re-encolan tras este tiempo
+CLAIM_GRACE = 30
+
+# Intentos antes de mover un trabajo a failed/
+MAX_ATTEMPTS = 3
+
+
+def init_spool(spool: Path) -> Path:
+    """
+    Crea la estructura del directorio de trabajo si no existe.
+
+    Args:
+        spool: Directorio compartido
+
+    Returns:
+        El mismo directorio como Path
+    """
+    spool = Path(spool)
+    for name in SPOOL_DIRS:
+        (spool / name).mkdir(parents=True, exist_ok=True)
+    return spool
+
+
+def worker_id() -> str:
+    """Identificador del trabajador actual: equipo y proceso."""
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _atomic_write(path: Path, text: str):
+    """Escribe un archivo de forma atómica (temporal oculto + replace)."""
+    # El nombre del temporal es único entre equipos: el PID solo no basta
+    tmp = path.parent / f".{path.name}.{socket.gethostname()}.{os.getpid()}.{uuid.uuid4().hex}.tmp"
+    with open(tmp, 'w', encoding='utf-8') as f:
+        f.write(text)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp, path)
+
+
+def _attempts_file(spool: Path, job: str) -> Path:
+    """Archivo oculto con los intentos previos de un trabajo re-encolado."""
+    return spool / 'inbox' / f".{job}.attempts"
+
+
+def submit(spool: Path, inputs: Iterable[str]) -> List[str]:
+    """
+    Agrega archivos de entrada a inbox/.
+
+    Cada archivo se copia con un nombre temporal oculto y luego se renombra,
+    para que ningún trabajador lo vea a medio escribir. Si ya existe un
+    trabajo con el mismo nombre en cualquier etapa, o un resultado en
+    outbox/ con la misma raíz, se agrega un sufijo numérico (si no, el
+    resultado nuevo pisaría al anterior).
+
+    Args:
+        spool: Directorio compartido
+        inputs: Rutas de los archivos de entrada
+
+    Returns:
+        Nombres de los trabajos creados
+    """
+    spool = init_spool(spool)
+    jobs = []
+
+    for path in inputs:
+        path = Path(path)
+        name = path.name
+        counter = 1
+        while _name_taken(spool, name):
+            name = f"{path.stem}_{counter}{path.suffix}"
+            counter += 1
+        _atomic_write(spool / 'inbox' / name, path.read_text(encoding='utf-8'))
+        jobs.append(name)
+
+    return jobs
+
+
+def _name_taken(spool: Path, name: str) -> bool:
+    """True si el nombre ya está en uso por un trabajo o un resultado."""
+    if any((spool / d / name).exists() for d in ('inbox', 'leases', 'done', 'failed')):
+        return True
+    stem = Path(name).stem
+    return any((spool / 'outbox' / result).exists() for result in (f"{stem}.json", f"{stem}_salida.txt"))
+
+
+def _pending_jobs(spool: Path) -> List[str]:
+    """Trabajos de inbox/ en orden de llegada (los archivos ocultos se ignoran)."""
+    entries = []
+    for entry in os.scandir(spool / 'inbox'):
+        if entry.is_file() and not entry.name.startswith('.'):
+            try:
+                entries.append((entry.stat().st_mtime, entry.name))
+            except FileNotFoundError:
+                continue  # reclamado mientras se listaba
+    return [name for _, name in sorted(entries)]
+
+
+def _write_lease(spool: Path, job: str, owner: str, token: str, attempts: int, lease_seconds: float):
+    """Escribe o renueva el arriendo de un trabajo."""
+    lease = {
+        'worker': owner,
+        'token': token,
+        'host': socket.gethostname(),
+        'pid': os.getpid(),
+        'attempts': attempts,
+        'expires': time.time() + lease_seconds
+    }
+    _atomic_write(spool / 'leases' / f"{job}.lease", json.dumps(lease))
+
+
+def _owns_lease(spool: Path, job: str, owner: str, token: str) -> bool:
+    """
+    Relee el arriendo y verifica que siga siendo de este reclamo.
+
+    El trabajo también debe seguir en leases/: si fue re-encolado, otro
+    trabajador puede estar por reclamarlo aunque el arriendo viejo exista.
+    """
+    if not (spool / 'leases' / job).exists():
+        return False
+    try:
+        lease = json.loads((spool / 'leases' / f"{job}.lease").read_text(encoding='utf-8'))
+    except (OSError, ValueError):
+        return False
+    return lease.get('worker') == owner and lease.get('token') == token
+
+
+def claim_next(spool: Path, owner: Optional[str] = None,
+               lease_seconds: float = LEASE_SECONDS) -> Optional[Dict]:
+    """
+    Reclama el trabajo pendiente más antiguo.
+
+    Args:
+        spool: Directorio compartido
+        owner: Identificador del trabajador (por defecto worker_id())
+        lease_seconds: Duración del arriendo
+
+    Returns:
+        Diccionario con 'job', 'path', 'attempts' y 'token' (identifica este
+        reclamo en el arriendo), o None si no hay trabajos
+    """
+    spool = Path(spool)
+    owner = owner or worker_id()
+
+    for job in _pending_jobs(spool):
+        try:
+            os.rename(spool / 'inbox' / job, spool / 'leases' / job)
+        except FileNotFoundError:
+            continue  # otro trabajador ganó
+
+        attempts_path = _attempts_file(spool, job)
+        try:
+            attempts = int(attempts_path.read_text()) + 1
+            attempts_path.unlink()
+        except (FileNotFoundError, ValueError):
+            attempts = 1
+
+        token = uuid.uuid4().hex
+        _write_lease(spool, job, owner, token, attempts, lease_seconds)
+        return {'job': job, 'path': spool / 'leases' / job, 'attempts': attempts, 'token': token}
+
+    return None
+
+
+def _process_alive(pid: int) -> bool:
+    """True si el proceso existe en este equipo."""
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+
+def _lease_expired(lease: Dict, now: float) -> bool:
+    """Un arriendo vence por tiempo, o antes si su proceso local ya no existe."""
+    if lease['expires'] < now:
+        return True
+    return lease['host'] == socket.gethostname() and not _process_alive(lease['pid'])
+
+
+def _requeue_marker(spool: Path, job: str) -> Path:
+    """Arriendo vencido apartado mientras su trabajo se re-encola."""
+    return spool / 'leases' / f".{job}.requeue"
+
+
+def requeue_expired(spool: Path, max_attempts: int = MAX_ATTEMPTS) -> List[str]:
+    """
+    Devuelve a inbox/ los trabajos cuyo trabajador murió.
+
+    Los trabajos que ya agotaron max_attempts se mueven a failed/ con un
+    resultado de error en outbox/.
+
+    El arriendo vencido se aparta (rename a .<trabajo>.requeue) antes de
+    mover el trabajo: solo un trabajador gana ese rename, y el arriendo que
+    escriba quien reclame el trabajo después nunca se borra. Si el arriendo
+    apartado no es el que se leyó (el trabajo ya fue re-encolado y
+    reclamado de nuevo), se devuelve a su lugar.
+
+    Args:
+        spool: Directorio compartido
+        max_attempts: Intentos permitidos por trabajo
+
+    Returns:
+        Nombres de los trabajos re-encolados o descartados
+    """
+    spool = Path(spool)
+    leases_dir = spool / 'leases'
+    now = time.time()
+    requeued = []
+
+    for entry in os.scandir(leases_dir):
+        if entry.name.startswith('.') or entry.name.endswith('.lease'):
+            continue
+        job = entry.name
+        lease_path = leases_dir / f"{job}.lease"
+        marker = _requeue_marker(spool, job)
+
+        try:
+            lease = json.loads(lease_path.read_text(encoding='utf-8'))
+        except FileNotFoundError:
+            # Otro trabajador lo está re-encolando; si murió a mitad de camino,
+            # su marca conserva los intentos
+            try:
+                lease = json.loads(marker.read_text(encoding='utf-8'))
+                if now - marker.stat().st_mtime < CLAIM_GRACE:
+                    continue
+            except FileNotFoundError:
+                # Reclamado pero sin arriendo: esperar a que el trabajador lo escriba
+                try:
+                    if now - entry.stat().st_ctime < CLAIM_GRACE:
+                        continue
+                except FileNotFoundError:
+                    continue
+                lease = {'attempts': 1}
+            except (ValueError, OSError):
+                continue
+        except (ValueError, OSError):
+            continue  # arriendo a medio renovar; se revisa en la próxima pasada
+        else:
+            if not _lease_expired(lease, now):
+                continue
+            try:
+                os.rename(lease_path, marker)
+                os.utime(marker)  # la marca cuenta CLAIM_GRACE desde ahora
+            except FileNotFoundError:
+                continue  # otro trabajador lo apartó primero
+            try:
+                taken = json.loads(marker.read_text(encoding='utf-8'))
+            except (OSError, ValueError):
+                taken = None
+            if taken is None or taken.get('token') != lease.get('token'):
+                # Se apartó un arriendo nuevo: devolverlo a su dueño
+                try:
+                    os.rename(marker, lease_path)
+                except FileNotFoundError:
+                    pass
+                continue
+
+        attempts = lease.get('attempts', 1)
+        try:
+            if attempts >= max_attempts:
+                os.rename(leases_dir / job, spool / 'failed' / job)
+                _write_result(spool, job, {
+                    'file': job,
+                    'status': 'FAILED',
+                    'message': f"El trabajador murió {attempts} veces resolviendo este trabajo"
+                })
+            else:
+                _atomic_write(_attempts_file(spool, job), str(attempts))
+                os.rename(leases_dir / job, spool / 'inbox' / job)
+        except FileNotFoundError:
+            continue  # otro trabajador lo re-encoló o el dueño terminó
+        finally:
+            try:
+                marker.unlink()
+            except FileNotFoundError:
+                pass
+        requeued.append(job)
+
+    return requeued
+
+
+def _write_result(spool: Path, job: str, record: Dict, text: Optional[str] = None):
+    """Publica el resultado de un trabajo en outbox/ (primero la solución, luego el JSON)."""
+    stem = Path(job).stem
+    if text is not None:
+        _atomic_write(spool / 'outbox' / f"{stem}_salida.txt", text)
+    _atomic_write(spool / 'outbox' / f"{stem}.json", json.dumps(record))
+
+
+def _release(spool: Path, job: str, destination: str):
+    """Mueve la entrada de leases/ a destination/ y borra el arriendo (solo lo llama su dueño)."""
+    try:
+        os.replace(spool / 'leases' / job, spool / destination / job)
+    except FileNotFoundError:
+        pass  # re-encolado entre la verificación y el movimiento
+    try:
+        (spool / 'leases' / f"{job}.lease").unlink()
+    except FileNotFoundError:
+        pass
+
+
+def process_job(spool: Path, claim: Dict, owner: Optional[str] = None,
+                lease_seconds: float = LEASE_SECONDS, cache: Optional[Dict] = None,
+                **solve_kwargs) -> Dict:
+    """
+    Resuelve un trabajo reclamado, renovando su arriendo mientras tanto.
+
+    Args:
+        spool: Directorio compartido
+        claim: Resultado de claim_next
+        owner: Identificador del trabajador
+        lease_seconds: Duración del arriendo
+        cache: Soluciones ya calculadas por este trabajador, por forma
+               canónica (ver solver.symmetry)
+        **solve_kwargs: Argumentos para solver.dispatch.solve (engine,
+                        timeout, model, ...)
+
+    Returns:
+        Registro publicado en outbox/, o uno con estado 'LEASE_LOST' (no
+        publicado) si el arriendo dejó de ser de este trabajador
+    """
+    spool = Path(spool)
+    owner = owner or worker_id()
+    job = claim['job']
+    token = claim['token']
+
+    def lease_lost(record: Dict) -> Dict:
+        record.update(status='LEASE_LOST', worker=owner,
+                      message="El arriendo venció y el trabajo fue re-encolado; el resultado se descarta")
+        return record
+
+    try:
+        with span('parse_input', file=job):
+            params = parse_input_file(str(claim['path']))
+    except (FileNotFoundError, ValueError) as e:
+        record = {'file': job, 'status': 'INPUT_ERROR', 'message': str(e), 'worker': owner}
+        if not _owns_lease(spool, job, owner, token):
+            return lease_lost(record)
+        _write_result(spool, job, record)
+        _release(spool, job, 'failed')
+        return record
+
+    stop = threading.Event()
+    lost = threading.Event()
+
+    def heartbeat():
+        while not stop.wait(lease_seconds / 3):
+            if not _owns_lease(spool, job, owner, token):
+                lost.set()
+                return
+            _write_lease(spool, job, owner, token, claim['attempts'], lease_seconds)
+
+    renewer = threading.Thread(target=heartbeat, daemon=True)
+    renewer.start()
+    try:
+        with span('job', file=job, worker=owner, **instance_attrs(params)):
+            solution = solve_symmetric(params, cache, **solve_kwargs)
+    finally:
+        stop.set()
+        renewer.join()
+
+    record = solution_record(job, params, solution)
+    record['worker'] = owner
+    record['attempts'] = claim['attempts']
+
+    if lost.is_set() or not _owns_lease(spool, job, owner, token):
+        return lease_lost(record)
+
+    text = None
+    if solution['status'] in ('OPTIMAL', 'SATISFIED'):
+        text = solution.format()
+    with span('write_output', file=job):
+        _write_result(spool, job, record, text)
+    _release(spool, job, 'done')
+
+    return record
+
+
+def run_worker(spool: Path, poll_interval: float = 1.0, idle_exit: Optional[float] = None,
+               max_jobs: Optional[int] = None, lease_seconds: float = LEASE_SECONDS,
+               on_result=None, **solve_kwargs) -> int:
+    """
+    Bucle de un trabajador: re-encola trabajos vencidos, reclama y resuelve.
+
+    Args:
+        spool: Directorio compartido
+        poll_interval: Espera en segundos cuando inbox/ está vacío
+        idle_exit: Terminar tras este tiempo sin trabajos (None: nunca)
+        max_jobs: Terminar tras resolver este número de trabajos
+        lease_seconds: Duración del arriendo
+        on_result: Función opcional llamada con cada registro (también los
+                   descartados por arriendo perdido)
+        **solve_kwargs: Argumentos para solver.dispatch.solve
+
+    Returns:
+        Número de trabajos resueltos
+    """
+    spool = init_spool(spool)
+    owner = worker_id()
+    cache = {}
+    solved = 0
+    idle_since = time.time()
+
+    while max_jobs is None or solved < max_jobs:
+        requeue_expired(spool)
+        claim = claim_next(spool, owner, lease_seconds)
+
+        if claim is None:
+            if idle_exit is not None and time.time() - idle_since >= idle_exit:
+                break
+            time.sleep(poll_interval)
+            continue
+
+        record = process_job(spool, claim, owner, lease_seconds, cache, **solve_kwargs)
+        solved += 1
+        idle_since = time.time()
+        if on_result:
+            on_result(record)
+
+    return solved
+
+
+def spool_status(spool: Path) -> Dict[str, int]:
+    """
+    Cuenta los trabajos en cada etapa.
+
+    Args:
+        spool: Directorio compartido
+
+    Returns:
+        Diccionario {'inbox', 'leases', 'done', 'failed', 'outbox'} con
+        la cantidad de trabajos (o resultados, para outbox)
+    """
+    spool = Path(spool)
+    counts = {}
+    for name in SPOOL_DIRS:
+        directory = spool / name
+        if not directory.exists():
+            counts[name] = 0
+            continue
+        entries = [e.name for e in os.scandir(directory) if not e.name.startswith('.')]
+        if name == 'leases':
+            entries = [e for e in entries if not e.endswith('.lease')]
+        elif name == 'outbox':
+            entries = [e for e in entries if e.endswith('.json')]
+        counts[name] = len(entries)
+    return counts
@@ -0,0 +1,170 @@
+"""
+Forma canónica de instancias equivalentes por simetría.
+
+Dos transformaciones no cambian la polarización óptima ni los planes
+factibles:
+
+- Desplazamiento: sumar una constante a todos los v. Las diferencias
+  |v_i - v_mediana| no cambian, y los costos dependen solo de los índices.
+- Espejo: invertir el orden de las opiniones y cambiar v por 1 - v. Las
+  distancias |i - j| se conservan y la matriz de movimientos se obtiene
+  invirtiendo filas y columnas. La mediana del espejo puede ser la otra
+  mediana central cuando n es par, lo que no cambia la polarización solo
+  si v está ordenado (ambas medianas minimizan Σ p_i |v_i - c|); con v
+  desordenado y n par el espejo no se usa.
+
+La forma canónica desplaza v para que su mínimo sea 0 y elige entre la
+instancia y su espejo la menor en orden lexicográfico. Las instancias
+equivalentes comparten la misma clave, de modo que en un lote solo se
+resuelve un representante y su solución se transforma para cada una.
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import time
+from typing import Dict, List, Optional, Sequence
+
+from input_output.structures import Solution
+
+from .dispatch import solve
+from .evaluation import evaluate_plan
+
+
+# Decimales con que se comparan los valores de opinión desplazados
+VALUE_DIGITS = 9
+
+
+def _shifted(v: Sequence[float], origin: float, sign: int) -> List[float]:
+    """Desplaza v a origin (y lo refleja si sign es -1), redondeando el ruido."""
+    return [round(sign * (val - origin), VALUE_DIGITS) + 0.0 for val in v]
+
+
+def _mirror_allowed(params: Dict) -> bool:
+    """El espejo conserva la mediana si v está ordenado o n es impar."""
+    v = params['v']
+    return params['n'] % 2 == 1 or all(a <= b for a, b in zip(v, v[1:]))
+
+
+def canonical_form(params: Dict) -> Dict:
+    """
+    Calcula el representante canónico de una instancia.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+
+    Returns:
+        Diccionario con 'params' (instancia canónica), 'key' (tupla
+        hashable, igual para instancias equivalentes), 'mirrored' (True si
+        el representante es el espejo) y 'shift' (desplazamiento aplicado)
+    """
+    v = params['v']
+    forward = {
+        'p': list(params['p']),
+        'v': _shifted(v, min(v), 1),
+        's': [list(row) for row in params['s']]
+    }
+    candidates = [(False, min(v), forward)]
+
+    if _mirror_allowed(params):
+        mirror = {
+            'p': forward['p'][::-1],
+            'v': _shifted(v[::-1], max(v), -1),
+            's': forward['s'][::-1]
+        }
+        candidates.append((True, max(v), mirror))
+
+    def order(candidate):
+        data = candidate[2]
+        return (data['v'], data['p'], data['s'])
+
+    mirrored, origin, data = min(candidates, key=order)
+    canonical = dict(params, **data)
+
+    key = (params['n'], params['m'], params['ct'], params['maxMovs'],
+           tuple(data['p']), tuple(data['v']), tuple(tuple(row) for row in data['s']))
+
+    return {'params': canonical, 'key': key, 'mirrored': mirrored, 'shift': origin}
+
+
+def _mirror_plan(movements: Dict[int, List[List[int]]]) -> Dict[int, List[List[int]]]:
+    """Invierte filas y columnas de las matrices de movimientos."""
+    return {k: [row[::-1] for row in matrix[::-1]] for k, matrix in movements.items()}
+
+
+def from_canonical(solution: Dict, form: Dict, params: Dict) -> Dict:
+    """
+    Transforma una solución de la instancia canónica a la instancia original.
+
+    La polarización y la distribución final se recalculan sobre la
+    instancia original, así que no arrastran el redondeo del desplazamiento.
+
+    Args:
+        solution: Solución de la instancia canónica
+        form: Resultado de canonical_form para params
+        params: Instancia original
+
+    Returns:
+        Copia de la solución (Solution) expresada en la instancia original
+    """
+    result = Solution(solution)
+    movements = solution.get('movements')
+    if movements is None:
+        return result
+
+    if form['mirrored']:
+        movements = _mirror_plan(movements)
+    else:
+        movements = {k: [list(row) for row in matrix] for k, matrix in movements.items()}
+
+    evaluation = evaluate_plan(params, movements)
+    result['movements'] = movements
+    result['polarization'] = evaluation['polarization']
+    result['final_distribution'] = evaluation['final_distribution']
+    return result
+
+
+def solve_symmetric(params: Dict, cache: Optional[Dict] = None, engine: str = 'auto',
+                    timeout: Optional[int] = None, history: Sequence[Dict] = (),
+                    **solve_kwargs) -> Dict:
+    """
+    Resuelve una instancia a través de su forma canónica.
+
+    Si cache ya tiene la solución de una instancia equivalente, se
+    transforma sin llamar al solver. Las soluciones sin plan (errores,
+    tiempo agotado) no se guardan, para reintentarlas.
+
+    Args:
+        params: Diccionario con los parámetros del problema
+        cache: Diccionario {clave canónica: solución} compartido en el lote
+               (None: no se reutiliza nada)
+        engine: Motor (ver solver.dispatch.solve)
+        timeout: Límite de tiempo en segundos
+        history: Registros de tiempos para las estimaciones
+        **solve_kwargs: Argumentos adicionales del motor
+
+    Returns:
+        Diccionario de solución de solve, con además 'cache_hit' (True si
+        se reutilizó la solución de una instancia equivalente) y
+        'mirrored'
+    """
+    start_time = time.time()
+    form = canonical_form(params)
+    cached = cache.get(form['key']) if cache is not None else None
+
+    if cached is None:
+        solution = solve(form['params'], engine, timeout, history, **solve_kwargs)
+        if cache is not None and solution.get('movements') is not None:
+            cache[form['key']] = solution
+        hit = False
+    else:
+        solution = cached
+        hit = True
+
+    result = from_canonical(solution, form, params)
+    result['cache_hit'] = hit
+    result['mirrored'] = form['mirrored']
+    if hit:
+        result['time'] = time.time() - start_time
+        result['reason'] = f"Equivalente a una instancia ya resuelta ({solution.get('reason', '')})"
+    return result
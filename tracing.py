@@ -0,0 +1,200 @@
+"""
+Trazas por fase del flujo de resolución.
+
+Cada fase (lectura de la entrada, generación del .dzn, heurística,
+compilación y búsqueda de MiniZinc, lectura de su salida, escritura del
+archivo de salida, ...) se registra como un tramo con nombre, duración,
+tramo padre y atributos. Los atributos del padre se heredan, de modo que
+los datos de la instancia (archivo, n, m) quedan en todos sus tramos.
+
+Los tramos se exportan como líneas JSON, que scripts/trace_report.py
+resume en percentiles por fase. Desactivado (por defecto), un tramo solo
+cuesta una comprobación.
+
+Activación:
+    python scripts/run_tests.py --trace temp/trazas.jsonl
+    python solve.py tests/Prueba1.txt --trace temp/trazas.jsonl
+    POLARIZACION_TRACE=temp/trazas.jsonl python main.py
+
+Autores: Andrey Quiceño, Iván, Francesco, Jonathan
+Fecha: Diciembre 2025
+"""
+
+import functools
+import itertools
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, Optional
+
+
+# Variable de entorno que activa las trazas (también en procesos hijos)
+TRACE_ENV = 'POLARIZACION_TRACE'
+
+_lock = threading.Lock()
+_local = threading.local()
+_ids = itertools.count(1)
+_sink = None
+
+
+class _NullSpan:
+    """Tramo vacío que se entrega cuando las trazas están desactivadas."""
+
+    def set(self, **attrs):
+        pass
+
+
+_NULL_SPAN = _NullSpan()
+
+
+class Span:
+    """Tramo en curso; set() agrega atributos que heredan los tramos hijos."""
+
+    def __init__(self, name: str, parent: Optional['Span'], attrs: Dict):
+        self.name = name
+        self.id = f"{os.getpid():x}-{next(_ids)}"
+        self.parent = parent
+        self.trace = parent.trace if parent else self.id
+        self.attrs = dict(parent.attrs, **attrs) if parent else dict(attrs)
+        self.start = time.time()
+        self.clock = time.perf_counter()
+
+    def set(self, **attrs):
+        self.attrs.update(attrs)
+
+
+def enable_tracing(path: Path):
+    """
+    Activa las trazas y las agrega al archivo indicado.
+
+    Args:
+        path: Archivo .jsonl de salida (se crea si no existe)
+    """
+    global _sink
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with _lock:
+        if _sink:
+            _sink.close()
+        _sink = open(path, 'a', encoding='utf-8', buffering=1)
+
+
+def disable_tracing():
+    """Desactiva las trazas y cierra el archivo."""
+    global _sink
+    with _lock:
+        if _sink:
+            _sink.close()
+        _sink = None
+
+
+def tracing_enabled() -> bool:
+    """True si las trazas están activas."""
+    return _sink is not None
+
+
+def _stack() -> list:
+    if not hasattr(_local, 'stack'):
+        _local.stack = []
+    return _local.stack
+
+
+def current_span():
+    """Tramo abierto más interno del hilo actual (o un tramo vacío)."""
+    stack = _stack() if _sink else None
+    return stack[-1] if stack else _NULL_SPAN
+
+
+def _emit(span: Span, duration: float):
+    record = {
+        'trace': span.trace,
+        'id': span.id,
+        'parent': span.parent.id if span.parent else None,
+        'name': span.name,
+        'start': round(span.start, 6),
+        'duration': round(duration, 6),
+        'thread': threading.current_thread().name,
+        'attrs': span.attrs
+    }
+    line = json.dumps(record, default=str) + '\n'
+    with _lock:
+        if _sink:
+            _sink.write(line)
+
+
+@contextmanager
+def span(name: str, **attrs) -> Iterator:
+    """
+    Registra un tramo alrededor de un bloque.
+
+    Args:
+        name: Nombre de la fase
+        **attrs: Atributos del tramo (se heredan a los tramos hijos)
+
+    Yields:
+        El tramo, para agregar atributos con set() durante el bloque
+    """
+    if _sink is None:
+        yield _NULL_SPAN
+        return
+
+    stack = _stack()
+    current = Span(name, stack[-1] if stack else None, attrs)
+    stack.append(current)
+    try:
+        yield current
+    finally:
+        stack.pop()
+        _emit(current, time.perf_counter() - current.clock)
+
+
+def record_span(name: str, duration: float, parent=None, **attrs):
+    """
+    Registra una fase ya medida por otro proceso.
+
+    Se usa para los tiempos que informa MiniZinc (compilación, búsqueda).
+
+    Args:
+        name: Nombre de la fase
+        duration: Duración en segundos
+        parent: Tramo padre, ya cerrado o no (por defecto el tramo actual)
+        **attrs: Atributos adicionales
+    """
+    if _sink is None:
+        return
+    if not isinstance(parent, Span):
+        stack = _stack()
+        parent = stack[-1] if stack else None
+    child = Span(name, parent, attrs)
+    child.start -= duration
+    _emit(child, duration)
+
+
+def traced(name: str):
+    """
+    Decorador que registra cada llamada a la función como un tramo.
+
+    Args:
+        name: Nombre de la fase
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if _sink is None:
+                return func(*args, **kwargs)
+            with span(name):
+                return func(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def instance_attrs(params: Dict) -> Dict:
+    """Atributos de una instancia que se adjuntan a sus tramos."""
+    return {'n': params['n'], 'm': params['m']}
+
+
+if os.environ.get(TRACE_ENV):
+    enable_tracing(os.environ[TRACE_ENV])